@@ -12,10 +12,15 @@ from ..models.admin import AdminRole, AdminPermission, get_admin_permissions
 
 security = HTTPBearer()
 
+# Only the fields the User model needs are loaded for authentication (never password_hash)
+USER_AUTH_FIELDS = list(User.model_fields.keys())
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> User:
     """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    
+    return await get_user_from_token(credentials.credentials)
+
+async def get_user_from_token(token: str) -> User:
+    """Resolve a raw access token to a user (also used where no Authorization header exists, e.g. WebSockets)."""
     try:
         payload = verify_token(token)
         user_id: str = payload.get("sub")
@@ -28,16 +33,22 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except HTTPException:
         raise
     
-    # If DB is connected, load from database
+    # If DB is connected, load from the per-worker user cache or the database
     if getattr(database, "connected", False):
-        user_data = await database.get_user_by_id(user_id)
+        cached_user = database.user_cache.get(user_id)
+        if cached_user is not None:
+            return cached_user.model_copy()
+        
+        user_data = await database.get_user_for_auth(user_id, USER_AUTH_FIELDS)
         if user_data is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return User(**user_data)
+        user = User(**user_data)
+        database.user_cache.set(user_id, user)
+        return user.model_copy()
     
     # Degraded mode: synthesize user from token claims
     role = payload.get("role")
@@ -1,5 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
 import jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
@@ -7,7 +11,9 @@ import secrets
 import os
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"])  # Removed deprecated="auto" to avoid deprecated configuration
+# Work factor for new hashes; stored hashes with a different cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=BCRYPT_ROUNDS)  # Removed deprecated="auto" to avoid deprecated configuration
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", secrets.token_urlsafe(32))
@@ -23,6 +29,106 @@ def get_password_hash(password: str) -> str:
     """Hash a password for storing."""
     return pwd_context.hash(password)
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a stored hash was not produced with the configured bcrypt work factor."""
+    try:
+        # Modular crypt format: $2b$<cost>$<salt+digest>
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return True
+
+class PasswordHasher:
+    """Runs bcrypt on a bounded thread pool so hashing never blocks the event loop.
+
+    bcrypt releases the GIL while hashing, so threads give real parallelism up to
+    PASSWORD_HASH_WORKERS; further requests wait in the pool queue (queue_depth).
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rehashed = 0
+        self.busy_ms_total = 0.0
+        self.wait_ms_total = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    def _run_tracked(self, fn: Callable[..., Any], submitted_at: float, *args) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.queue_depth -= 1
+            self.in_flight += 1
+            self.wait_ms_total += (started - submitted_at) * 1000
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+                self.busy_ms_total += (time.perf_counter() - started) * 1000
+
+    async def _submit(self, fn: Callable[..., Any], *args) -> Any:
+        with self._lock:
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self._run_tracked, fn, time.perf_counter(), *args
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._submit(verify_password, plain_password, hashed_password)
+
+    async def verify_and_rehash(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password; on success also return a new hash if the stored cost is outdated."""
+        if not await self.verify(plain_password, hashed_password):
+            return False, None
+        if not password_needs_rehash(hashed_password):
+            return True, None
+        self.rehashed += 1
+        return True, await self.hash(plain_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool counters for monitoring."""
+        return {
+            "workers": self.max_workers,
+            "bcrypt_rounds": BCRYPT_ROUNDS,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rehashed": self.rehashed,
+            "avg_hash_ms": round(self.busy_ms_total / self.completed, 2) if self.completed else 0.0,
+            "avg_queue_wait_ms": round(self.wait_ms_total / self.completed, 2) if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# Global password hasher used by the async auth endpoints
+password_hasher = PasswordHasher()
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing pool."""
+    return await password_hasher.hash(password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Admin Job Listing Round-Trip Benchmark
+
+Seeds a throwaway database with jobs, homeowners and interests, then counts the
+MongoDB commands issued by the admin job listing methods at several page sizes.
+With batched enrichment the count per page must stay constant as the page grows.
+
+Usage (from the backend directory, against a local mongod):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/admin_jobs_roundtrips.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database  # noqa: E402
+
+PAGE_SIZES = [10, 25, 50, 100]
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "servicehub_bench_admin_jobs")
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server, ignoring connection handshakes"""
+
+    IGNORED = {"hello", "ismaster", "isMaster", "ping", "endSessions"}
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in self.IGNORED:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def seed(db, homeowners: int = 40, jobs: int = 400):
+    """Insert homeowners, jobs (mix of modern and legacy shapes) and interests"""
+    await db.users.delete_many({})
+    await db.jobs.delete_many({})
+    await db.interests.delete_many({})
+
+    users = []
+    for i in range(homeowners):
+        users.append({
+            "id": str(uuid.uuid4()),
+            "name": f"Homeowner {i}",
+            "email": f"homeowner{i}@bench.test",
+            "phone": f"+23480000{i:05d}",
+            "role": "homeowner",
+            "created_at": datetime.utcnow() - timedelta(days=i),
+        })
+    await db.users.insert_many(users)
+
+    job_docs, interest_docs = [], []
+    now = datetime.utcnow()
+    for i in range(jobs):
+        owner = users[i % homeowners]
+        job = {
+            "id": str(uuid.uuid4()),
+            "title": f"Benchmark job {i}",
+            "category": "Plumbing",
+            "status": "pending_approval" if i % 2 else "active",
+            "created_at": now - timedelta(minutes=i),
+        }
+        if i % 5 == 0:
+            # Legacy shape: embedded homeowner without an ID
+            job["homeowner"] = {"name": owner["name"], "email": owner["email"], "phone": owner["phone"]}
+        else:
+            job["homeowner_id"] = owner["id"]
+            job["homeowner"] = {"id": owner["id"], "name": owner["name"], "email": owner["email"]}
+        job_docs.append(job)
+        for _ in range(i % 4):
+            interest_docs.append({"id": str(uuid.uuid4()), "job_id": job["id"], "tradesperson_id": str(uuid.uuid4())})
+    await db.jobs.insert_many(job_docs)
+    if interest_docs:
+        await db.interests.insert_many(interest_docs)
+
+
+async def main():
+    mongo_url = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(mongo_url, event_listeners=[counter])
+
+    database = Database()
+    database.client = client
+    database.database = client[BENCH_DB_NAME]
+    database.connected = True
+
+    print("📊 Admin job listing round trips per page")
+    print("=" * 50)
+    try:
+        await seed(database.database)
+
+        methods = [
+            ("get_all_jobs_admin", database.get_all_jobs_admin),
+            ("get_pending_jobs_admin", database.get_pending_jobs_admin),
+            ("get_jobs_with_access_fees", database.get_jobs_with_access_fees),
+        ]
+        for name, method in methods:
+            counts = []
+            for page_size in PAGE_SIZES:
+                counter.count = 0
+                started = time.perf_counter()
+                rows = await method(skip=0, limit=page_size)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                counts.append(counter.count)
+                print(f"   {name:<28} page={page_size:<4} rows={len(rows):<4} "
+                      f"round_trips={counter.count:<3} time={elapsed_ms:.1f}ms")
+            status = "✅ constant" if len(set(counts)) == 1 else "❌ grows with page size"
+            print(f"   {name}: {status}")
+            print()
+    finally:
+        await client.drop_database(BENCH_DB_NAME)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Login Storm Latency Benchmark
+
+Fires a burst of concurrent password verifications at a small FastAPI app while
+probing an unrelated endpoint, and reports the probe latency percentiles. Runs
+twice: once verifying inline on the event loop (the old behaviour) and once on
+the bounded hashing pool from auth.security.
+
+No database is needed; the app is driven in-process through httpx's ASGI transport.
+
+Usage (from the backend directory):
+    python benchmarks/login_storm_latency.py [--logins 40] [--rounds 12]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+
+def build_app(mode: str, stored_hash: str) -> FastAPI:
+    from auth.security import password_hasher, verify_password
+
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        if mode == "inline":
+            ok = verify_password("correct horse battery staple", stored_hash)
+        else:
+            ok = await password_hasher.verify("correct horse battery staple", stored_hash)
+        return {"ok": ok}
+
+    @app.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return app
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_storm(mode: str, stored_hash: str, logins: int, probe_interval: float):
+    app = build_app(mode, stored_hash)
+    transport = httpx.ASGITransport(app=app)
+    probe_latencies = []
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        storm_done = asyncio.Event()
+
+        async def probe():
+            # Latency is measured from when each probe was due, so time spent
+            # waiting for a blocked event loop counts against the request
+            while not storm_done.is_set():
+                due = time.perf_counter() + probe_interval
+                await asyncio.sleep(probe_interval)
+                await client.get("/ping")
+                probe_latencies.append((time.perf_counter() - due) * 1000)
+
+        probe_task = asyncio.create_task(probe())
+        # Let the probe loop settle so probes are in flight when the storm starts
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(client.post("/login") for _ in range(logins)))
+        storm_seconds = time.perf_counter() - started
+        storm_done.set()
+        await probe_task
+
+    assert all(r.json()["ok"] for r in results), "password verification failed"
+    return storm_seconds, probe_latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=40, help="concurrent logins in the storm")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    parser.add_argument("--probe-interval-ms", type=float, default=5, help="delay between unrelated requests")
+    args = parser.parse_args()
+
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    from auth.security import get_password_hash, password_hasher
+
+    stored_hash = get_password_hash("correct horse battery staple")
+    print(f"bcrypt rounds={args.rounds}  logins={args.logins}  hashing workers={password_hasher.max_workers}")
+    print(f"{'mode':<8} {'storm s':>8} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+
+    for mode in ("inline", "pool"):
+        storm_seconds, latencies = await run_storm(mode, stored_hash, args.logins, args.probe_interval_ms / 1000)
+        if not latencies:
+            latencies = [float("nan")]
+        print(f"{mode:<8} {storm_seconds:>8.2f} {len(latencies):>7} "
+              f"{statistics.median(latencies):>8.1f} {percentile(latencies, 99):>8.1f} {max(latencies):>8.1f}")
+
+    print(f"pool stats: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
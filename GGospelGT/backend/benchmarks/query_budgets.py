@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Query Budget Regression Harness
+
+Drives the real FastAPI app in-process (httpx ASGI transport) against a local
+mongod seeded by synthetic_data.py, and checks each hot endpoint against
+the budgets in query_budgets.json:
+
+- max_db_commands: most MongoDB commands any single request may issue, read
+  from the Server-Timing header written by the request middleware
+- p95_ms: 95th percentile request latency after warm-up
+
+Every run writes a machine-readable JSON report; pass --baseline with an
+earlier report to print per-endpoint deltas. Exits non-zero on any violation;
+--warn-only reports budget violations as warnings instead (non-200 responses
+and a missing Server-Timing header still fail).
+
+Usage (from the backend directory, against a local mongod):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/query_budgets.py
+    python benchmarks/query_budgets.py --iterations 50 --baseline benchmarks/reports/<earlier>.json
+    python benchmarks/query_budgets.py --record   # rewrite budgets from this run (with headroom)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(BENCH_DIR)))
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "servicehub_bench_budgets")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = BENCH_DB_NAME
+os.environ.setdefault("DB_STARTUP_TIMEOUT_SEC", "60")
+os.environ.setdefault("ALLOW_DEGRADED_MODE", "false")
+os.environ.setdefault("NOTIFICATION_OUTBOX_EMBEDDED", "false")
+
+import httpx  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from backend.auth.security import create_access_token  # noqa: E402
+from backend.benchmarks.synthetic_data import GeneratorConfig, generate, user_identity  # noqa: E402
+from backend.database import database  # noqa: E402
+from backend.migrate import run_migrations  # noqa: E402
+from backend.server import app  # noqa: E402
+
+BUDGETS_PATH = os.path.join(BENCH_DIR, "query_budgets.json")
+REPORTS_DIR = os.path.join(BENCH_DIR, "reports")
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) mongo commands"')
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def auth_headers(user: dict) -> dict:
+    token = create_access_token({"sub": user["id"], "role": user["role"], "email": user["email"]})
+    return {"Authorization": f"Bearer {token}"}
+
+
+async def measure(client, name: str, budget: dict, headers: dict, iterations: int, warmup: int,
+                  warn_only: bool = False) -> dict:
+    latencies, commands, db_times, statuses = [], [], [], set()
+    for i in range(warmup + iterations):
+        started = time.perf_counter()
+        response = await client.request(budget["method"], budget["path"], headers=headers)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if i < warmup:
+            continue
+        statuses.add(response.status_code)
+        latencies.append(elapsed_ms)
+        match = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+        commands.append(int(match.group(2)) if match else -1)
+        db_times.append(float(match.group(1)) if match else 0.0)
+
+    result = {
+        "name": name,
+        "method": budget["method"],
+        "path": budget["path"],
+        "statuses": sorted(statuses),
+        "samples": len(latencies),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "max_ms": round(max(latencies), 2),
+        "db_commands_max": max(commands),
+        "db_commands_p50": statistics.median(commands),
+        "db_time_ms_p95": round(percentile(db_times, 95), 2),
+        "budget": {"max_db_commands": budget["max_db_commands"], "p95_ms": budget["p95_ms"]},
+    }
+    errors, violations = [], []
+    if statuses != {200}:
+        errors.append(f"non-200 responses: {sorted(statuses)}")
+    if min(commands) < 0:
+        errors.append("missing Server-Timing db entry")
+    if result["db_commands_max"] > budget["max_db_commands"]:
+        violations.append(f"db commands {result['db_commands_max']} > {budget['max_db_commands']}")
+    if result["p95_ms"] > budget["p95_ms"]:
+        violations.append(f"p95 {result['p95_ms']}ms > {budget['p95_ms']}ms")
+    result["violations"] = errors + violations
+    # Broken responses always fail; budget violations only warn under --warn-only
+    result["passed"] = not errors and (not violations or warn_only)
+    return result
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def print_baseline_deltas(results: list, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline_report = json.load(f)
+    baseline = {r["name"]: r for r in baseline_report["results"]}
+    print(f"\n📈 Compared with {baseline_path} (commit {baseline_report.get('commit')})")
+    for result in results:
+        before = baseline.get(result["name"])
+        if not before:
+            print(f"   {result['name']:<20} (new)")
+            continue
+        print(f"   {result['name']:<20} p95 {before['p95_ms']:>8.1f} -> {result['p95_ms']:>8.1f}ms   "
+              f"db cmds {before['db_commands_max']:>3} -> {result['db_commands_max']:>3}")
+
+
+def record_budgets(budgets: dict, results: list):
+    """Rewrite budgets from measured values: exact command counts, p95 with 50% headroom"""
+    for result in results:
+        budget = budgets[result["name"]]
+        budget["max_db_commands"] = result["db_commands_max"]
+        budget["p95_ms"] = max(25, int(math.ceil(result["p95_ms"] * 1.5 / 5) * 5))
+    with open(BUDGETS_PATH, "w") as f:
+        f.write("{\n" + ",\n".join(f'  {json.dumps(k)}: {json.dumps(v)}' for k, v in budgets.items()) + "\n}\n")
+    print(f"📝 Budgets written to {BUDGETS_PATH}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=3000)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", help="dataset anchor date (default: today, UTC)")
+    parser.add_argument("--workers", type=int, default=0, help="dataset builder processes (0 = threads)")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", action="append", help="run only the named budget (repeatable)")
+    parser.add_argument("--report", help="report path (default benchmarks/reports/query_budgets-<time>.json)")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--record", action="store_true", help="rewrite query_budgets.json from this run")
+    parser.add_argument("--warn-only", action="store_true", help="report budget violations without failing")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark database afterwards")
+    parser.add_argument("--reuse", action="store_true", help="reuse a dataset kept by an earlier --keep run")
+    args = parser.parse_args()
+
+    cfg = GeneratorConfig(users=args.users, jobs=args.jobs, seed=args.seed)
+    if args.anchor:
+        cfg.anchor = datetime.fromisoformat(args.anchor)
+    # The heaviest homeowner and tradesperson (activity is skewed towards low user indexes)
+    probe_users = {"homeowner": user_identity(cfg, 1), "tradesperson": user_identity(cfg, 0)}
+    dataset = {"users": cfg.users, "jobs": cfg.jobs, "seed": cfg.seed, "anchor": cfg.anchor.date().isoformat()}
+
+    bench_client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    reuse = args.reuse and await bench_client[BENCH_DB_NAME].users.estimated_document_count() > 0
+    if reuse:
+        print(f"♻️  Reusing dataset in {BENCH_DB_NAME}")
+    else:
+        # Seed before the app starts so its indexes are built over the seeded data,
+        # as in a real deployment
+        await bench_client.drop_database(BENCH_DB_NAME)
+        print(f"🌱 Seeding {BENCH_DB_NAME}: {cfg.users} users, {cfg.jobs} jobs (seed {cfg.seed})")
+        dataset["documents"] = await generate(bench_client[BENCH_DB_NAME], cfg, workers=args.workers)
+    bench_client.close()
+
+    with open(BUDGETS_PATH) as f:
+        budgets = json.load(f)
+    names = args.only or list(budgets)
+
+    async with app.router.lifespan_context(app):
+        if not database.connected:
+            raise SystemExit(f"❌ Could not connect to {os.environ['MONGO_URL']}")
+        try:
+            if not reuse:
+                # Deploy migrations; the server does not run them at startup
+                await run_migrations()
+                await database.rebuild_review_summaries()
+            headers = {role: auth_headers(user) for role, user in probe_users.items()}
+
+            print(f"{'endpoint':<20} {'p50 ms':>8} {'p95 ms':>8} {'budget':>8} {'db cmds':>8} {'budget':>7}")
+            results = []
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                for name in names:
+                    budget = budgets[name]
+                    result = await measure(client, name, budget, headers.get(budget.get("auth"), {}),
+                                           args.iterations, args.warmup, args.warn_only)
+                    results.append(result)
+                    mark = "❌" if not result["passed"] else "⚠️" if result["violations"] else "✅"
+                    print(f"{name:<20} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {budget['p95_ms']:>8} "
+                          f"{result['db_commands_max']:>8} {budget['max_db_commands']:>7} {mark} "
+                          f"{'; '.join(result['violations'])}")
+        finally:
+            if not args.keep:
+                await database.client.drop_database(BENCH_DB_NAME)
+
+    report = {
+        "generated_at": datetime.utcnow().isoformat() + "Z",
+        "commit": git_commit(),
+        "dataset": dataset,
+        "iterations": args.iterations,
+        "warmup": args.warmup,
+        "results": results,
+    }
+    report_path = args.report or os.path.join(
+        REPORTS_DIR, f"query_budgets-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n🧾 Report written to {report_path}")
+
+    if args.baseline:
+        print_baseline_deltas(results, args.baseline)
+    if args.record:
+        record_budgets(budgets, results)
+
+    failed = [r["name"] for r in results if not r["passed"]]
+    print(f"\n📊 Results: {len(results) - len(failed)} passed, {len(failed)} failed")
+    return 0 if not failed or args.record else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
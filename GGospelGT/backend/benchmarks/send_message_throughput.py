@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Send-Message Throughput Benchmark
+
+Compares the chat send path before and after consolidation, in one process
+(one worker) against a local mongod seeded by synthetic_data.py:
+
+- legacy: get_conversation_by_id, create_message (insert + conversation
+  update), then get_user_by_id + get_user_notification_preferences +
+  send_notification for the recipient
+- consolidated: send_conversation_message (one find_one_and_update + insert)
+  plus queue_notification (one outbox insert)
+
+Each message is counted with the same per-request MongoDB accounting the API
+uses, so the report shows round trips per message next to messages/sec.
+
+Usage (from the backend directory, against a local mongod):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/send_message_throughput.py
+    python benchmarks/send_message_throughput.py --messages 5000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(BENCH_DIR)))
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "servicehub_bench_send_message")
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from backend.benchmarks.synthetic_data import GeneratorConfig, generate  # noqa: E402
+from backend.database import database  # noqa: E402
+from backend.models.notifications import NotificationType  # noqa: E402
+from backend.services.notifications import notification_service  # noqa: E402
+from backend.utils.request_context import end_request_stats, start_request_stats  # noqa: E402
+
+
+def _template_data(conversation: dict, sender_name: str, content: str) -> dict:
+    return {
+        "sender_name": sender_name,
+        "job_title": conversation.get("job_title", "Job"),
+        "message_preview": content,
+        "conversation_url": f"https://servicehub.ng/messages/{conversation['id']}"
+    }
+
+
+async def legacy_send(conversation: dict, content: str):
+    """The route and notification task as they were before consolidation"""
+    conv = await database.get_conversation_by_id(conversation["id"])
+    sender_id = conv["tradesperson_id"]
+    await database.create_message({
+        "id": str(uuid.uuid4()),
+        "conversation_id": conv["id"],
+        "sender_id": sender_id,
+        "sender_name": conv["tradesperson_name"],
+        "sender_type": "tradesperson",
+        "message_type": "text",
+        "content": content,
+        "attachment_url": None
+    })
+    recipient = await database.get_user_by_id(conv["homeowner_id"])
+    preferences = await database.get_user_notification_preferences(conv["homeowner_id"])
+    template_data = _template_data(conv, conv["tradesperson_name"], content)
+    template_data["recipient_name"] = recipient.get("name") or "User"
+    await notification_service.send_notification(
+        user_id=conv["homeowner_id"],
+        notification_type=NotificationType.NEW_MESSAGE,
+        template_data=template_data,
+        user_preferences=preferences,
+        recipient_email=recipient.get("email"),
+        recipient_phone=recipient.get("phone")
+    )
+
+
+async def consolidated_send(conversation: dict, content: str):
+    result = await database.send_conversation_message(
+        conversation["id"], conversation["tradesperson_id"], "tradesperson", {
+            "id": str(uuid.uuid4()),
+            "sender_name": conversation["tradesperson_name"],
+            "message_type": "text",
+            "content": content,
+            "attachment_url": None
+        }
+    )
+    await notification_service.queue_notification(
+        user_id=result["conversation"]["homeowner_id"],
+        notification_type=NotificationType.NEW_MESSAGE,
+        template_data=_template_data(result["conversation"], conversation["tradesperson_name"], content)
+    )
+
+
+async def run_mode(name: str, send, conversations: list, messages: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, round_trips = [], []
+
+    async def one(n: int):
+        async with semaphore:
+            stats, token = start_request_stats()
+            started = time.perf_counter()
+            try:
+                await send(conversations[n % len(conversations)], f"benchmark message {n}")
+            finally:
+                end_request_stats(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            round_trips.append(stats.db_commands)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(n) for n in range(messages)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "mode": name,
+        "messages": messages,
+        "messages_per_sec": round(messages / elapsed, 1),
+        "p50_ms": round(statistics.median(ordered), 2),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 2),
+        "round_trips_per_message": round(statistics.mean(round_trips), 2),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--conversations", type=int, default=500, help="conversations the sends are spread over")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark database afterwards")
+    args = parser.parse_args()
+
+    bench_client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    await bench_client.drop_database(BENCH_DB_NAME)
+    print(f"🌱 Seeding {BENCH_DB_NAME}: {args.users} users, {args.jobs} jobs")
+    await generate(bench_client[BENCH_DB_NAME], GeneratorConfig(users=args.users, jobs=args.jobs), workers=0)
+    bench_client.close()
+
+    await database.connect_to_mongo()
+    if not database.connected:
+        raise SystemExit(f"❌ Could not connect to {os.environ['MONGO_URL']}")
+    try:
+        conversations = await database.database.conversations.find(
+            {}, {"_id": 0, "id": 1, "job_title": 1, "homeowner_id": 1, "tradesperson_id": 1, "tradesperson_name": 1}
+        ).limit(args.conversations).to_list(length=args.conversations)
+        if not conversations:
+            raise SystemExit("❌ The seeded dataset has no conversations")
+
+        # Warm connections and caches once per mode before measuring
+        await run_mode("warmup", legacy_send, conversations, 50, args.concurrency)
+        await run_mode("warmup", consolidated_send, conversations, 50, args.concurrency)
+
+        print(f"{'mode':<14} {'msgs/sec':>10} {'p50 ms':>8} {'p95 ms':>8} {'round trips':>12}")
+        results = []
+        for name, send in (("legacy", legacy_send), ("consolidated", consolidated_send)):
+            result = await run_mode(name, send, conversations, args.messages, args.concurrency)
+            results.append(result)
+            print(f"{name:<14} {result['messages_per_sec']:>10.1f} {result['p50_ms']:>8.1f} "
+                  f"{result['p95_ms']:>8.1f} {result['round_trips_per_message']:>12.2f}")
+
+        before, after = results
+        print(f"\n📊 Throughput x{after['messages_per_sec'] / before['messages_per_sec']:.2f}, "
+              f"round trips {before['round_trips_per_message']:.1f} -> {after['round_trips_per_message']:.1f} per message")
+    finally:
+        if not args.keep:
+            await database.client.drop_database(BENCH_DB_NAME)
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Synthetic Dataset Generator
+
+Generates a realistic, referentially consistent dataset at production scale:
+users spread over the NIGERIAN_LGAS states with coordinates, jobs, interests,
+quotes, conversations and messages, reviews, wallets with their transaction
+ledgers, and notifications.
+
+Output is deterministic for a given --seed and --anchor date. Every batch gets
+its own seeded RNG and cross-references use IDs derived from (seed, kind,
+index), so batches can be built in parallel worker processes and inserted with
+concurrent insert_many calls without changing the result.
+
+After loading, derived fields that span batches (wallet balances, tradesperson
+ratings) are reconciled server-side, the app's indexes and review summaries
+are built through Database.connect_to_mongo, and platform_counters is rebuilt.
+
+Usage (from the backend directory, against a local mongod):
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/synthetic_data.py \\
+        --db servicehub_load --users 100000 --jobs 1000000 --drop
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.models.nigerian_lgas import NIGERIAN_LGAS  # noqa: E402
+from backend.models.nigerian_states import STATE_POSTCODES  # noqa: E402
+from backend.models.trade_categories import (  # noqa: E402
+    NIGERIAN_TRADE_CATEGORIES, normalize_category_key, normalize_category_keys
+)
+
+ID_NAMESPACE = uuid.UUID("5d1c3b52-6f1e-4f7e-9a53-2c8f0f6b7a10")
+
+# Approximate centre of each NIGERIAN_LGAS state; LGAs are scattered around it
+STATE_CENTRES = {
+    "Abuja": (9.0765, 7.3986),
+    "Lagos": (6.5244, 3.3792),
+    "Delta": (5.8904, 5.6800),
+    "Rivers State": (4.8156, 7.0498),
+    "Benin": (6.3350, 5.6037),
+    "Bayelsa": (4.9247, 6.2676),
+    "Enugu": (6.4584, 7.5464),
+    "Cross Rivers": (5.8702, 8.5988),
+}
+
+FIRST_NAMES = [
+    "Adebayo", "Chinedu", "Ngozi", "Oluwaseun", "Aisha", "Emeka", "Funmilayo", "Ibrahim", "Chiamaka",
+    "Tunde", "Yetunde", "Obinna", "Halima", "Segun", "Amaka", "Musa", "Kemi", "Uche", "Zainab", "Femi",
+]
+LAST_NAMES = [
+    "Okafor", "Adeyemi", "Bello", "Eze", "Ogunleye", "Nwosu", "Abubakar", "Olawale", "Okonkwo", "Balogun",
+    "Ibekwe", "Suleiman", "Adeleke", "Obi", "Danjuma", "Akinola", "Chukwu", "Lawal", "Ekpo", "Etim",
+]
+MESSAGE_LINES = [
+    "Hello, I'm interested in this job.", "When would you like the work to start?",
+    "Can you share more photos of the area?", "I can come by tomorrow to take measurements.",
+    "What is your best price for the full job?", "Materials are included in my quote.",
+    "Please confirm the address.", "Thank you, see you then.",
+]
+JOB_STATUS_WEIGHTS = [("active", 55), ("pending_approval", 8), ("in_progress", 10), ("completed", 20), ("cancelled", 7)]
+RATING_WEIGHTS = [(5, 50), (4, 30), (3, 12), (2, 5), (1, 3)]
+NOTIFICATION_TYPES = ["new_interest", "contact_shared", "job_posted", "payment_confirmation", "new_matching_job"]
+
+
+@dataclass
+class GeneratorConfig:
+    users: int = 10000
+    jobs: int = 50000
+    seed: int = 42
+    anchor: datetime = field(default_factory=lambda: datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0))
+    days: int = 120                      # job creation dates spread over this many days before the anchor
+    tradesperson_every: int = 4          # every Nth user is a tradesperson
+    skew: float = 2.0                    # >1 concentrates activity on low-index (heavy) users
+    interests_per_job: float = 2.0
+    quote_rate: float = 0.3
+    messages_per_conversation: float = 6.0
+    review_rate: float = 0.8
+    notifications_per_user: float = 3.0
+    batch_size: int = 2000
+
+
+def entity_id(cfg: GeneratorConfig, kind: str, index: int) -> str:
+    """Stable ID for the index-th entity of a kind, so any batch can reference it"""
+    return str(uuid.uuid5(ID_NAMESPACE, f"{cfg.seed}:{kind}:{index}"))
+
+
+def _rng(cfg: GeneratorConfig, *parts) -> random.Random:
+    return random.Random(":".join(str(p) for p in (cfg.seed, *parts)))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _weighted(rng: random.Random, weights):
+    return rng.choices([value for value, _ in weights], [weight for _, weight in weights])[0]
+
+
+def _build_areas() -> List[tuple]:
+    areas = []
+    for state, lgas in NIGERIAN_LGAS.items():
+        lat, lng = STATE_CENTRES[state]
+        postcodes = STATE_POSTCODES.get(state) or ["100001"]
+        for i, lga in enumerate(lgas):
+            offset = random.Random(f"lga:{state}:{lga}")
+            areas.append((state, lga, lat + offset.uniform(-0.35, 0.35), lng + offset.uniform(-0.35, 0.35),
+                          postcodes[i % len(postcodes)]))
+    return areas
+
+
+AREAS = _build_areas()
+
+
+def tradesperson_count(cfg: GeneratorConfig) -> int:
+    return math.ceil(cfg.users / cfg.tradesperson_every)
+
+
+def is_tradesperson(cfg: GeneratorConfig, index: int) -> bool:
+    return index % cfg.tradesperson_every == 0
+
+
+def _skewed(rng: random.Random, n: int, skew: float) -> int:
+    return min(n - 1, int(n * rng.random() ** skew))
+
+
+def pick_homeowner(cfg: GeneratorConfig, rng: random.Random) -> int:
+    index = _skewed(rng, cfg.users, cfg.skew)
+    if is_tradesperson(cfg, index):
+        index = index + 1 if index + 1 < cfg.users else index - 1
+    return index
+
+
+def pick_tradesperson(cfg: GeneratorConfig, rng: random.Random) -> int:
+    return _skewed(rng, tradesperson_count(cfg), cfg.skew) * cfg.tradesperson_every
+
+
+def user_identity(cfg: GeneratorConfig, index: int) -> Dict[str, Any]:
+    """Fields of user ``index`` that other collections copy; pure function of (seed, index)"""
+    rng = _rng(cfg, "user", index)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    state, lga, lat, lng, postcode = rng.choice(AREAS)
+    identity = {
+        "index": index,
+        "id": entity_id(cfg, "user", index),
+        "name": f"{first} {last}",
+        "email": f"{first}.{last}.{index}@example.com".lower(),
+        "phone": f"+23480{index:08d}",
+        "role": "tradesperson" if is_tradesperson(cfg, index) else "homeowner",
+        "state": state,
+        "lga": lga,
+        "postcode": postcode,
+        "latitude": round(lat + rng.uniform(-0.05, 0.05), 6),
+        "longitude": round(lng + rng.uniform(-0.05, 0.05), 6),
+    }
+    if identity["role"] == "tradesperson":
+        identity["trade_categories"] = rng.sample(NIGERIAN_TRADE_CATEGORIES, rng.randint(1, 3))
+    return identity
+
+
+def build_user_batch(cfg: GeneratorConfig, batch: int) -> Dict[str, List[dict]]:
+    """Users [batch*batch_size, ...) plus their wallets, funding transactions and notifications"""
+    docs: Dict[str, List[dict]] = {"users": [], "wallets": [], "wallet_transactions": [], "notifications": []}
+    start = batch * cfg.batch_size
+    for index in range(start, min(start + cfg.batch_size, cfg.users)):
+        identity = user_identity(cfg, index)
+        rng = _rng(cfg, "user-activity", index)
+        created_at = cfg.anchor - timedelta(days=cfg.days + 30, minutes=index)
+        user = {
+            "id": identity["id"],
+            "name": identity["name"],
+            "name_normalized": identity["name"].strip().lower(),
+            "email": identity["email"],
+            "email_normalized": identity["email"].strip().lower(),
+            "phone": identity["phone"],
+            "role": identity["role"],
+            "status": "active",
+            "location": identity["state"],
+            "postcode": identity["postcode"],
+            "email_verified": rng.random() < 0.8,
+            "phone_verified": rng.random() < 0.6,
+            "latitude": identity["latitude"],
+            "longitude": identity["longitude"],
+            "is_verified": rng.random() < 0.3,
+            "created_at": created_at,
+            "updated_at": created_at,
+            "last_login": cfg.anchor - timedelta(hours=rng.randint(0, 24 * 90)),
+        }
+        if identity["role"] == "tradesperson":
+            user.update({
+                "trade_categories": identity["trade_categories"],
+                "trade_category_keys": normalize_category_keys(identity["trade_categories"]),
+                "experience_years": rng.randint(1, 25),
+                "company_name": f"{identity['name'].split()[1]} Works",
+                "description": f"Experienced {identity['trade_categories'][0].lower()} professional in {identity['lga']}",
+                "travel_distance_km": rng.choice([10, 25, 50]),
+                "average_rating": 0.0,
+                "total_reviews": 0,
+                "total_jobs": 0,
+            })
+            wallet_id = entity_id(cfg, "wallet", index)
+            docs["wallets"].append({"id": wallet_id, "user_id": identity["id"], "balance_coins": 0,
+                                    "created_at": created_at, "updated_at": created_at})
+            for n in range(rng.randint(1, 4)):
+                coins = rng.choice([50, 100, 200, 500])
+                funded_at = created_at + timedelta(days=n * 7)
+                docs["wallet_transactions"].append({
+                    "id": _uuid(rng), "wallet_id": wallet_id, "user_id": identity["id"],
+                    "transaction_type": "wallet_funding", "amount_coins": coins, "amount_naira": coins * 100,
+                    "status": "confirmed", "description": f"Wallet funding - ₦{coins * 100:,} ({coins} coins)",
+                    "created_at": funded_at, "processed_at": funded_at,
+                })
+        docs["users"].append(user)
+
+        for _ in range(min(50, int(rng.expovariate(1 / cfg.notifications_per_user)))):
+            notification_id = _uuid(rng)
+            sent_at = cfg.anchor - timedelta(minutes=rng.randint(1, cfg.days * 24 * 60))
+            docs["notifications"].append({
+                "_id": notification_id, "id": notification_id, "user_id": identity["id"],
+                "type": rng.choice(NOTIFICATION_TYPES), "channel": rng.choice(["email", "sms", "both"]),
+                "recipient_email": identity["email"], "recipient_phone": identity["phone"],
+                "subject": "serviceHub update", "content": "You have a new update on serviceHub.",
+                "status": _weighted(rng, [("sent", 70), ("delivered", 20), ("failed", 2), ("read", 8)]),
+                "metadata": {}, "sent_at": sent_at, "delivered_at": None, "attempts": 1,
+                "next_attempt_at": None, "delivered_channels": [], "last_error": None,
+                "created_at": sent_at, "updated_at": sent_at,
+            })
+    return docs
+
+
+def build_job_batch(cfg: GeneratorConfig, batch: int) -> Dict[str, List[dict]]:
+    """Jobs [batch*batch_size, ...) with their interests, quotes, conversations, messages,
+    reviews and access-fee transactions"""
+    docs: Dict[str, List[dict]] = {name: [] for name in (
+        "jobs", "interests", "quotes", "conversations", "messages", "reviews", "wallet_transactions")}
+    start = batch * cfg.batch_size
+    for index in range(start, min(start + cfg.batch_size, cfg.jobs)):
+        rng = _rng(cfg, "job", index)
+        owner = user_identity(cfg, pick_homeowner(cfg, rng))
+        if rng.random() < 0.8:
+            state, lga, lat, lng, postcode = owner["state"], owner["lga"], owner["latitude"], owner["longitude"], owner["postcode"]
+        else:
+            state, lga, lat, lng, postcode = rng.choice(AREAS)
+        lat, lng = round(lat + rng.uniform(-0.03, 0.03), 6), round(lng + rng.uniform(-0.03, 0.03), 6)
+        category = rng.choice(NIGERIAN_TRADE_CATEGORIES)
+        created_at = cfg.anchor - timedelta(minutes=rng.randint(0, cfg.days * 24 * 60))
+        status = _weighted(rng, JOB_STATUS_WEIGHTS)
+        budget_min = rng.choice([5000, 10000, 20000, 50000, 100000])
+        job = {
+            "id": entity_id(cfg, "job", index),
+            "title": f"{category} needed in {lga}",
+            "description": f"Looking for a reliable {category.lower()} professional for work at my property in {lga}, {state}.",
+            "category": category,
+            "category_key": normalize_category_key(category),
+            "state": state,
+            "lga": lga,
+            "town": lga,
+            "zip_code": postcode,
+            "home_address": f"{rng.randint(1, 200)} {rng.choice(LAST_NAMES)} Street, {lga}",
+            "location": state,
+            "postcode": postcode,
+            "budget_min": budget_min,
+            "budget_max": budget_min * rng.choice([2, 3, 5]),
+            "timeline": rng.choice(["Urgent", "Within a week", "Within a month", "Flexible"]),
+            "homeowner": {"id": owner["id"], "name": owner["name"], "email": owner["email"], "phone": owner["phone"]},
+            "homeowner_id": owner["id"],
+            "status": status,
+            "access_fee_naira": 1000,
+            "access_fee_coins": 10,
+            "latitude": lat,
+            "longitude": lng,
+            "geo_location": {"type": "Point", "coordinates": [lng, lat]},
+            "created_at": created_at,
+            "updated_at": created_at,
+            "expires_at": created_at + timedelta(days=30),
+        }
+        if status == "completed":
+            job["completed_at"] = min(created_at + timedelta(days=rng.randint(2, 20)), cfg.anchor)
+
+        interested = []
+        quotes_count = 0
+        if status in ("active", "in_progress", "completed"):
+            wanted = min(20, int(rng.expovariate(1 / cfg.interests_per_job)) if cfg.interests_per_job > 0 else 0)
+            for _ in range(wanted * 2):
+                if len(interested) >= wanted:
+                    break
+                tradesperson_index = pick_tradesperson(cfg, rng)
+                if tradesperson_index not in interested:
+                    interested.append(tradesperson_index)
+
+        for position, tradesperson_index in enumerate(interested):
+            tradesperson = user_identity(cfg, tradesperson_index)
+            interest_at = min(created_at + timedelta(hours=rng.randint(1, 72)), cfg.anchor)
+            interest_status = _weighted(rng, [("interested", 45), ("contact_shared", 30), ("paid_access", 25)])
+            docs["interests"].append({
+                "id": _uuid(rng), "job_id": job["id"], "tradesperson_id": tradesperson["id"],
+                "homeowner_id": owner["id"], "status": interest_status,
+                "created_at": interest_at, "updated_at": interest_at,
+            })
+            if interest_status == "paid_access":
+                docs["wallet_transactions"].append({
+                    "id": _uuid(rng), "wallet_id": entity_id(cfg, "wallet", tradesperson_index),
+                    "user_id": tradesperson["id"], "transaction_type": "access_fee_deduction",
+                    "amount_coins": job["access_fee_coins"], "amount_naira": job["access_fee_coins"] * 100,
+                    "status": "confirmed", "description": "Access fee for job contact details",
+                    "reference": job["id"], "created_at": interest_at, "processed_at": interest_at,
+                })
+            if rng.random() < cfg.quote_rate:
+                quotes_count += 1
+                price = rng.randint(job["budget_min"], job["budget_max"])
+                docs["quotes"].append({
+                    "id": _uuid(rng), "job_id": job["id"], "tradesperson_id": tradesperson["id"],
+                    "price": price - price % 500, "message": "I can complete this job to a high standard.",
+                    "estimated_duration": rng.choice(["1 day", "3 days", "1 week", "2 weeks"]),
+                    "start_date": interest_at + timedelta(days=rng.randint(1, 14)),
+                    "status": "accepted" if status == "completed" and position == 0 else "pending",
+                    "created_at": interest_at, "updated_at": interest_at,
+                })
+            if interest_status != "interested":
+                _add_conversation(cfg, rng, docs, job, owner, tradesperson, interest_at)
+
+        if status == "completed" and interested and rng.random() < cfg.review_rate:
+            hired = user_identity(cfg, interested[0])
+            reviewed_at = min(job["completed_at"] + timedelta(days=rng.randint(0, 5)), cfg.anchor)
+            docs["reviews"].append({
+                "id": _uuid(rng), "job_id": job["id"], "reviewer_id": owner["id"], "reviewee_id": hired["id"],
+                "reviewer_name": owner["name"], "reviewee_name": hired["name"],
+                "review_type": "homeowner_to_tradesperson", "rating": _weighted(rng, RATING_WEIGHTS),
+                "title": "Job review", "content": "Work was completed as agreed.", "category_ratings": {},
+                "photos": [], "would_recommend": True, "status": "published", "helpful_count": rng.randint(0, 5),
+                "job_title": job["title"], "job_category": category,
+                "created_at": reviewed_at, "updated_at": reviewed_at,
+            })
+
+        job["interests_count"] = len(interested)
+        job["quotes_count"] = quotes_count
+        docs["jobs"].append(job)
+    return docs
+
+
+def _add_conversation(cfg, rng, docs, job, owner, tradesperson, started_at):
+    conversation_id = _uuid(rng)
+    count = 1 + min(200, int(rng.expovariate(1 / cfg.messages_per_conversation)))
+    unread = {"homeowner": 0, "tradesperson": 0}
+    watermarks = {"homeowner": (None, None), "tradesperson": (None, None)}
+    message_id = last_sender = None
+    sent_at = started_at
+    sender_type = "tradesperson"
+    content = ""
+    for n in range(count):
+        sent_at = min(sent_at + timedelta(minutes=rng.randint(1, 600)), cfg.anchor)
+        sender = tradesperson if sender_type == "tradesperson" else owner
+        content = rng.choice(MESSAGE_LINES)
+        # The most recent messages are still unread by their recipient
+        status = "read" if n < count - 2 else "delivered"
+        reader = "homeowner" if sender_type == "tradesperson" else "tradesperson"
+        message_id, last_sender = _uuid(rng), sender_type
+        if status == "read":
+            watermarks[reader] = (sent_at, message_id)
+        else:
+            unread[reader] += 1
+        docs["messages"].append({
+            "id": message_id, "conversation_id": conversation_id, "sender_id": sender["id"],
+            "sender_name": sender["name"], "sender_type": sender_type, "message_type": "text",
+            "content": content, "status": status, "created_at": sent_at, "updated_at": sent_at,
+        })
+        if rng.random() < 0.7:
+            sender_type = "homeowner" if sender_type == "tradesperson" else "tradesperson"
+    docs["conversations"].append({
+        "id": conversation_id, "job_id": job["id"], "job_title": job["title"],
+        "homeowner_id": owner["id"], "homeowner_name": owner["name"],
+        "tradesperson_id": tradesperson["id"], "tradesperson_name": tradesperson["name"],
+        "last_message": content, "last_message_at": sent_at, "last_message_id": message_id,
+        "last_message_sender_type": last_sender,
+        "unread_count_homeowner": unread["homeowner"], "unread_count_tradesperson": unread["tradesperson"],
+        "last_read_at_homeowner": watermarks["homeowner"][0],
+        "last_read_message_id_homeowner": watermarks["homeowner"][1],
+        "last_read_at_tradesperson": watermarks["tradesperson"][0],
+        "last_read_message_id_tradesperson": watermarks["tradesperson"][1],
+        "created_at": started_at, "updated_at": sent_at,
+    })
+
+
+async def _insert_batch(db, docs: Dict[str, List[dict]], totals: Dict[str, int]):
+    for collection, rows in docs.items():
+        if rows:
+            await db[collection].insert_many(rows, ordered=False)
+            totals[collection] = totals.get(collection, 0) + len(rows)
+
+
+async def _run_phase(db, cfg: GeneratorConfig, builder, count: int, label: str, totals: Dict[str, int],
+                     pool: Optional[ProcessPoolExecutor], concurrency: int):
+    loop = asyncio.get_running_loop()
+    batches = math.ceil(count / cfg.batch_size)
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+    started = time.perf_counter()
+
+    async def run(batch: int):
+        nonlocal done
+        async with semaphore:
+            docs = await loop.run_in_executor(pool, builder, cfg, batch)
+            await _insert_batch(db, docs, totals)
+            done += 1
+            if done % max(1, batches // 20) == 0 or done == batches:
+                rate = min(count, done * cfg.batch_size) / (time.perf_counter() - started)
+                print(f"   {label}: {done}/{batches} batches ({rate:,.0f} {label}/s)")
+
+    await asyncio.gather(*(run(batch) for batch in range(batches)))
+
+
+async def reconcile(db):
+    """Derive cross-batch fields server-side: wallet balances and tradesperson ratings.
+
+    $merge needs a unique index on its match field; temporary ones are dropped afterwards
+    so the dataset carries exactly the app's own indexes.
+    """
+    await db.users.create_index([("id", 1)], unique=True, name="synthetic_users_id")
+    await db.wallets.create_index([("user_id", 1)], unique=True, name="synthetic_wallets_userId")
+    try:
+        credit = {"$cond": [{"$eq": ["$transaction_type", "access_fee_deduction"]}, {"$multiply": ["$amount_coins", -1]}, "$amount_coins"]}
+        # Top up any wallet whose access fees exceed its funding so the ledger never goes negative
+        await db.wallet_transactions.aggregate([
+            {"$match": {"status": "confirmed"}},
+            {"$group": {"_id": "$user_id", "wallet_id": {"$first": "$wallet_id"}, "net": {"$sum": credit},
+                        "last": {"$max": "$created_at"}}},
+            {"$match": {"net": {"$lt": 0}}},
+            {"$project": {"_id": {"$concat": ["topup-", "$_id"]}, "id": {"$concat": ["topup-", "$_id"]},
+                          "wallet_id": 1, "user_id": "$_id", "transaction_type": "wallet_funding",
+                          "amount_coins": {"$multiply": ["$net", -1]},
+                          "amount_naira": {"$multiply": ["$net", -100]}, "status": "confirmed",
+                          "description": "Wallet funding", "created_at": "$last", "processed_at": "$last"}},
+            {"$merge": {"into": "wallet_transactions", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ]).to_list(None)
+        await db.wallet_transactions.aggregate([
+            {"$match": {"status": "confirmed"}},
+            {"$group": {"_id": "$user_id", "balance_coins": {"$sum": credit}}},
+            {"$project": {"_id": 0, "user_id": "$_id", "balance_coins": 1}},
+            {"$merge": {"into": "wallets", "on": "user_id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ]).to_list(None)
+        await db.reviews.aggregate([
+            {"$match": {"review_type": "homeowner_to_tradesperson", "status": "published"}},
+            {"$group": {"_id": "$reviewee_id", "average_rating": {"$avg": "$rating"}, "total_reviews": {"$sum": 1}}},
+            {"$project": {"_id": 0, "id": "$_id", "average_rating": {"$round": ["$average_rating", 1]},
+                          "total_reviews": 1, "total_jobs": "$total_reviews"}},
+            {"$merge": {"into": "users", "on": "id", "whenMatched": "merge", "whenNotMatched": "discard"}},
+        ]).to_list(None)
+    finally:
+        await db.users.drop_index("synthetic_users_id")
+        await db.wallets.drop_index("synthetic_wallets_userId")
+
+
+async def generate(db, cfg: GeneratorConfig, workers: int = 0, concurrency: int = 4) -> Dict[str, int]:
+    """Load the dataset into ``db`` (a Motor database); returns documents inserted per collection.
+
+    ``workers`` > 0 builds batches in that many processes; 0 builds them in threads.
+    """
+    totals: Dict[str, int] = {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+    try:
+        await _run_phase(db, cfg, build_user_batch, cfg.users, "users", totals, pool, concurrency)
+        await _run_phase(db, cfg, build_job_batch, cfg.jobs, "jobs", totals, pool, concurrency)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    await reconcile(db)
+    return totals
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default=os.environ.get("SYNTHETIC_DB_NAME", "servicehub_synthetic"))
+    parser.add_argument("--users", type=int, default=GeneratorConfig.users)
+    parser.add_argument("--jobs", type=int, default=GeneratorConfig.jobs)
+    parser.add_argument("--seed", type=int, default=GeneratorConfig.seed)
+    parser.add_argument("--anchor", help="ISO date all timestamps are relative to (default: today, UTC)")
+    parser.add_argument("--days", type=int, default=GeneratorConfig.days)
+    parser.add_argument("--interests-per-job", type=float, default=GeneratorConfig.interests_per_job)
+    parser.add_argument("--messages-per-conversation", type=float, default=GeneratorConfig.messages_per_conversation)
+    parser.add_argument("--notifications-per-user", type=float, default=GeneratorConfig.notifications_per_user)
+    parser.add_argument("--batch-size", type=int, default=GeneratorConfig.batch_size)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="batch builder processes (0 = threads)")
+    parser.add_argument("--concurrency", type=int, default=4, help="batches built/inserted at once")
+    parser.add_argument("--drop", action="store_true", help="drop the target database first")
+    args = parser.parse_args()
+
+    cfg = GeneratorConfig(
+        users=args.users, jobs=args.jobs, seed=args.seed, days=args.days,
+        interests_per_job=args.interests_per_job, messages_per_conversation=args.messages_per_conversation,
+        notifications_per_user=args.notifications_per_user, batch_size=args.batch_size,
+    )
+    if args.anchor:
+        cfg.anchor = datetime.fromisoformat(args.anchor)
+
+    os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = args.db
+    from backend.database import database
+
+    from motor.motor_asyncio import AsyncIOMotorClient
+    client = AsyncIOMotorClient(os.environ["MONGO_URL"])
+    db = client[args.db]
+    if args.drop:
+        await client.drop_database(args.db)
+    elif await db.users.estimated_document_count():
+        raise SystemExit(f"❌ {args.db} already has users; pass --drop to replace it")
+
+    print(f"🌱 Generating {cfg.users:,} users and {cfg.jobs:,} jobs into {args.db} "
+          f"(seed {cfg.seed}, anchor {cfg.anchor.date()}, {args.workers} workers)")
+    started = time.perf_counter()
+    totals = await generate(db, cfg, workers=args.workers, concurrency=args.concurrency)
+    print("🔗 Reconciled wallet balances and ratings")
+
+    # Build the app's own indexes and counters exactly as the API would
+    await database.connect_to_mongo()
+    await database.rebuild_platform_counters()
+    await database.close_mongo_connection()
+    client.close()
+
+    print(f"✅ Done in {time.perf_counter() - started:.1f}s")
+    for collection, count in sorted(totals.items()):
+        print(f"   {collection:<22} {count:>12,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
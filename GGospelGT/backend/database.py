@@ -1,9 +1,14 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReplaceOne, ReturnDocument, UpdateOne
 from datetime import datetime, timedelta
+import asyncio
 import os
 from typing import List, Optional, Dict, Any
 import logging
 import uuid
+import base64
+import json
+import re
 import certifi
 try:
     from .models.notifications import (
@@ -15,6 +20,11 @@ try:
         ReviewStats, ReviewType, ReviewStatus
     )
     from .models.admin import AdminRole, AdminStatus, AdminActivityType
+    from .models.trade_categories import normalize_category_key, normalize_category_keys
+    from .utils.cache import TTLLRUCache
+    from .utils.metrics import mongo_command_listener
+    from .utils.request_context import request_command_listener
+    from .utils.realtime import realtime_bus
 except ImportError:
     from models.notifications import (
         Notification, NotificationPreferences, NotificationChannel,
@@ -25,6 +35,11 @@ except ImportError:
         ReviewStats, ReviewType, ReviewStatus
     )
     from models.admin import AdminRole, AdminStatus, AdminActivityType
+    from models.trade_categories import normalize_category_key, normalize_category_keys
+    from utils.cache import TTLLRUCache
+    from utils.metrics import mongo_command_listener
+    from utils.request_context import request_command_listener
+    from utils.realtime import realtime_bus
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +48,11 @@ class Database:
         self.client = None
         self.database = None
         self.connected = False
+        # Authenticated users resolved by get_current_user; TTL bounds staleness across workers
+        self.user_cache = TTLLRUCache(
+            max_entries=int(os.getenv("USER_CACHE_MAX_ENTRIES", "10000")),
+            ttl_seconds=float(os.getenv("USER_CACHE_TTL_SEC", "30"))
+        )
 
     async def connect_to_mongo(self):
         # Try different environment variable names for MongoDB URL
@@ -64,6 +84,8 @@ class Database:
             client_kwargs = {
                 "serverSelectionTimeoutMS": timeout_ms,
                 "connectTimeoutMS": connect_timeout_ms,
+                # Latency histograms for /api/metrics; per-request DB accounting and slow-command log
+                "event_listeners": [mongo_command_listener, request_command_listener],
             }
             if use_tls:
                 client_kwargs["tls"] = True
@@ -84,6 +106,7 @@ class Database:
             await self.client.admin.command('ping')
             self.database = self.client[db_name]
             self.connected = True
+            request_command_listener.bind(asyncio.get_running_loop(), self.database)
             logger.info("Connected to MongoDB")
             # Ensure required indexes at startup
             try:
@@ -95,11 +118,38 @@ class Database:
                     partialFilterExpression={"email": {"$type": "string"}}
                 )
 
+                # Users: admin listing sort and indexed prefix search
+                await self.database.users.create_index(
+                    [("created_at", -1)],
+                    name="users_createdAt"
+                )
+                await self.database.users.create_index(
+                    [("role", 1), ("created_at", -1)],
+                    name="users_role_createdAt"
+                )
+                await self.database.users.create_index(
+                    [("name_normalized", 1)],
+                    name="users_nameNormalized"
+                )
+                await self.database.users.create_index(
+                    [("email_normalized", 1)],
+                    name="users_emailNormalized"
+                )
+                await self.database.users.create_index(
+                    [("phone", 1)],
+                    name="users_phone"
+                )
+
                 # Jobs: compound indexes to optimize common queries and sorts
                 await self.database.jobs.create_index(
                     [("status", 1), ("created_at", -1)],
                     name="jobs_status_createdAt"
                 )
+                # Job search keyset order when no text query is given
+                await self.database.jobs.create_index(
+                    [("status", 1), ("created_at", -1), ("id", -1)],
+                    name="jobs_status_createdAt_id"
+                )
                 await self.database.jobs.create_index(
                     [("homeowner_id", 1), ("created_at", -1)],
                     name="jobs_homeownerId_createdAt"
@@ -112,15 +162,80 @@ class Database:
                     [("category", 1), ("created_at", -1)],
                     name="jobs_category_createdAt"
                 )
+                await self.database.jobs.create_index(
+                    [("category_key", 1), ("status", 1), ("created_at", -1)],
+                    name="jobs_categoryKey_status_createdAt"
+                )
+                await self.database.users.create_index(
+                    [("trade_category_keys", 1)],
+                    name="users_tradeCategoryKeys"
+                )
+                # Jobs: geospatial index backing $geoNear for nearby-job queries
+                await self.database.jobs.create_index(
+                    [("geo_location", "2dsphere"), ("status", 1)],
+                    name="jobs_geoLocation_2dsphere_status"
+                )
+                # Jobs: weighted full-text index for relevance-ranked job search
+                await self.database.jobs.create_index(
+                    [("title", "text"), ("description", "text"), ("category", "text"), ("location", "text")],
+                    name="jobs_text_search",
+                    weights={"title": 10, "category": 5, "location": 3, "description": 1},
+                    default_language="english"
+                )
 
-                # Messages: indexes for conversation queries and read-status updates
-                await self.database.messages.create_index(
-                    [("conversation_id", 1), ("created_at", 1)],
-                    name="messages_conversation_createdAt"
+                # Portfolio: reference checks before deleting shared content-addressed files
+                await self.database.portfolio.create_index(
+                    [("storage_files", 1)],
+                    name="portfolio_storageFiles"
+                )
+
+                # Interests: per-job lookups and grouped counts
+                await self.database.interests.create_index(
+                    [("job_id", 1)],
+                    name="interests_jobId"
+                )
+                await self.database.interests.create_index(
+                    [("tradesperson_id", 1)],
+                    name="interests_tradespersonId"
+                )
+
+                # Wallets: looked up by owner
+                await self.database.wallets.create_index(
+                    [("user_id", 1)],
+                    name="wallets_userId"
+                )
+
+                # Quotes: "has this tradesperson quoted this job" lookups in the job feed
+                await self.database.quotes.create_index(
+                    [("job_id", 1), ("tradesperson_id", 1)],
+                    name="quotes_jobId_tradespersonId"
                 )
+
+                # Notifications: outbox polling by the dispatcher worker
+                await self.database.notifications.create_index(
+                    [("status", 1), ("next_attempt_at", 1)],
+                    name="notifications_status_nextAttemptAt"
+                )
+                await self.database.notifications.create_index(
+                    [("claim_token", 1)],
+                    name="notifications_claimToken",
+                    sparse=True
+                )
+
+                # Messages: conversation history in time order; id breaks timestamp ties for keyset pages
                 await self.database.messages.create_index(
-                    [("conversation_id", 1), ("sender_type", 1), ("status", 1)],
-                    name="messages_conversation_sender_status"
+                    [("conversation_id", 1), ("created_at", 1), ("id", 1)],
+                    name="messages_conversation_createdAt_id"
+                )
+
+                # Reviews: profile listings and the review_summaries recent-review join
+                await self.database.reviews.create_index(
+                    [("reviewee_id", 1), ("status", 1), ("created_at", -1)],
+                    name="reviews_reviewee_status_createdAt"
+                )
+                await self.database.reviews.create_index(
+                    [("id", 1)],
+                    name="reviews_id"
                 )
                 logger.info("Database indexes ensured successfully")
             except Exception as e:
@@ -147,13 +262,145 @@ class Database:
             raise RuntimeError("Database unavailable: users collection not accessible")
         return self.database.users
 
+    @staticmethod
+    def _normalize_name(name: Optional[str]) -> str:
+        """Normalized form of a user's name or email used for indexed prefix search"""
+        return (name or "").strip().lower()
+
+    def _apply_normalized_fields(self, data: dict) -> dict:
+        """Keep name_normalized/email_normalized in sync with the name and email being written"""
+        if "name" in data:
+            data["name_normalized"] = self._normalize_name(data.get("name"))
+        if isinstance(data.get("email"), str):
+            data["email_normalized"] = self._normalize_name(data["email"])
+        return data
+
+    async def backfill_user_normalized_names(self) -> int:
+        """Populate name_normalized and email_normalized for users created before they were maintained"""
+        updated = 0
+        for field, source in (("name_normalized", "name"), ("email_normalized", "email")):
+            result = await self.database.users.update_many(
+                {field: {"$exists": False}, source: {"$type": "string"}},
+                [{"$set": {field: {"$toLower": {"$trim": {"input": f"${source}"}}}}}]
+            )
+            if result.modified_count:
+                logger.info(f"Backfilled {field} on {result.modified_count} users")
+            updated += result.modified_count
+        return updated
+
+    @staticmethod
+    def _apply_category_keys(data: dict) -> dict:
+        """Keep category_key/trade_category_keys in sync with the category fields being written"""
+        if data.get("category") is not None:
+            data["category_key"] = normalize_category_key(data["category"])
+        if data.get("trade_categories") is not None:
+            data["trade_category_keys"] = normalize_category_keys(data["trade_categories"])
+        return data
+
+    async def backfill_category_keys(self, batch_size: int = 500) -> dict:
+        """Migration: set category_key on jobs and trade_category_keys on users that lack them"""
+        jobs_updated = 0
+        for category in await self.database.jobs.distinct("category", {"category_key": {"$exists": False}}):
+            if not isinstance(category, str):
+                continue
+            result = await self.database.jobs.update_many(
+                {"category": category, "category_key": {"$exists": False}},
+                {"$set": {"category_key": normalize_category_key(category)}}
+            )
+            jobs_updated += result.modified_count
+
+        users_updated = 0
+        pending: List[Any] = []
+        cursor = self.database.users.find(
+            {"trade_categories": {"$exists": True}, "trade_category_keys": {"$exists": False}},
+            {"_id": 1, "trade_categories": 1}
+        )
+        async for user in cursor:
+            pending.append(UpdateOne(
+                {"_id": user["_id"]},
+                {"$set": {"trade_category_keys": normalize_category_keys(user.get("trade_categories"))}}
+            ))
+            if len(pending) >= batch_size:
+                users_updated += (await self.database.users.bulk_write(pending, ordered=False)).modified_count
+                pending = []
+        if pending:
+            users_updated += (await self.database.users.bulk_write(pending, ordered=False)).modified_count
+
+        if jobs_updated or users_updated:
+            logger.info(f"Backfilled category keys on {jobs_updated} jobs and {users_updated} users")
+        return {"jobs_updated": jobs_updated, "users_updated": users_updated}
+
+    async def backfill_read_watermarks(self, batch_size: int = 500) -> int:
+        """Migration: derive per-participant read watermarks from legacy per-message statuses.
+
+        Each participant's watermark is the newest message from the other party
+        marked read; unread counters are recomputed from the same pass.
+        """
+        migrated = 0
+        while True:
+            conversations = await self.database.conversations.find(
+                {"last_read_at_homeowner": {"$exists": False}}, {"_id": 0, "id": 1}
+            ).limit(batch_size).to_list(length=batch_size)
+            if not conversations:
+                break
+            ids = [conv["id"] for conv in conversations]
+            grouped = await self.database.messages.aggregate([
+                {"$match": {"conversation_id": {"$in": ids}}},
+                {"$group": {
+                    "_id": {"conversation_id": "$conversation_id", "sender_type": "$sender_type"},
+                    "last": {"$max": {"at": "$created_at", "id": "$id"}},
+                    "last_read": {"$max": {"$cond": [
+                        {"$eq": ["$status", "read"]}, {"at": "$created_at", "id": "$id"}, None
+                    ]}},
+                    "unread": {"$sum": {"$cond": [{"$eq": ["$status", "read"]}, 0, 1]}}
+                }}
+            ], allowDiskUse=True).to_list(length=None)
+
+            updates: Dict[str, dict] = {}
+            for conversation_id in ids:
+                fields = {}
+                for user_type in ("homeowner", "tradesperson"):
+                    fields[f"last_read_at_{user_type}"] = None
+                    fields[f"last_read_message_id_{user_type}"] = None
+                    fields[f"unread_count_{user_type}"] = 0
+                updates[conversation_id] = fields
+            last_messages: Dict[str, dict] = {}
+            for group in grouped:
+                conversation_id = group["_id"]["conversation_id"]
+                # Messages from one party are read by the other
+                reader = "homeowner" if group["_id"]["sender_type"] == "tradesperson" else "tradesperson"
+                fields = updates[conversation_id]
+                if group.get("last_read"):
+                    fields[f"last_read_at_{reader}"] = group["last_read"]["at"]
+                    fields[f"last_read_message_id_{reader}"] = group["last_read"]["id"]
+                fields[f"unread_count_{reader}"] = group["unread"]
+                latest = last_messages.get(conversation_id)
+                if latest is None or (group["last"]["at"] or datetime.min) > (latest["at"] or datetime.min):
+                    last_messages[conversation_id] = dict(group["last"], sender_type=group["_id"]["sender_type"])
+            for conversation_id, latest in last_messages.items():
+                updates[conversation_id]["last_message_id"] = latest["id"]
+                updates[conversation_id]["last_message_sender_type"] = latest["sender_type"]
+
+            await self.database.conversations.bulk_write([
+                UpdateOne({"id": conversation_id}, {"$set": fields})
+                for conversation_id, fields in updates.items()
+            ], ordered=False)
+            migrated += len(ids)
+
+        if migrated:
+            logger.info(f"Backfilled read watermarks on {migrated} conversations")
+        return migrated
+
     # User authentication operations
     async def create_user(self, user_data: dict) -> dict:
         """Create a new user"""
         if self.database is None:
             raise RuntimeError("Database unavailable: cannot create user")
+        self._apply_normalized_fields(user_data)
+        self._apply_category_keys(user_data)
         result = await self.database.users.insert_one(user_data)
         user_data['_id'] = str(result.inserted_id)
+        await self._inc_platform_counters(self._tradesperson_counter_increments(user_data, 1))
         return user_data
 
     async def get_user_by_id(self, user_id: str) -> Optional[dict]:
@@ -165,6 +412,25 @@ class Database:
             user['_id'] = str(user['_id'])
         return user
 
+    async def get_user_for_auth(self, user_id: str, fields: List[str]) -> Optional[dict]:
+        """Get only the given user fields (never password_hash) for request authentication"""
+        if self.database is None:
+            return None
+        projection = {field: 1 for field in fields if field != "password_hash"}
+        projection["_id"] = 0
+        return await self.database.users.find_one({"id": user_id}, projection)
+
+    async def get_users_contact_details(self, user_ids: List[str]) -> Dict[str, dict]:
+        """Name, email and phone for many users in one query, keyed by user id"""
+        unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        if self.database is None or not unique_ids:
+            return {}
+        cursor = self.database.users.find(
+            {"id": {"$in": unique_ids}},
+            {"_id": 0, "id": 1, "name": 1, "business_name": 1, "email": 1, "phone": 1}
+        )
+        return {user["id"]: user async for user in cursor}
+
     async def get_user_by_email(self, email: str) -> Optional[dict]:
         """Get user by email"""
         if self.database is None:
@@ -177,13 +443,33 @@ class Database:
     async def update_user(self, user_id: str, update_data: dict) -> bool:
         """Update user data"""
         update_data['updated_at'] = datetime.utcnow()
+        self._apply_normalized_fields(update_data)
+        self._apply_category_keys(update_data)
         if self.database is None:
             raise RuntimeError("Database unavailable: cannot update user")
-        result = await self.database.users.update_one(
+        if 'trade_categories' not in update_data:
+            result = await self.database.users.update_one(
+                {"id": user_id},
+                {"$set": update_data}
+            )
+            self.user_cache.invalidate(user_id)
+            return result.modified_count > 0
+        
+        # Trade categories changed: move the per-category tradesperson counters
+        before = await self.database.users.find_one_and_update(
             {"id": user_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            projection={"_id": 0, "role": 1, "trade_categories": 1},
+            return_document=ReturnDocument.BEFORE
         )
-        return result.modified_count > 0
+        self.user_cache.invalidate(user_id)
+        if before is None:
+            return False
+        increments = self._tradesperson_counter_increments(before, -1)
+        for field, value in self._tradesperson_counter_increments({**before, **update_data}, 1).items():
+            increments[field] = increments.get(field, 0) + value
+        await self._inc_platform_counters(increments)
+        return True
 
     async def update_user_last_login(self, user_id: str):
         """Update user's last login timestamp"""
@@ -193,6 +479,7 @@ class Database:
             {"id": user_id},
             {"$set": {"last_login": datetime.utcnow()}}
         )
+        self.user_cache.invalidate(user_id)
 
     async def verify_user_email(self, user_id: str):
         """Mark user email as verified"""
@@ -202,23 +489,30 @@ class Database:
             {"id": user_id},
             {"$set": {"email_verified": True, "updated_at": datetime.utcnow()}}
         )
+        self.user_cache.invalidate(user_id)
 
     # Job operations
     async def create_job(self, job_data: dict) -> dict:
         # Set expiration date (30 days from now)
         job_data['expires_at'] = datetime.utcnow() + timedelta(days=30)
+        # Maintain GeoJSON point used by the 2dsphere index
+        geo_location = self._build_geo_point(job_data.get('latitude'), job_data.get('longitude'))
+        if geo_location:
+            job_data['geo_location'] = geo_location
+        self._apply_category_keys(job_data)
         result = await self.database.jobs.insert_one(job_data)
         job_data['_id'] = str(result.inserted_id)
+        await self._inc_platform_counters({
+            "total_jobs": 1,
+            "active_jobs": 1 if job_data.get("status") == "active" else 0
+        })
         return job_data
     
     async def update_job(self, job_id: str, update_data: dict) -> bool:
         """Update a job by ID"""
+        self._apply_category_keys(update_data)
         try:
-            result = await self.database.jobs.update_one(
-                {"id": job_id},
-                {"$set": update_data}
-            )
-            return result.modified_count > 0
+            return await self._update_job_fields(job_id, update_data)
         except Exception as e:
             print(f"Error updating job: {e}")
             return False
@@ -253,6 +547,203 @@ class Database:
     # ADMIN JOB MANAGEMENT METHODS
     # ==========================================
 
+    async def _load_admin_homeowner_context(self, jobs: List[dict], legacy_lookup: bool = False,
+                                            with_job_counts: bool = True) -> dict:
+        """Batch-load homeowner users and per-homeowner job counts for a page of jobs.
+
+        Replaces per-row users.find_one/count_documents calls with one users query
+        and one grouped jobs aggregation, so round trips stay constant per page.
+        """
+        ids, emails, names = set(), set(), set()
+        for job in jobs:
+            if job.get("homeowner_id"):
+                ids.add(job["homeowner_id"])
+            elif isinstance(job.get("homeowner"), dict):
+                homeowner_obj = job["homeowner"]
+                homeowner_id = homeowner_obj.get("id")
+                if homeowner_id and homeowner_id != "unknown":
+                    ids.add(homeowner_id)
+                elif legacy_lookup:
+                    if homeowner_obj.get("email"):
+                        emails.add(homeowner_obj["email"])
+                    elif homeowner_obj.get("name", "Unknown") != "Unknown":
+                        names.add(homeowner_obj["name"])
+
+        context = {"users_by_id": {}, "users_by_email": {}, "jobs_by_id": {}, "jobs_by_email": {}, "jobs_by_name": {}}
+
+        user_filters = []
+        if ids:
+            user_filters.append({"id": {"$in": list(ids)}})
+        if emails:
+            user_filters.append({"email": {"$in": list(emails)}})
+        if user_filters:
+            projection = {"_id": 0, "id": 1, "name": 1, "email": 1, "phone": 1,
+                          "verification_status": 1, "created_at": 1}
+            async for user in self.database.users.find({"$or": user_filters}, projection):
+                context["users_by_id"][user.get("id")] = user
+                if user.get("email"):
+                    context["users_by_email"][user["email"]] = user
+
+        if not with_job_counts:
+            return context
+
+        count_filters = []
+        facets = {}
+        if ids:
+            id_list = list(ids)
+            count_filters.extend([{"homeowner_id": {"$in": id_list}}, {"homeowner.id": {"$in": id_list}}])
+            facets["by_id"] = [
+                {"$project": {"key": {"$cond": [
+                    {"$in": [{"$ifNull": ["$homeowner_id", None]}, id_list]},
+                    "$homeowner_id",
+                    "$homeowner.id"
+                ]}}},
+                {"$group": {"_id": "$key", "count": {"$sum": 1}}}
+            ]
+        if emails:
+            count_filters.append({"homeowner.email": {"$in": list(emails)}})
+            facets["by_email"] = [
+                {"$match": {"homeowner.email": {"$in": list(emails)}}},
+                {"$group": {"_id": "$homeowner.email", "count": {"$sum": 1}}}
+            ]
+        if names:
+            count_filters.append({"homeowner.name": {"$in": list(names)}})
+            facets["by_name"] = [
+                {"$match": {"homeowner.name": {"$in": list(names)}}},
+                {"$group": {"_id": "$homeowner.name", "count": {"$sum": 1}}}
+            ]
+        if count_filters:
+            pipeline = [{"$match": {"$or": count_filters}}, {"$facet": facets}]
+            result = await self.database.jobs.aggregate(pipeline).to_list(length=1)
+            if result:
+                for facet_name, target in (("by_id", "jobs_by_id"), ("by_email", "jobs_by_email"), ("by_name", "jobs_by_name")):
+                    for row in result[0].get(facet_name, []):
+                        context[target][row["_id"]] = row["count"]
+
+        return context
+
+    async def _get_interests_counts_by_job(self, job_ids: List[str]) -> Dict[str, int]:
+        """Count interests for many jobs with a single grouped aggregation"""
+        if not job_ids:
+            return {}
+        pipeline = [
+            {"$match": {"job_id": {"$in": job_ids}}},
+            {"$group": {"_id": "$job_id", "count": {"$sum": 1}}}
+        ]
+        rows = await self.database.interests.aggregate(pipeline).to_list(length=None)
+        return {row["_id"]: row["count"] for row in rows}
+
+    def _build_admin_homeowner_info(self, job: dict, context: dict, legacy_lookup: bool = False) -> dict:
+        """Build the detailed admin homeowner block for a job from a preloaded context"""
+        homeowner_info = None
+        users_by_id = context["users_by_id"]
+
+        def from_user(user: dict, fallback: dict, total_jobs: int) -> dict:
+            return {
+                "id": user["id"],
+                "name": user.get("name", fallback.get("name", "Unknown")),
+                "email": user.get("email", fallback.get("email", "")),
+                "phone": user.get("phone", fallback.get("phone", "")),
+                "verification_status": user.get("verification_status", "pending"),
+                "join_date": user.get("created_at"),
+                "total_jobs": total_jobs
+            }
+
+        # First, check if homeowner_id exists at root level
+        has_root_id = bool(job.get("homeowner_id")) if legacy_lookup else "homeowner_id" in job
+        if has_root_id:
+            homeowner_id = job["homeowner_id"]
+            homeowner = users_by_id.get(homeowner_id)
+            if homeowner:
+                homeowner_info = from_user(homeowner, {}, context["jobs_by_id"].get(homeowner_id, 0))
+
+        # If no homeowner_id at root, check if homeowner object exists
+        elif isinstance(job.get("homeowner"), dict):
+            homeowner_obj = job["homeowner"]
+            homeowner_id = homeowner_obj.get("id")
+
+            if homeowner_id and homeowner_id != "unknown":
+                total_jobs = context["jobs_by_id"].get(homeowner_id, 0)
+                homeowner = users_by_id.get(homeowner_id)
+                if homeowner:
+                    homeowner_info = from_user(homeowner, homeowner_obj, total_jobs)
+                else:
+                    # Use the embedded homeowner data
+                    homeowner_info = {
+                        "id": homeowner_obj.get("id", "unknown"),
+                        "name": homeowner_obj.get("name", "Unknown"),
+                        "email": homeowner_obj.get("email", ""),
+                        "phone": homeowner_obj.get("phone", ""),
+                        "verification_status": "pending",
+                        "join_date": job.get("created_at"),
+                        "total_jobs": total_jobs
+                    }
+            elif legacy_lookup:
+                # Homeowner object without an ID: resolve by email, then by name
+                homeowner_name = homeowner_obj.get("name", "Unknown")
+                homeowner_email = homeowner_obj.get("email", "")
+                if homeowner_email:
+                    total_jobs = context["jobs_by_email"].get(homeowner_email, 0)
+                    homeowner = context["users_by_email"].get(homeowner_email)
+                    if homeowner:
+                        homeowner_info = from_user(homeowner, homeowner_obj, total_jobs)
+                    else:
+                        homeowner_info = {
+                            "id": "legacy",
+                            "name": homeowner_name,
+                            "email": homeowner_email,
+                            "phone": homeowner_obj.get("phone", ""),
+                            "verification_status": "legacy",
+                            "join_date": job.get("created_at"),
+                            "total_jobs": total_jobs
+                        }
+                elif homeowner_name != "Unknown":
+                    homeowner_info = {
+                        "id": "legacy",
+                        "name": homeowner_name,
+                        "email": "",
+                        "phone": homeowner_obj.get("phone", ""),
+                        "verification_status": "legacy",
+                        "join_date": job.get("created_at"),
+                        "total_jobs": context["jobs_by_name"].get(homeowner_name, 0)
+                    }
+                else:
+                    # Fallback for completely empty homeowner object
+                    homeowner_info = {
+                        "id": "unknown",
+                        "name": "Unknown",
+                        "email": "",
+                        "phone": "",
+                        "verification_status": "pending",
+                        "join_date": job.get("created_at"),
+                        "total_jobs": 1
+                    }
+            else:
+                # Use the embedded homeowner data as fallback
+                homeowner_info = {
+                    "id": homeowner_obj.get("id", "unknown"),
+                    "name": homeowner_obj.get("name", "Unknown"),
+                    "email": homeowner_obj.get("email", ""),
+                    "phone": homeowner_obj.get("phone", ""),
+                    "verification_status": "pending",
+                    "join_date": job.get("created_at"),
+                    "total_jobs": 1  # At least this job
+                }
+
+        # If still no homeowner info found, use legacy fields or defaults
+        if not homeowner_info:
+            homeowner_info = {
+                "id": "unknown",
+                "name": job.get("homeowner_name", "Unknown"),
+                "email": job.get("homeowner_email", ""),
+                "phone": job.get("homeowner_phone", ""),
+                "verification_status": "pending",
+                "join_date": job.get("created_at"),
+                "total_jobs": 0
+            }
+
+        return homeowner_info
+
     async def get_all_jobs_admin(self, skip: int = 0, limit: int = 50, status: str = None) -> List[dict]:
         """Get all jobs for admin management with comprehensive details"""
         query = {}
@@ -261,14 +752,18 @@ class Database:
         
         # Include soft-deleted jobs for admin (where deleted_at exists)
         cursor = self.database.jobs.find(query).sort("created_at", -1).skip(skip).limit(limit)
+        jobs = await cursor.to_list(length=limit)
         
-        jobs = []
-        async for job in cursor:
+        # Batch-load homeowners and interest counts for the whole page
+        context = await self._load_admin_homeowner_context(jobs, with_job_counts=False)
+        interests_counts = await self._get_interests_counts_by_job([job["id"] for job in jobs if job.get("id")])
+        
+        for job in jobs:
             job["_id"] = str(job["_id"])
             
             # Get homeowner details
             if "homeowner_id" in job:
-                homeowner = await self.database.users.find_one({"id": job["homeowner_id"]})
+                homeowner = context["users_by_id"].get(job["homeowner_id"])
                 if homeowner:
                     job["homeowner"] = {
                         "id": homeowner["id"],
@@ -292,16 +787,12 @@ class Database:
                     "phone": job.get("homeowner_phone", "")
                 }
             
-            # Get interests count
-            interests_count = await self.database.interests.count_documents({"job_id": job["id"]})
-            job["interests_count"] = interests_count
+            job["interests_count"] = interests_counts.get(job.get("id"), 0)
             
             # Set default access fees if not present
             if "access_fee_naira" not in job:
                 job["access_fee_naira"] = 1000
                 job["access_fee_coins"] = 10
-            
-            jobs.append(job)
         
         return jobs
 
@@ -310,105 +801,14 @@ class Database:
         query = {"status": "pending_approval"}
         
         cursor = self.database.jobs.find(query).sort("created_at", -1).skip(skip).limit(limit)
+        jobs = await cursor.to_list(length=limit)
+        
+        # Batch-load homeowners and their job counts for the whole page
+        context = await self._load_admin_homeowner_context(jobs)
         
-        jobs = []
-        async for job in cursor:
+        for job in jobs:
             job["_id"] = str(job["_id"])
-            
-            # Get homeowner details - check multiple possible sources
-            homeowner_id = None
-            homeowner_info = None
-            
-            # First, check if homeowner_id exists at root level
-            if "homeowner_id" in job:
-                homeowner_id = job["homeowner_id"]
-                homeowner = await self.database.users.find_one({"id": homeowner_id})
-                if homeowner:
-                    homeowner_info = {
-                        "id": homeowner["id"],
-                        "name": homeowner.get("name", "Unknown"),
-                        "email": homeowner.get("email", ""),
-                        "phone": homeowner.get("phone", "")
-                    }
-                    homeowner_info["verification_status"] = homeowner.get("verification_status", "pending")
-                    homeowner_info["join_date"] = homeowner.get("created_at")
-                    # Count total jobs for this homeowner
-                    homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                        "$or": [
-                            {"homeowner_id": homeowner_id},
-                            {"homeowner.id": homeowner_id}
-                        ]
-                    })
-            
-            # If no homeowner_id at root, check if homeowner object exists
-            elif "homeowner" in job and isinstance(job["homeowner"], dict):
-                homeowner_obj = job["homeowner"]
-                homeowner_id = homeowner_obj.get("id")
-                
-                if homeowner_id and homeowner_id != "unknown":
-                    # Try to get updated user info from users collection
-                    homeowner = await self.database.users.find_one({"id": homeowner_id})
-                    if homeowner:
-                        homeowner_info = {
-                            "id": homeowner["id"],
-                            "name": homeowner.get("name", homeowner_obj.get("name", "Unknown")),
-                            "email": homeowner.get("email", homeowner_obj.get("email", "")),
-                            "phone": homeowner.get("phone", homeowner_obj.get("phone", ""))
-                        }
-                        homeowner_info["verification_status"] = homeowner.get("verification_status", "pending")
-                        homeowner_info["join_date"] = homeowner.get("created_at")
-                        # Count total jobs for this homeowner
-                        homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                            "$or": [
-                                {"homeowner_id": homeowner_id},
-                                {"homeowner.id": homeowner_id}
-                            ]
-                        })
-                    else:
-                        # Use the embedded homeowner data
-                        homeowner_info = {
-                            "id": homeowner_obj.get("id", "unknown"),
-                            "name": homeowner_obj.get("name", "Unknown"),
-                            "email": homeowner_obj.get("email", ""),
-                            "phone": homeowner_obj.get("phone", "")
-                        }
-                        homeowner_info["verification_status"] = "pending"
-                        homeowner_info["join_date"] = job.get("created_at")
-                        # Count total jobs for this homeowner
-                        homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                            "$or": [
-                                {"homeowner_id": homeowner_id},
-                                {"homeowner.id": homeowner_id}
-                            ]
-                        })
-                else:
-                    # Use the embedded homeowner data as fallback
-                    homeowner_info = {
-                        "id": homeowner_obj.get("id", "unknown"),
-                        "name": homeowner_obj.get("name", "Unknown"),
-                        "email": homeowner_obj.get("email", ""),
-                        "phone": homeowner_obj.get("phone", ""),
-                        "verification_status": "pending",
-                        "join_date": job.get("created_at"),
-                        "total_jobs": 1  # At least this job
-                    }
-            
-            # If still no homeowner info found, use legacy fields or defaults
-            if not homeowner_info:
-                homeowner_info = {
-                    "id": "unknown",
-                    "name": job.get("homeowner_name", "Unknown"),
-                    "email": job.get("homeowner_email", ""),
-                    "phone": job.get("homeowner_phone", ""),
-                    "verification_status": "pending",
-                    "join_date": job.get("created_at"),
-                    "total_jobs": 0
-                }
-            
-            # Set the homeowner info in the job
-            job["homeowner"] = homeowner_info
-            
-            jobs.append(job)
+            job["homeowner"] = self._build_admin_homeowner_info(job, context)
         
         return jobs
 
@@ -418,19 +818,12 @@ class Database:
 
     async def update_job_approval_status(self, job_id: str, approval_data: dict) -> bool:
         """Update job approval status with admin details"""
-        result = await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": approval_data}
-        )
-        return result.modified_count > 0
+        return await self._update_job_fields(job_id, approval_data)
 
     async def update_job_admin(self, job_id: str, update_data: dict) -> bool:
         """Update job details (admin only)"""
-        result = await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": update_data}
-        )
-        return result.modified_count > 0
+        self._apply_category_keys(update_data)
+        return await self._update_job_fields(job_id, update_data)
 
     async def get_job_interests_count(self, job_id: str) -> int:
         """Get count of interests for a specific job"""
@@ -571,41 +964,27 @@ class Database:
         
         # Add update timestamp
         update_data["updated_at"] = datetime.utcnow()
+        self._apply_category_keys(update_data)
         
         if not update_data:
             return False
         
-        result = await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": update_data}
-        )
-        
-        return result.modified_count > 0
+        return await self._update_job_fields(job_id, update_data)
 
     async def update_job_status_admin(self, job_id: str, status: str) -> bool:
         """Update job status (admin only)"""
-        result = await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": {
-                "status": status,
-                "updated_at": datetime.utcnow()
-            }}
-        )
-        
-        return result.modified_count > 0
+        return await self._update_job_fields(job_id, {
+            "status": status,
+            "updated_at": datetime.utcnow()
+        })
 
     async def soft_delete_job_admin(self, job_id: str) -> bool:
         """Soft delete job (admin only)"""
-        result = await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": {
-                "status": "deleted",
-                "deleted_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }}
-        )
-        
-        return result.modified_count > 0
+        return await self._update_job_fields(job_id, {
+            "status": "deleted",
+            "deleted_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        })
 
     async def get_jobs_statistics_admin(self) -> dict:
         """Get comprehensive job statistics for admin dashboard"""
@@ -912,121 +1291,75 @@ class Database:
                 "max_price": 0
             }
 
-    async def get_jobs_for_tradesperson(self, tradesperson_id: str, trade_categories: List[str], skip: int = 0, limit: int = 10) -> List[dict]:
-        """Get jobs available for a tradesperson to quote on"""
+    async def get_available_jobs_feed_for_tradesperson(self, tradesperson_id: str, trade_categories: List[str], skip: int = 0, limit: int = 10) -> dict:
+        """Get the page of jobs a tradesperson can quote on, plus the total, in one aggregation.
+
+        Relies on the maintained ``quotes_count`` on each job instead of materializing every
+        quote, and on the quotes(job_id, tradesperson_id) index to exclude jobs already quoted.
+        """
         # Build query for jobs in tradesperson's categories
         match_query = {
             "status": "active",
-            "expires_at": {"$gt": datetime.utcnow()}
+            "expires_at": {"$gt": datetime.utcnow()},
+            "quotes_count": {"$not": {"$gte": 5}}  # Exclude jobs with 5+ quotes (missing counts as 0)
         }
         
         if trade_categories:
-            match_query["category"] = {"$in": trade_categories}
+            match_query["category_key"] = {"$in": normalize_category_keys(trade_categories)}
         
-        # Get jobs and exclude ones already quoted on
         pipeline = [
             {"$match": match_query},
+            # Exclude jobs already quoted on (indexed point lookup per job)
             {"$lookup": {
                 "from": "quotes",
-                "let": {"job_id": "$id"},
+                "localField": "id",
+                "foreignField": "job_id",
                 "pipeline": [
-                    {"$match": {
-                        "$expr": {
-                            "$and": [
-                                {"$eq": ["$job_id", "$$job_id"]},
-                                {"$eq": ["$tradesperson_id", tradesperson_id]}
-                            ]
-                        }
-                    }}
+                    {"$match": {"tradesperson_id": tradesperson_id}},
+                    {"$limit": 1},
+                    {"$project": {"_id": 1}}
                 ],
                 "as": "existing_quotes"
             }},
-            {"$match": {"existing_quotes": {"$size": 0}}},  # Exclude jobs already quoted on
-            {"$lookup": {
-                "from": "quotes",
-                "localField": "id",
-                "foreignField": "job_id",
-                "as": "all_quotes"
-            }},
-            {"$addFields": {
-                "quotes_count": {"$size": "$all_quotes"}
-            }},
-            {"$match": {"quotes_count": {"$lt": 5}}},  # Exclude jobs with 5+ quotes
+            {"$match": {"existing_quotes": {"$size": 0}}},
             {"$sort": {"created_at": -1}},
-            {"$skip": skip},
-            {"$limit": limit},
-            {"$project": {
-                "id": 1,
-                "title": 1,
-                "description": 1,
-                "category": 1,
-                "location": 1,
-                "budget_min": 1,
-                "budget_max": 1,
-                "timeline": 1,
-                "created_at": 1,
-                "expires_at": 1,
-                "quotes_count": 1,
-                "homeowner": {
-                    "name": "$homeowner.name",
-                    "location": "$location"
-                }
-            }}
-        ]
-        
-        jobs = await self.database.jobs.aggregate(pipeline).to_list(None)
-        return jobs
-
-    async def get_available_jobs_count_for_tradesperson(self, tradesperson_id: str, trade_categories: List[str]) -> int:
-        """Count available jobs for a tradesperson"""
-        match_query = {
-            "status": "active",
-            "expires_at": {"$gt": datetime.utcnow()}
-        }
-        
-        if trade_categories:
-            match_query["category"] = {"$in": trade_categories}
-        
-        pipeline = [
-            {"$match": match_query},
-            {"$lookup": {
-                "from": "quotes",
-                "let": {"job_id": "$id"},
-                "pipeline": [
-                    {"$match": {
-                        "$expr": {
-                            "$and": [
-                                {"$eq": ["$job_id", "$$job_id"]},
-                                {"$eq": ["$tradesperson_id", tradesperson_id]}
-                            ]
+            {"$facet": {
+                "jobs": [
+                    {"$skip": skip},
+                    {"$limit": limit},
+                    {"$project": {
+                        "_id": 0,
+                        "id": 1,
+                        "title": 1,
+                        "description": 1,
+                        "category": 1,
+                        "location": 1,
+                        "budget_min": 1,
+                        "budget_max": 1,
+                        "timeline": 1,
+                        "created_at": 1,
+                        "expires_at": 1,
+                        "quotes_count": {"$ifNull": ["$quotes_count", 0]},
+                        "homeowner": {
+                            "name": "$homeowner.name",
+                            "location": "$location"
                         }
                     }}
                 ],
-                "as": "existing_quotes"
-            }},
-            {"$match": {"existing_quotes": {"$size": 0}}},
-            {"$lookup": {
-                "from": "quotes",
-                "localField": "id",
-                "foreignField": "job_id",
-                "as": "all_quotes"
-            }},
-            {"$addFields": {
-                "quotes_count": {"$size": "$all_quotes"}
-            }},
-            {"$match": {"quotes_count": {"$lt": 5}}},
-            {"$count": "total"}
+                "total": [{"$count": "count"}]
+            }}
         ]
         
-        result = await self.database.jobs.aggregate(pipeline).to_list(1)
-        return result[0]["total"] if result else 0
+        result = await self.database.jobs.aggregate(pipeline).to_list(length=1)
+        facet = result[0] if result else {"jobs": [], "total": []}
+        return {
+            "jobs": facet["jobs"],
+            "total": facet["total"][0]["count"] if facet["total"] else 0
+        }
 
     async def update_job_status(self, job_id: str, status: str):
         """Update job status"""
-        await self.database.jobs.update_one(
-            {"id": job_id},
-            {"$set": {"status": status, "updated_at": datetime.utcnow()}}
-        )
+        await self._update_job_fields(job_id, {"status": status, "updated_at": datetime.utcnow()})
 
     async def get_quotes_count_by_job(self, job_id: str) -> int:
         return await self.database.quotes.count_documents({"job_id": job_id})
@@ -1035,6 +1368,7 @@ class Database:
     async def create_review(self, review_data: dict) -> dict:
         result = await self.database.reviews.insert_one(review_data)
         review_data['_id'] = str(result.inserted_id)
+        await self._inc_platform_counters(self._review_counter_increments(review_data, 1))
         return review_data
 
     async def get_reviews(self, skip: int = 0, limit: int = 10, filters: dict = None) -> List[dict]:
@@ -1061,6 +1395,129 @@ class Database:
         return reviews
 
     # Statistics operations
+    # ==========================================
+    # PLATFORM COUNTERS
+    # ==========================================
+
+    PLATFORM_COUNTERS_ID = "platform"
+
+    async def _inc_platform_counters(self, increments: Dict[str, float]):
+        """Atomically apply $inc deltas to the platform_counters document"""
+        increments = {field: value for field, value in increments.items() if value}
+        if not increments or self.database is None:
+            return
+        try:
+            await self.database.platform_counters.update_one(
+                {"_id": self.PLATFORM_COUNTERS_ID},
+                {"$inc": increments, "$set": {"updated_at": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            # Counters are repairable via rebuild_platform_counters; never fail the write path
+            logger.warning(f"Failed to update platform counters: {e}")
+
+    async def _record_job_status_change(self, old_status: Optional[str], new_status: Optional[str]):
+        """Keep active_jobs in step with job status transitions"""
+        delta = int(new_status == "active") - int(old_status == "active")
+        if delta:
+            await self._inc_platform_counters({"active_jobs": delta})
+
+    async def _update_job_fields(self, job_id: str, update_data: dict) -> bool:
+        """$set fields on a job, tracking status transitions for the platform counters"""
+        if "status" not in update_data:
+            result = await self.database.jobs.update_one({"id": job_id}, {"$set": update_data})
+            return result.modified_count > 0
+
+        before = await self.database.jobs.find_one_and_update(
+            {"id": job_id},
+            {"$set": update_data},
+            projection={"_id": 0, "status": 1},
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            return False
+        await self._record_job_status_change(before.get("status"), update_data["status"])
+        return True
+
+    def _tradesperson_counter_increments(self, user: dict, sign: int) -> Dict[str, int]:
+        """Counter deltas for adding (sign=1) or removing (sign=-1) a tradesperson"""
+        if user.get("role") != "tradesperson":
+            return {}
+        increments = {"total_tradespeople": sign}
+        for key in normalize_category_keys(user.get("trade_categories")):
+            increments[f"tradespeople_by_category.{key}"] = sign
+        return increments
+
+    @staticmethod
+    def _review_counter_increments(review: dict, sign: int) -> Dict[str, int]:
+        """Counter deltas for adding (sign=1) or removing (sign=-1) a review; every status counts"""
+        return {"total_reviews": sign, "rating_sum": sign * (review.get("rating") or 0)}
+
+    async def _apply_review_counter_change(self, before: dict, after: dict):
+        """Move the review counters from a review's old state to its new one"""
+        increments = self._merge_review_increments(
+            self._review_counter_increments(before, -1),
+            self._review_counter_increments(after, 1)
+        )
+        if increments:
+            await self._inc_platform_counters(increments)
+
+    async def rebuild_platform_counters(self) -> dict:
+        """Recompute platform_counters from the source collections (drift repair)"""
+        total_tradespeople = await self.database.users.count_documents({"role": "tradesperson"})
+        total_jobs = await self.database.jobs.count_documents({})
+        active_jobs = await self.database.jobs.count_documents({"status": "active"})
+
+        rating = await self.database.reviews.aggregate([
+            {"$group": {"_id": None, "count": {"$sum": 1}, "rating_sum": {"$sum": "$rating"}}}
+        ]).to_list(1)
+
+        by_category = {}
+        category_pipeline = [
+            {"$match": {"role": "tradesperson", "trade_categories": {"$exists": True, "$ne": None}}},
+            {"$unwind": "$trade_categories"},
+            {"$group": {"_id": "$trade_categories", "count": {"$sum": 1}}}
+        ]
+        async for row in self.database.users.aggregate(category_pipeline):
+            key = normalize_category_key(row["_id"]) if isinstance(row["_id"], str) else ""
+            if key:
+                by_category[key] = by_category.get(key, 0) + row["count"]
+
+        counters = {
+            "total_tradespeople": total_tradespeople,
+            "total_reviews": rating[0]["count"] if rating else 0,
+            "rating_sum": rating[0]["rating_sum"] if rating else 0,
+            "total_jobs": total_jobs,
+            "active_jobs": active_jobs,
+            "tradespeople_by_category": by_category,
+            "updated_at": datetime.utcnow(),
+            "rebuilt_at": datetime.utcnow()
+        }
+        await self.database.platform_counters.replace_one(
+            {"_id": self.PLATFORM_COUNTERS_ID}, counters, upsert=True
+        )
+        logger.info("Platform counters rebuilt")
+        return counters
+
+    async def get_platform_counters(self) -> dict:
+        """Read the platform_counters document, building it on first use.
+
+        A document without ``rebuilt_at`` was upserted by $inc deltas alone (e.g.
+        the first counted write on an existing database) and is rebuilt.
+        """
+        counters = await self.database.platform_counters.find_one({"_id": self.PLATFORM_COUNTERS_ID})
+        if counters is None or "rebuilt_at" not in counters:
+            counters = await self.rebuild_platform_counters()
+        return counters
+
+    async def ensure_platform_counters(self):
+        """Build platform_counters unless a full rebuild has already produced it (run by migrate)"""
+        counters = await self.database.platform_counters.find_one(
+            {"_id": self.PLATFORM_COUNTERS_ID}, {"rebuilt_at": 1}
+        )
+        if counters is None or "rebuilt_at" not in counters:
+            await self.rebuild_platform_counters()
+
     async def get_platform_stats(self) -> dict:
         # If database is not connected, return safe defaults
         if not self.connected or self.database is None:
@@ -1080,30 +1537,10 @@ class Database:
                 "active_jobs": 0
             }
 
-        # Total tradespeople from users collection
-        total_tradespeople = await self.database.users.count_documents({"role": "tradesperson"})
-        
-        # Total reviews
-        total_reviews = await self.database.reviews.count_documents({})
-        
-        # Average rating
-        pipeline = [
-            {"$group": {
-                "_id": None,
-                "avg_rating": {"$avg": "$rating"}
-            }}
-        ]
-        
-        result = await self.database.reviews.aggregate(pipeline).to_list(1)
-        average_rating = round(result[0]['avg_rating'], 1) if result else 0.0
-        
-        # Total jobs
-        total_jobs = await self.database.jobs.count_documents({})
-        
-        # Active jobs
-        active_jobs = await self.database.jobs.count_documents({
-            "status": "active"
-        })
+        # O(1) read of the incrementally maintained counters
+        counters = await self.get_platform_counters()
+        total_reviews = counters.get("total_reviews", 0)
+        average_rating = round(counters.get("rating_sum", 0) / total_reviews, 1) if total_reviews else 0.0
         
         # Get total available categories from static trade categories
         try:
@@ -1117,26 +1554,17 @@ class Database:
             total_categories = len(all_trades)
         except Exception as e:
             logger.error(f"Error getting categories count: {e}")
-            # Fallback: count unique categories from tradespeople
-            users_with_categories = await self.database.users.find(
-                {"role": "tradesperson", "trade_categories": {"$exists": True, "$ne": None}},
-                {"trade_categories": 1}
-            ).to_list(length=None)
-            
-            all_categories = set()
-            for user in users_with_categories:
-                trade_categories = user.get("trade_categories", [])
-                if trade_categories:
-                    all_categories.update(trade_categories)
-            total_categories = len(all_categories)
+            # Fallback: categories that have at least one tradesperson
+            by_category = counters.get("tradespeople_by_category", {})
+            total_categories = len([key for key, count in by_category.items() if count > 0])
 
         return {
-            "total_tradespeople": total_tradespeople,
+            "total_tradespeople": counters.get("total_tradespeople", 0),
             "total_categories": total_categories,
             "total_reviews": total_reviews,
             "average_rating": average_rating,
-            "total_jobs": total_jobs,
-            "active_jobs": active_jobs
+            "total_jobs": counters.get("total_jobs", 0),
+            "active_jobs": counters.get("active_jobs", 0)
         }
 
     # Category operations
@@ -1181,20 +1609,11 @@ class Database:
                     "tradesperson_count": 0,
                     **details
                 } for name, details in category_details.items()
-            ]
-
-        # Aggregate to count tradespeople by category from users collection
-        pipeline = [
-            {"$match": {"role": "tradesperson", "trade_categories": {"$exists": True, "$ne": None}}},
-            {"$unwind": "$trade_categories"},
-            {"$group": {
-                "_id": "$trade_categories",
-                "count": {"$sum": 1}
-            }},
-            {"$sort": {"count": -1}}
-        ]
-        
-        results = await self.database.users.aggregate(pipeline).to_list(None)
+            ]
+
+        # Tradesperson counts per category come from the maintained platform counters
+        counters = await self.get_platform_counters()
+        by_category = counters.get("tradespeople_by_category", {})
         
         # Define category details for Nigeria
         category_details = {
@@ -1231,14 +1650,15 @@ class Database:
         }
         
         categories = []
-        for result in results:
-            category_name = result["_id"]
-            if category_name in category_details:
+        for category_name, details in category_details.items():
+            count = by_category.get(normalize_category_key(category_name), 0)
+            if count > 0:
                 categories.append({
                     "title": category_name,
-                    "tradesperson_count": result["count"],
-                    **category_details[category_name]
+                    "tradesperson_count": count,
+                    **details
                 })
+        categories.sort(key=lambda category: category["tradesperson_count"], reverse=True)
         
         return categories
 
@@ -1298,6 +1718,14 @@ class Database:
         
         return items
 
+    @staticmethod
+    def _use_portfolio_thumbnail(item: dict) -> dict:
+        """Point a listed portfolio item at its thumbnail; the full rendition stays in full_image_url"""
+        if item.get('thumbnail_url'):
+            item['full_image_url'] = item.get('full_image_url') or item['image_url']
+            item['image_url'] = item['thumbnail_url']
+        return item
+
     async def get_public_portfolio_items_by_tradesperson(self, tradesperson_id: str) -> List[dict]:
         """Get public portfolio items for a specific tradesperson"""
         cursor = self.portfolio_collection.find({
@@ -1311,6 +1739,7 @@ class Database:
         for item in items:
             if '_id' in item:
                 item['_id'] = str(item['_id'])
+            self._use_portfolio_thumbnail(item)
         
         return items
 
@@ -1324,13 +1753,28 @@ class Database:
         
         items = await cursor.to_list(length=None)
         
-        # Convert ObjectId to string
         for item in items:
+            # Convert ObjectId to string
             if '_id' in item:
                 item['_id'] = str(item['_id'])
+            self._use_portfolio_thumbnail(item)
         
         return items
 
+    async def get_referenced_portfolio_files(self, filenames: List[str]) -> set:
+        """Stored file names from ``filenames`` still used by any portfolio item"""
+        if not filenames:
+            return set()
+        referenced = set()
+        cursor = self.portfolio_collection.find(
+            {"$or": [{"storage_files": {"$in": filenames}}, {"image_filename": {"$in": filenames}}]},
+            {"_id": 0, "storage_files": 1, "image_filename": 1}
+        )
+        async for item in cursor:
+            referenced.update(item.get("storage_files") or [])
+            referenced.add(item.get("image_filename"))
+        return referenced & set(filenames)
+
     async def update_portfolio_item(self, item_id: str, update_data: dict) -> dict:
         """Update portfolio item"""
         await self.portfolio_collection.update_one(
@@ -1562,9 +2006,12 @@ class Database:
         review_dict["_id"] = review_dict["id"]
         
         await self.reviews_collection.insert_one(review_dict)
+        await self._inc_platform_counters(self._review_counter_increments(review_dict, 1))
         
-        # Update user's review summary
-        await self._update_user_review_summary(review.reviewee_id)
+        # Fold the review into the reviewee's summary
+        increments = self._review_summary_increments(review_dict, 1)
+        if increments:
+            await self._apply_review_summary_change(review.reviewee_id, increments, new_review_id=review.id)
         
         return review
 
@@ -1582,16 +2029,20 @@ class Database:
         user_id: str, 
         review_type: Optional[str] = None,
         page: int = 1, 
-        limit: int = 10
+        limit: int = 10,
+        total: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Get reviews for a user with pagination"""
+        """Get reviews for a user with pagination.
+
+        Pass ``total`` (e.g. from the review summary) to skip the count query.
+        """
         query = {"reviewee_id": user_id, "status": ReviewStatus.PUBLISHED}
         
         if review_type:
             query["review_type"] = review_type
         
-        # Get total count
-        total = await self.reviews_collection.count_documents(query)
+        if total is None:
+            total = await self.reviews_collection.count_documents(query)
         
         # Get paginated reviews
         skip = (page - 1) * limit
@@ -1603,18 +2054,12 @@ class Database:
             del doc["_id"]
             reviews.append(Review(**doc))
         
-        # Calculate average rating
-        avg_rating = 0.0
-        if reviews:
-            avg_rating = sum(review.rating for review in reviews) / len(reviews)
-        
         return {
             "reviews": reviews,
             "total": total,
             "page": page,
             "limit": limit,
-            "total_pages": (total + limit - 1) // limit,
-            "average_rating": round(avg_rating, 1)
+            "total_pages": (total + limit - 1) // limit
         }
 
     async def get_reviews_by_job(self, job_id: str) -> List[Review]:
@@ -1632,74 +2077,78 @@ class Database:
         return reviews
 
     async def get_user_review_summary(self, user_id: str) -> ReviewSummary:
-        """Get comprehensive review summary for a user"""
-        # Get all published reviews for user
-        reviews_cursor = self.reviews_collection.find(
-            {"reviewee_id": user_id, "status": ReviewStatus.PUBLISHED}
-        ).sort("created_at", -1)
-        
-        all_reviews = []
-        total_rating = 0
-        rating_distribution = {"5": 0, "4": 0, "3": 0, "2": 0, "1": 0}
-        category_totals = {}
-        category_counts = {}
-        recommend_count = 0
-        
-        async for doc in reviews_cursor:
-            doc["id"] = str(doc["_id"])
-            del doc["_id"]
-            review = Review(**doc)
-            all_reviews.append(review)
-            
-            # Calculate rating statistics
-            total_rating += review.rating
-            rating_distribution[str(review.rating)] += 1
-            
-            # Calculate category averages
-            if review.category_ratings:
-                for category, rating in review.category_ratings.items():
-                    if category not in category_totals:
-                        category_totals[category] = 0
-                        category_counts[category] = 0
-                    category_totals[category] += rating
-                    category_counts[category] += 1
-            
-            # Count recommendations
-            if review.would_recommend:
-                recommend_count += 1
-        
-        # Calculate averages
-        total_reviews = len(all_reviews)
-        average_rating = (total_rating / total_reviews) if total_reviews > 0 else 0.0
-        
-        category_averages = {}
-        for category, total in category_totals.items():
-            category_averages[category] = round(total / category_counts[category], 1)
-        
-        recommendation_percentage = (recommend_count / total_reviews * 100) if total_reviews > 0 else 0.0
-        
-        return ReviewSummary(
-            total_reviews=total_reviews,
-            average_rating=round(average_rating, 1),
-            rating_distribution=rating_distribution,
-            category_averages=category_averages,
-            recent_reviews=all_reviews[:5],  # Last 5 reviews
-            recommendation_percentage=round(recommendation_percentage, 1),
-            verified_reviews_count=total_reviews  # All reviews are verified after job completion
-        )
+        """Get comprehensive review summary for a user.
+
+        Reads the maintained review_summaries document; the recent reviews are
+        joined in the same aggregation, so this is one round trip.
+        """
+        docs = await self.review_summaries_collection.aggregate([
+            {"$match": {"_id": user_id}},
+            {"$lookup": {
+                "from": "reviews",
+                "localField": "recent_review_ids",
+                "foreignField": "id",
+                "as": "recent_reviews"
+            }}
+        ]).to_list(length=1)
+        return self._review_summary_from_doc(docs[0] if docs else {})
 
     async def update_review(self, review_id: str, update_data: Dict[str, Any]) -> Optional[Review]:
-        """Update a review"""
+        """Update a review, adjusting the reviewee's summary by the difference"""
         update_data["updated_at"] = datetime.utcnow()
         
-        result = await self.reviews_collection.update_one(
+        before = await self.reviews_collection.find_one_and_update(
             {"id": review_id},
-            {"$set": update_data}
+            {"$set": update_data},
+            return_document=ReturnDocument.BEFORE
         )
+        if before is None:
+            return None
         
-        if result.modified_count > 0:
+        after = {**before, **update_data}
+        await self._apply_review_counter_change(before, after)
+        increments = self._merge_review_increments(
+            self._review_summary_increments(before, -1),
+            self._review_summary_increments(after, 1)
+        )
+        if increments:
+            await self._apply_review_summary_change(
+                after["reviewee_id"], increments, refresh_recent=before.get("status") != after.get("status")
+            )
+        
+        after["id"] = str(after.pop("_id"))
+        return Review(**after)
+
+    async def set_review_status(self, review_id: str, status: ReviewStatus, reason: Optional[str] = None,
+                                moderator_notes: Optional[str] = None,
+                                moderator_id: Optional[str] = None) -> Optional[Review]:
+        """Moderate a review; publishing or unpublishing it updates the reviewee's summary"""
+        now = datetime.utcnow()
+        before = await self.reviews_collection.find_one_and_update(
+            {"id": review_id, "status": {"$ne": status}},
+            {"$set": {
+                "status": status,
+                "moderation_reason": reason,
+                "moderator_notes": moderator_notes,
+                "moderated_by": moderator_id,
+                "moderated_at": now,
+                "updated_at": now
+            }},
+            return_document=ReturnDocument.BEFORE
+        )
+        if before is None:
+            # Missing, or already in this status
             return await self.get_review_by_id(review_id)
-        return None
+        
+        after = {**before, "status": status}
+        await self._apply_review_counter_change(before, after)
+        increments = self._merge_review_increments(
+            self._review_summary_increments(before, -1),
+            self._review_summary_increments(after, 1)
+        )
+        if increments:
+            await self._apply_review_summary_change(after["reviewee_id"], increments, refresh_recent=True)
+        return await self.get_review_by_id(review_id)
 
     async def add_review_response(self, review_id: str, response: str, responder_id: str) -> Optional[Review]:
         """Add response to a review"""
@@ -1889,21 +2338,182 @@ class Database:
         
         return False
 
-    async def _update_user_review_summary(self, user_id: str):
-        """Update cached review summary for user (internal method)"""
-        summary = await self.get_user_review_summary(user_id)
-        
-        # Update user profile with review stats
-        await self.database.users.update_one(
-            {"id": user_id},
-            {"$set": {
-                "total_reviews": summary.total_reviews,
-                "average_rating": summary.average_rating,
-                "recommendation_percentage": summary.recommendation_percentage,
-                "review_summary_updated_at": datetime.utcnow()
+    # ==========================================
+    # REVIEW SUMMARIES
+    # ==========================================
+    # One review_summaries document per reviewee (_id = user id) holding a rating
+    # histogram, category sums/counts, the recommend count and the newest
+    # published review ids. Review writes apply their difference with $inc;
+    # rebuild_review_summaries repairs drift from the reviews collection.
+
+    REVIEW_SUMMARY_RECENT = 5
+
+    @property
+    def review_summaries_collection(self):
+        """Access to review_summaries collection"""
+        return self.database.review_summaries
+
+    @staticmethod
+    def _review_summary_increments(review: dict, sign: int) -> Dict[str, int]:
+        """$inc contribution of one review to its reviewee's summary (published reviews only)"""
+        if review.get("status") != ReviewStatus.PUBLISHED:
+            return {}
+        rating = int(review.get("rating") or 0)
+        increments = {"total_reviews": sign, "rating_sum": sign * rating, f"rating_counts.{rating}": sign}
+        if review.get("would_recommend"):
+            increments["recommend_count"] = sign
+        for category, value in (review.get("category_ratings") or {}).items():
+            increments[f"category_sums.{category}"] = sign * value
+            increments[f"category_counts.{category}"] = sign
+        return increments
+
+    @staticmethod
+    def _merge_review_increments(*parts: Dict[str, int]) -> Dict[str, int]:
+        merged: Dict[str, int] = {}
+        for part in parts:
+            for field, value in part.items():
+                merged[field] = merged.get(field, 0) + value
+        return {field: value for field, value in merged.items() if value}
+
+    async def _recent_published_review_ids(self, user_id: str) -> List[str]:
+        cursor = self.reviews_collection.find(
+            {"reviewee_id": user_id, "status": ReviewStatus.PUBLISHED}, {"_id": 0, "id": 1}
+        ).sort("created_at", -1).limit(self.REVIEW_SUMMARY_RECENT)
+        return [doc["id"] async for doc in cursor]
+
+    async def _apply_review_summary_change(self, user_id: str, increments: Dict[str, int],
+                                           new_review_id: Optional[str] = None, refresh_recent: bool = False):
+        """Apply one review change to the reviewee's summary in a single atomic update"""
+        update: Dict[str, Any] = {
+            "$inc": increments,
+            "$set": {"user_id": user_id, "updated_at": datetime.utcnow()}
+        }
+        if refresh_recent:
+            update["$set"]["recent_review_ids"] = await self._recent_published_review_ids(user_id)
+        elif new_review_id:
+            update["$push"] = {"recent_review_ids": {
+                "$each": [new_review_id], "$position": 0, "$slice": self.REVIEW_SUMMARY_RECENT
             }}
+        summary = await self.review_summaries_collection.find_one_and_update(
+            {"_id": user_id}, update, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        await self._update_user_review_stats(user_id, summary)
+
+    @staticmethod
+    def _user_review_stats(summary_doc: dict) -> Dict[str, Any]:
+        """Headline review stats copied from a summary onto the user profile"""
+        total = summary_doc.get("total_reviews", 0)
+        return {
+            "total_reviews": total,
+            "average_rating": round(summary_doc.get("rating_sum", 0) / total, 1) if total else 0.0,
+            "recommendation_percentage": round(summary_doc.get("recommend_count", 0) / total * 100, 1) if total else 0.0,
+            "review_summary_updated_at": datetime.utcnow()
+        }
+
+    async def _update_user_review_stats(self, user_id: str, summary_doc: dict):
+        await self.database.users.update_one({"id": user_id}, {"$set": self._user_review_stats(summary_doc)})
+        self.user_cache.invalidate(user_id)
+
+    @staticmethod
+    def _review_summary_from_doc(doc: dict) -> ReviewSummary:
+        total = doc.get("total_reviews", 0)
+        rating_counts = doc.get("rating_counts", {})
+        category_sums = doc.get("category_sums", {})
+        category_counts = doc.get("category_counts", {})
+
+        recent_reviews = []
+        for review_doc in doc.get("recent_reviews", []):
+            if review_doc.get("status") != ReviewStatus.PUBLISHED:
+                continue
+            review_doc["id"] = review_doc.get("id") or str(review_doc["_id"])
+            review_doc.pop("_id", None)
+            recent_reviews.append(Review(**review_doc))
+        recent_reviews.sort(key=lambda review: review.created_at, reverse=True)
+
+        return ReviewSummary(
+            total_reviews=total,
+            average_rating=round(doc.get("rating_sum", 0) / total, 1) if total else 0.0,
+            rating_distribution={str(rating): rating_counts.get(str(rating), 0) for rating in range(5, 0, -1)},
+            category_averages={
+                category: round(category_sums.get(category, 0) / count, 1)
+                for category, count in category_counts.items() if count > 0
+            },
+            recent_reviews=recent_reviews,
+            recommendation_percentage=round(doc.get("recommend_count", 0) / total * 100, 1) if total else 0.0,
+            verified_reviews_count=total  # All reviews are verified after job completion
         )
 
+    async def rebuild_review_summaries(self, user_id: Optional[str] = None, batch_size: int = 500) -> int:
+        """Recompute review summaries from the reviews collection (drift repair).
+
+        Streams published reviews grouped by reviewee and replaces each summary
+        (and the stats copied onto the user); summaries of users who no longer
+        have published reviews are removed. Returns the number of summaries written.
+        """
+        started = datetime.utcnow()
+        match: Dict[str, Any] = {"status": ReviewStatus.PUBLISHED}
+        if user_id:
+            match["reviewee_id"] = user_id
+        cursor = self.reviews_collection.find(
+            match,
+            {"_id": 0, "id": 1, "reviewee_id": 1, "rating": 1, "would_recommend": 1,
+             "category_ratings": 1, "status": 1, "created_at": 1}
+        ).sort([("reviewee_id", 1), ("created_at", -1)])
+
+        written = 0
+        pending: List[Any] = []
+        user_updates: List[Any] = []
+        current: Optional[dict] = None
+
+        def finish(summary: dict):
+            summary["updated_at"] = summary["rebuilt_at"] = started
+            pending.append(ReplaceOne({"_id": summary["_id"]}, summary, upsert=True))
+            user_updates.append(UpdateOne({"id": summary["_id"]}, {"$set": self._user_review_stats(summary)}))
+
+        async def flush():
+            nonlocal written, pending, user_updates
+            await self.review_summaries_collection.bulk_write(pending, ordered=False)
+            await self.database.users.bulk_write(user_updates, ordered=False)
+            written += len(pending)
+            pending, user_updates = [], []
+
+        async for review in cursor:
+            if current is None or current["_id"] != review["reviewee_id"]:
+                if current is not None:
+                    finish(current)
+                current = {"_id": review["reviewee_id"], "user_id": review["reviewee_id"], "total_reviews": 0,
+                           "rating_sum": 0, "rating_counts": {}, "recommend_count": 0, "category_sums": {},
+                           "category_counts": {}, "recent_review_ids": []}
+            for field, value in self._review_summary_increments(review, 1).items():
+                target = current
+                *parents, leaf = field.split(".")
+                for parent in parents:
+                    target = target[parent]
+                target[leaf] = target.get(leaf, 0) + value
+            if len(current["recent_review_ids"]) < self.REVIEW_SUMMARY_RECENT:
+                current["recent_review_ids"].append(review["id"])
+            if len(pending) >= batch_size:
+                await flush()
+        if current is not None:
+            finish(current)
+        if pending:
+            await flush()
+
+        # Summaries upserted by review writes during the rebuild are newer than `started`
+        stale = {"rebuilt_at": {"$ne": started}, "updated_at": {"$lt": started}}
+        if user_id:
+            stale["_id"] = user_id
+        stale_ids = await self.review_summaries_collection.distinct("_id", stale)
+        if stale_ids:
+            await self.review_summaries_collection.delete_many({"_id": {"$in": stale_ids}})
+            await self.database.users.update_many(
+                {"id": {"$in": stale_ids}}, {"$set": self._user_review_stats({})}
+            )
+        # Rating fields on every rebuilt user may have changed
+        self.user_cache.invalidate(user_id)
+        logger.info(f"Rebuilt {written} review summaries")
+        return written
+
     async def get_reviews_requiring_moderation(self, limit: int = 50) -> List[Review]:
         """Get reviews that need moderation"""
         cursor = self.reviews_collection.find(
@@ -1932,6 +2542,15 @@ class Database:
         await self.notifications_collection.insert_one(notification_dict)
         return notification
 
+    async def create_notifications(self, notifications: List[Notification]) -> List[Notification]:
+        """Insert many notifications with a single insert_many"""
+        if notifications:
+            await self.notifications_collection.insert_many(
+                [{**notification.dict(), "_id": notification.id} for notification in notifications],
+                ordered=False
+            )
+        return notifications
+
     async def get_user_notification_preferences(self, user_id: str) -> NotificationPreferences:
         """Get user notification preferences, create defaults if not exist"""
         preferences = await self.notification_preferences_collection.find_one({"user_id": user_id})
@@ -1950,6 +2569,30 @@ class Database:
         del preferences["_id"]
         return NotificationPreferences(**preferences)
 
+    async def get_notification_preferences_for_users(self, user_ids: List[str]) -> Dict[str, NotificationPreferences]:
+        """Get notification preferences for many users in one query, creating defaults for any missing"""
+        unique_ids = list(dict.fromkeys(uid for uid in user_ids if uid))
+        if not unique_ids:
+            return {}
+        
+        preferences_by_user: Dict[str, NotificationPreferences] = {}
+        async for preferences in self.notification_preferences_collection.find({"user_id": {"$in": unique_ids}}):
+            preferences["id"] = str(preferences.pop("_id"))
+            preferences_by_user[preferences["user_id"]] = NotificationPreferences(**preferences)
+        
+        missing = [
+            NotificationPreferences(id=str(uuid.uuid4()), user_id=uid)
+            for uid in unique_ids if uid not in preferences_by_user
+        ]
+        if missing:
+            await self.notification_preferences_collection.insert_many(
+                [{**preferences.dict(), "_id": preferences.id} for preferences in missing],
+                ordered=False
+            )
+            preferences_by_user.update({preferences.user_id: preferences for preferences in missing})
+        
+        return preferences_by_user
+
     async def create_notification_preferences(self, preferences: NotificationPreferences) -> NotificationPreferences:
         """Create notification preferences for a user"""
         preferences_dict = preferences.dict()
@@ -1984,19 +2627,73 @@ class Database:
         
         return notifications
 
-    async def update_notification_status(self, notification_id: str, status: NotificationStatus, delivered_at: Optional[datetime] = None) -> bool:
-        """Update notification delivery status"""
+    async def update_notification_status(self, notification_id: str, status: NotificationStatus, delivered_at: Optional[datetime] = None,
+                                         sent_at: Optional[datetime] = None, extra_fields: Optional[Dict[str, Any]] = None) -> bool:
+        """Update notification delivery status and release any outbox claim"""
         update_data = {"status": status, "updated_at": datetime.utcnow()}
         if delivered_at:
             update_data["delivered_at"] = delivered_at
+        if sent_at:
+            update_data["sent_at"] = sent_at
+        if extra_fields:
+            update_data.update(extra_fields)
         
         result = await self.notifications_collection.update_one(
             {"_id": notification_id},
-            {"$set": update_data}
+            {"$set": update_data, "$unset": {"claim_token": "", "locked_until": ""}}
         )
         
         return result.modified_count > 0
 
+    # ==========================================
+    # NOTIFICATION OUTBOX
+    # ==========================================
+    # Pending notifications double as the delivery outbox: the API inserts the
+    # record once and the dispatcher worker claims, delivers and finalizes it.
+
+    async def claim_pending_notifications(self, worker_id: str, batch_size: int = 50, lease_seconds: int = 120) -> List[dict]:
+        """Atomically claim a batch of due notifications for delivery by one worker"""
+        now = datetime.utcnow()
+        due_filter = {
+            "status": NotificationStatus.PENDING.value,
+            "next_attempt_at": {"$lte": now},
+            "$or": [{"locked_until": {"$exists": False}}, {"locked_until": {"$lt": now}}]
+        }
+        candidates = await self.notifications_collection.find(
+            due_filter, {"_id": 1}
+        ).sort("next_attempt_at", 1).limit(batch_size).to_list(length=batch_size)
+        if not candidates:
+            return []
+
+        # Each document is claimed at most once: the filter is re-checked inside update_many
+        claim_token = f"{worker_id}:{uuid.uuid4()}"
+        await self.notifications_collection.update_many(
+            {**due_filter, "_id": {"$in": [doc["_id"] for doc in candidates]}},
+            {"$set": {
+                "claim_token": claim_token,
+                "locked_until": now + timedelta(seconds=lease_seconds)
+            }}
+        )
+        return await self.notifications_collection.find({"claim_token": claim_token}).to_list(length=batch_size)
+
+    async def schedule_notification_retry(self, notification_id: str, attempts: int, next_attempt_at: datetime,
+                                          error: str, delivered_channels: List[str]) -> bool:
+        """Release a claimed notification back to the outbox for a later attempt"""
+        result = await self.notifications_collection.update_one(
+            {"_id": notification_id},
+            {
+                "$set": {
+                    "attempts": attempts,
+                    "next_attempt_at": next_attempt_at,
+                    "last_error": error,
+                    "delivered_channels": delivered_channels,
+                    "updated_at": datetime.utcnow()
+                },
+                "$unset": {"claim_token": "", "locked_until": ""}
+            }
+        )
+        return result.modified_count > 0
+
     async def mark_notification_as_read(self, notification_id: str, user_id: str) -> bool:
         """Mark a specific notification as read for a user"""
         result = await self.notifications_collection.update_one(
@@ -2285,159 +2982,19 @@ class Database:
     async def get_jobs_with_access_fees(self, skip: int = 0, limit: int = 20) -> List[dict]:
         """Get all jobs with access fees for admin management"""
         cursor = self.database.jobs.find({}).sort("created_at", -1).skip(skip).limit(limit)
+        jobs = await cursor.to_list(length=limit)
         
-        jobs = []
-        async for job in cursor:
+        # Batch-load homeowners (by id, or by email/name for legacy jobs) and their job counts
+        context = await self._load_admin_homeowner_context(jobs, legacy_lookup=True)
+        
+        for job in jobs:
             job["_id"] = str(job["_id"])
-            
-            # Get homeowner details using multiple approaches
-            homeowner_id = None
-            homeowner_info = None
-            
-            # First, check if homeowner_id exists at root level
-            if "homeowner_id" in job and job["homeowner_id"]:
-                homeowner_id = job["homeowner_id"]
-                homeowner = await self.database.users.find_one({"id": homeowner_id})
-                if homeowner:
-                    homeowner_info = {
-                        "id": homeowner["id"],
-                        "name": homeowner.get("name", "Unknown"),
-                        "email": homeowner.get("email", ""),
-                        "phone": homeowner.get("phone", "")
-                    }
-                    homeowner_info["verification_status"] = homeowner.get("verification_status", "pending")
-                    homeowner_info["join_date"] = homeowner.get("created_at")
-                    # Count total jobs for this homeowner
-                    homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                        "$or": [
-                            {"homeowner_id": homeowner_id},
-                            {"homeowner.id": homeowner_id}
-                        ]
-                    })
-            
-            # If no homeowner_id at root, check if homeowner object exists
-            elif "homeowner" in job and isinstance(job["homeowner"], dict):
-                homeowner_obj = job["homeowner"]
-                homeowner_id = homeowner_obj.get("id")
-                
-                if homeowner_id and homeowner_id != "unknown":
-                    # Try to get updated user info from users collection
-                    homeowner = await self.database.users.find_one({"id": homeowner_id})
-                    if homeowner:
-                        homeowner_info = {
-                            "id": homeowner["id"],
-                            "name": homeowner.get("name", homeowner_obj.get("name", "Unknown")),
-                            "email": homeowner.get("email", homeowner_obj.get("email", "")),
-                            "phone": homeowner.get("phone", homeowner_obj.get("phone", ""))
-                        }
-                        homeowner_info["verification_status"] = homeowner.get("verification_status", "pending")
-                        homeowner_info["join_date"] = homeowner.get("created_at")
-                        # Count total jobs for this homeowner
-                        homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                            "$or": [
-                                {"homeowner_id": homeowner_id},
-                                {"homeowner.id": homeowner_id}
-                            ]
-                        })
-                    else:
-                        # Use the embedded homeowner data
-                        homeowner_info = {
-                            "id": homeowner_obj.get("id", "unknown"),
-                            "name": homeowner_obj.get("name", "Unknown"),
-                            "email": homeowner_obj.get("email", ""),
-                            "phone": homeowner_obj.get("phone", "")
-                        }
-                        homeowner_info["verification_status"] = "pending"
-                        homeowner_info["join_date"] = job.get("created_at")
-                        # Count total jobs for this homeowner
-                        homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                            "$or": [
-                                {"homeowner_id": homeowner_id},
-                                {"homeowner.id": homeowner_id}
-                            ]
-                        })
-                else:
-                    # NEW: Handle case where homeowner object exists but has no ID
-                    # Use the embedded homeowner data directly (name and email available)
-                    homeowner_name = homeowner_obj.get("name", "Unknown")
-                    homeowner_email = homeowner_obj.get("email", "")
-                    
-                    if homeowner_name != "Unknown" or homeowner_email:
-                        # Try to find user by email if available
-                        if homeowner_email:
-                            homeowner = await self.database.users.find_one({"email": homeowner_email})
-                            if homeowner:
-                                homeowner_info = {
-                                    "id": homeowner["id"],
-                                    "name": homeowner.get("name", homeowner_name),
-                                    "email": homeowner.get("email", homeowner_email),
-                                    "phone": homeowner.get("phone", homeowner_obj.get("phone", ""))
-                                }
-                                homeowner_info["verification_status"] = homeowner.get("verification_status", "pending")
-                                homeowner_info["join_date"] = homeowner.get("created_at")
-                                # Count total jobs for this homeowner using email
-                                homeowner_info["total_jobs"] = await self.database.jobs.count_documents({
-                                    "homeowner.email": homeowner_email
-                                })
-                            else:
-                                # Use embedded data even without user ID
-                                homeowner_info = {
-                                    "id": "legacy",
-                                    "name": homeowner_name,
-                                    "email": homeowner_email,
-                                    "phone": homeowner_obj.get("phone", ""),
-                                    "verification_status": "legacy",
-                                    "join_date": job.get("created_at"),
-                                    "total_jobs": await self.database.jobs.count_documents({
-                                        "homeowner.email": homeowner_email
-                                    }) if homeowner_email else 1
-                                }
-                        else:
-                            # Only name available, no email for lookup
-                            homeowner_info = {
-                                "id": "legacy",
-                                "name": homeowner_name,
-                                "email": "",
-                                "phone": homeowner_obj.get("phone", ""),
-                                "verification_status": "legacy",
-                                "join_date": job.get("created_at"),
-                                "total_jobs": await self.database.jobs.count_documents({
-                                    "homeowner.name": homeowner_name
-                                }) if homeowner_name != "Unknown" else 1
-                            }
-                    else:
-                        # Fallback for completely empty homeowner object
-                        homeowner_info = {
-                            "id": "unknown",
-                            "name": "Unknown",
-                            "email": "",
-                            "phone": "",
-                            "verification_status": "pending",
-                            "join_date": job.get("created_at"),
-                            "total_jobs": 1
-                        }
-            
-            # If still no homeowner info found, use legacy fields or defaults
-            if not homeowner_info:
-                homeowner_info = {
-                    "id": "unknown",
-                    "name": job.get("homeowner_name", "Unknown"),
-                    "email": job.get("homeowner_email", ""),
-                    "phone": job.get("homeowner_phone", ""),
-                    "verification_status": "pending",
-                    "join_date": job.get("created_at"),
-                    "total_jobs": 0
-                }
-            
-            # Set the homeowner info in the job
-            job["homeowner"] = homeowner_info
+            job["homeowner"] = self._build_admin_homeowner_info(job, context, legacy_lookup=True)
             
             # Set default access fee if not present
             if "access_fee_naira" not in job:
                 job["access_fee_naira"] = 1000  # Default ₦1000
                 job["access_fee_coins"] = 10    # Default 10 coins
-            
-            jobs.append(job)
         
         return jobs
 
@@ -2463,36 +3020,172 @@ class Database:
         
         return c * r
 
+    @staticmethod
+    def _build_geo_point(latitude: Optional[float], longitude: Optional[float]) -> Optional[dict]:
+        """Build a GeoJSON point (longitude first) or None when coordinates are missing"""
+        if latitude is None or longitude is None:
+            return None
+        return {"type": "Point", "coordinates": [float(longitude), float(latitude)]}
+
+    async def backfill_job_geo_locations(self) -> int:
+        """Populate geo_location for jobs that only carry latitude/longitude fields"""
+        result = await self.database.jobs.update_many(
+            {
+                "geo_location": {"$exists": False},
+                "latitude": {"$type": "number"},
+                "longitude": {"$type": "number"}
+            },
+            [{"$set": {
+                "geo_location": {
+                    "type": "Point",
+                    "coordinates": ["$longitude", "$latitude"]
+                }
+            }}]
+        )
+        if result.modified_count:
+            logger.info(f"Backfilled geo_location on {result.modified_count} jobs")
+        return result.modified_count
+
+    async def _geo_near_jobs(self, latitude: float, longitude: float, max_distance_km: float,
+                             query: dict, skip: int = 0, limit: int = 50,
+                             distance_precision: int = 1) -> List[dict]:
+        """Run a $geoNear query so distance filtering, sorting and paging happen in MongoDB"""
+        pipeline = [
+            {"$geoNear": {
+                "near": self._build_geo_point(latitude, longitude),
+                "key": "geo_location",
+                "distanceField": "distance_meters",
+                "maxDistance": max_distance_km * 1000,
+                "query": query,
+                "spherical": True
+            }},
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$addFields": {
+                "distance_km": {"$round": [{"$divide": ["$distance_meters", 1000]}, distance_precision]}
+            }},
+            {"$project": {"distance_meters": 0, "geo_location": 0}}
+        ]
+
+        jobs = await self.database.jobs.aggregate(pipeline).to_list(length=limit)
+        for job in jobs:
+            job["_id"] = str(job["_id"])
+        return jobs
+
     async def get_jobs_near_location(self, latitude: float, longitude: float, max_distance_km: int = 25, skip: int = 0, limit: int = 50) -> List[dict]:
-        """Get jobs within specified distance from a location"""
-        # Get all active jobs with location data
-        cursor = self.database.jobs.find({
+        """Get jobs within specified distance from a location, closest first"""
+        return await self._geo_near_jobs(
+            latitude, longitude, max_distance_km,
+            query={"status": "active"},
+            skip=skip,
+            limit=limit
+        )
+
+    # ==========================================
+    # JOB SEARCH METHODS
+    # ==========================================
+
+    @staticmethod
+    def _encode_search_cursor(values: dict) -> str:
+        """Encode the sort key of the last returned row as an opaque cursor token"""
+        raw = json.dumps(values, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @staticmethod
+    def _decode_search_cursor(token: str) -> dict:
+        """Decode a cursor token produced by _encode_search_cursor"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(token.encode("ascii")).decode("utf-8"))
+            if "created_at" in values:
+                values["created_at"] = datetime.fromisoformat(values["created_at"])
+            return values
+        except Exception:
+            raise ValueError("Invalid search cursor")
+
+    async def search_jobs_with_location(self, search_query: Optional[str] = None, category: Optional[str] = None,
+                                        user_latitude: Optional[float] = None, user_longitude: Optional[float] = None,
+                                        max_distance_km: Optional[int] = None, skip: int = 0, limit: int = 50,
+                                        cursor: Optional[str] = None) -> dict:
+        """Search active jobs using the weighted text index with optional category and radius filters.
+
+        Results are ranked by text relevance when a query is given, otherwise newest first.
+        Pagination is keyset-based via ``cursor``; ``skip`` is only honoured for the first page.
+        The page query sorts and limits after the keyset filter; total is a separate count.
+        """
+        match_query = {
             "status": "active",
-            "latitude": {"$exists": True, "$ne": None},
-            "longitude": {"$exists": True, "$ne": None}
-        }).skip(skip).limit(limit * 2)  # Get more to filter by distance
-        
-        jobs_with_distance = []
-        
-        async for job in cursor:
+            "expires_at": {"$gt": datetime.utcnow()}
+        }
+        if search_query and search_query.strip():
+            match_query["$text"] = {"$search": search_query.strip()}
+        if category:
+            match_query["category_key"] = normalize_category_key(category)
+
+        has_location = user_latitude is not None and user_longitude is not None
+        if has_location and max_distance_km:
+            # $geoNear cannot be combined with $text, so the radius is applied as a $geoWithin filter
+            match_query["geo_location"] = {
+                "$geoWithin": {
+                    "$centerSphere": [[user_longitude, user_latitude], max_distance_km / 6378.1]
+                }
+            }
+
+        ranked = "$text" in match_query
+        if ranked:
+            sort_spec = {"score": -1, "id": -1}
+        else:
+            sort_spec = {"created_at": -1, "id": -1}
+
+        # Keyset condition continuing after the last row of the previous page. It runs
+        # ahead of the sort so each page reads only the rows it returns (plus one)
+        pipeline = [{"$match": match_query}]
+        if ranked:
+            pipeline.append({"$addFields": {"score": {"$meta": "textScore"}}})
+        if cursor:
+            last = self._decode_search_cursor(cursor)
+            lead_field = "score" if ranked else "created_at"
+            if lead_field not in last or "id" not in last:
+                raise ValueError("Invalid search cursor")
+            pipeline.append({"$match": {"$or": [
+                {lead_field: {"$lt": last[lead_field]}},
+                {lead_field: last[lead_field], "id": {"$lt": last["id"]}}
+            ]}})
+        pipeline.append({"$sort": sort_spec})
+        if skip and not cursor:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit + 1})
+
+        # Total covers the whole result set, independent of the page cursor
+        jobs, total = await asyncio.gather(
+            self.database.jobs.aggregate(pipeline).to_list(length=limit + 1),
+            self.database.jobs.count_documents(match_query)
+        )
+
+        has_more = len(jobs) > limit
+        jobs = jobs[:limit]
+
+        next_cursor = None
+        if has_more and jobs:
+            last_job = jobs[-1]
+            if ranked:
+                next_cursor = self._encode_search_cursor({"score": last_job["score"], "id": last_job["id"]})
+            else:
+                next_cursor = self._encode_search_cursor({"created_at": last_job["created_at"], "id": last_job["id"]})
+
+        for job in jobs:
             job["_id"] = str(job["_id"])
-            
-            # Calculate distance
-            distance = self.calculate_distance(
-                latitude, longitude,
-                job["latitude"], job["longitude"]
-            )
-            
-            # Only include jobs within max distance
-            if distance <= max_distance_km:
-                job["distance_km"] = round(distance, 1)
-                jobs_with_distance.append(job)
-        
-        # Sort by distance (closest first)
-        jobs_with_distance.sort(key=lambda x: x["distance_km"])
-        
-        # Limit to requested number
-        return jobs_with_distance[:limit]
+            job.pop("geo_location", None)
+            if has_location and job.get("latitude") is not None and job.get("longitude") is not None:
+                job["distance_km"] = round(self.calculate_distance(
+                    user_latitude, user_longitude, job["latitude"], job["longitude"]
+                ), 1)
+
+        return {
+            "jobs": jobs,
+            "total": total,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        }
 
     async def update_user_location(self, user_id: str, latitude: float, longitude: float, travel_distance_km: int = None) -> bool:
         """Update user's location and travel distance"""
@@ -2509,6 +3202,7 @@ class Database:
             {"id": user_id},
             {"$set": update_data}
         )
+        self.user_cache.invalidate(user_id)
         
         return result.modified_count > 0
 
@@ -2520,6 +3214,7 @@ class Database:
                 "$set": {
                     "latitude": latitude,
                     "longitude": longitude,
+                    "geo_location": self._build_geo_point(latitude, longitude),
                     "updated_at": datetime.utcnow()
                 }
             }
@@ -2546,9 +3241,8 @@ class Database:
             # 1. SKILLS FILTERING - Only show jobs matching tradesperson's trade categories
             tradesperson_categories = tradesperson.get("trade_categories", [])
             if tradesperson_categories:
-                # Case-insensitive matching for trade categories
-                category_regex_patterns = [{"category": {"$regex": f"^{category}$", "$options": "i"}} for category in tradesperson_categories]
-                job_filter["$or"] = category_regex_patterns
+                # Indexed match on canonical category keys
+                job_filter["category_key"] = {"$in": normalize_category_keys(tradesperson_categories)}
                 print(f"Skills filter applied: {tradesperson_categories}")
             
             # 2. LOCATION FILTERING - Show jobs within tradesperson's travel distance
@@ -2594,41 +3288,22 @@ class Database:
             # Build skills filter
             skills_filter = {}
             if skill_categories:
-                category_regex_patterns = [{"category": {"$regex": f"^{category}$", "$options": "i"}} for category in skill_categories]
-                skills_filter["$or"] = category_regex_patterns
+                skills_filter["category_key"] = {"$in": normalize_category_keys(skill_categories)}
             
-            # Base filter for active jobs with location data
-            base_filter = {
-                "status": "active",
-                "latitude": {"$exists": True, "$ne": None},
-                "longitude": {"$exists": True, "$ne": None}
-            }
+            # Only active jobs; location filtering is done by $geoNear
+            base_filter = {"status": "active"}
             
             # Combine skills and base filters
             combined_filter = {"$and": [base_filter, skills_filter]} if skills_filter else base_filter
             
-            # Get jobs matching skills filter first
-            cursor = self.database.jobs.find(combined_filter).skip(skip).limit(limit * 2)  # Get extra to account for distance filtering
-            jobs = await cursor.to_list(length=None)
-            
-            # Calculate distances and filter by location
-            jobs_within_distance = []
-            for job in jobs:
-                job_lat = job.get("latitude")
-                job_lng = job.get("longitude")
-                
-                if job_lat is not None and job_lng is not None:
-                    distance = self.calculate_distance(latitude, longitude, job_lat, job_lng)
-                    if distance <= max_distance_km:
-                        job["_id"] = str(job["_id"])
-                        job["distance_km"] = round(distance, 2)
-                        jobs_within_distance.append(job)
-            
-            # Sort by distance (closest first) and limit results
-            jobs_within_distance.sort(key=lambda x: x.get("distance_km", float('inf')))
-            limited_jobs = jobs_within_distance[:limit]
-            
-            return limited_jobs
+            # Distance filter, closest-first sort and pagination all run in the database
+            return await self._geo_near_jobs(
+                latitude, longitude, max_distance_km,
+                query=combined_filter,
+                skip=skip,
+                limit=limit,
+                distance_precision=2
+            )
             
         except Exception as e:
             print(f"Error getting jobs near location with skills: {str(e)}")
@@ -2712,6 +3387,7 @@ class Database:
                     {"id": user_id},
                     {"$set": {"referral_code": code}}
                 )
+                self.user_cache.invalidate(user_id)
                 
                 return code
         
@@ -2731,6 +3407,7 @@ class Database:
             {"id": user_id},
             {"$set": {"referral_code": fallback_code}}
         )
+        self.user_cache.invalidate(user_id)
         
         return fallback_code
 
@@ -2782,6 +3459,7 @@ class Database:
             {"id": referred_user_id},
             {"$set": {"referred_by": referrer_id}}
         )
+        self.user_cache.invalidate(referred_user_id)
         
         return True
 
@@ -2808,6 +3486,7 @@ class Database:
             {"id": user_id},
             {"$set": {"verification_submitted": True}}
         )
+        self.user_cache.invalidate(user_id)
         
         return verification_data["id"]
 
@@ -2844,6 +3523,7 @@ class Database:
                 {"id": verification["user_id"]},
                 {"$set": {"is_verified": True}}
             )
+            self.user_cache.invalidate(verification["user_id"])
             
             # Process referral rewards
             await self._process_referral_rewards(verification["user_id"])
@@ -2917,6 +3597,7 @@ class Database:
                 }
             }
         )
+        self.user_cache.invalidate(referrer_id)
 
     async def get_user_referral_stats(self, user_id: str) -> dict:
         """Get referral statistics for user"""
@@ -3048,41 +3729,64 @@ class Database:
             # Default to active users if no status specified
             query["status"] = {"$ne": "deleted"}
             
-        if search:
-            # Search in name, email, phone, or skills
+        if search and search.strip():
+            # Indexed prefix search: anchored regexes on normalized email, phone and normalized name
+            term = search.strip()
+            escaped = re.escape(term)
+            normalized = re.escape(self._normalize_name(term))
             query["$or"] = [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"phone": {"$regex": search, "$options": "i"}},
-                {"skills": {"$regex": search, "$options": "i"}}
+                {"email_normalized": {"$regex": f"^{normalized}"}},
+                {"phone": {"$regex": f"^{escaped}"}},
+                {"name_normalized": {"$regex": f"^{normalized}"}}
             ]
         
         # Get users with pagination
-        users_cursor = self.users_collection.find(query).skip(skip).limit(limit).sort("created_at", -1)
+        users_cursor = self.users_collection.find(query, {"password_hash": 0}).sort("created_at", -1).skip(skip).limit(limit)
         users = await users_cursor.to_list(length=limit)
         
-        # Process users to add activity info and remove sensitive data
+        # Batch enrichment: one wallets query and one grouped count per role for the whole page
+        homeowner_ids = [user["id"] for user in users if user.get("role") == "homeowner" and user.get("id")]
+        tradesperson_ids = [user["id"] for user in users if user.get("role") == "tradesperson" and user.get("id")]
+        
+        wallet_balances = {}
+        jobs_posted = {}
+        interests_shown = {}
+        if tradesperson_ids:
+            async for wallet in self.wallets_collection.find(
+                {"user_id": {"$in": tradesperson_ids}},
+                {"_id": 0, "user_id": 1, "balance_coins": 1}
+            ):
+                wallet_balances[wallet["user_id"]] = wallet.get("balance_coins", 0)
+            
+            interests_pipeline = [
+                {"$match": {"tradesperson_id": {"$in": tradesperson_ids}}},
+                {"$group": {"_id": "$tradesperson_id", "count": {"$sum": 1}}}
+            ]
+            async for row in self.database.interests.aggregate(interests_pipeline):
+                interests_shown[row["_id"]] = row["count"]
+        if homeowner_ids:
+            jobs_pipeline = [
+                {"$match": {"homeowner.id": {"$in": homeowner_ids}}},
+                {"$group": {"_id": "$homeowner.id", "count": {"$sum": 1}}}
+            ]
+            async for row in self.database.jobs.aggregate(jobs_pipeline):
+                jobs_posted[row["_id"]] = row["count"]
+        
+        # Process users to add activity info
         processed_users = []
         for user in users:
             user["_id"] = str(user["_id"])
-            user.pop("password_hash", None)  # Remove password hash
             
             # Add activity indicators
             user["last_login"] = user.get("last_login", user.get("created_at"))
             user["is_verified"] = user.get("is_verified", False)
             user["wallet_balance"] = 0
             
-            # Get wallet balance if tradesperson
-            if user.get("role") == "tradesperson":
-                wallet = await self.wallets_collection.find_one({"user_id": user["id"]})
-                if wallet:
-                    user["wallet_balance"] = wallet.get("balance_coins", 0)
-            
-            # Count jobs/interests based on role
             if user.get("role") == "homeowner":
-                user["jobs_posted"] = await self.database.jobs.count_documents({"homeowner.id": user["id"]})
+                user["jobs_posted"] = jobs_posted.get(user.get("id"), 0)
             elif user.get("role") == "tradesperson":
-                user["interests_shown"] = await self.database.interests.count_documents({"tradesperson_id": user["id"]})
+                user["wallet_balance"] = wallet_balances.get(user.get("id"), 0)
+                user["interests_shown"] = interests_shown.get(user.get("id"), 0)
             
             processed_users.append(user)
         
@@ -3180,6 +3884,8 @@ class Database:
             {"id": user_id},
             {"$set": update_data}
         )
+        # Suspensions take effect immediately on this worker; others within USER_CACHE_TTL_SEC
+        self.user_cache.invalidate(user_id)
         
         return result.modified_count > 0
     
@@ -3387,9 +4093,15 @@ class Database:
             
             # Finally delete the user account
             result = await self.users_collection.delete_one({"id": user_id})
+            self.user_cache.invalidate(user_id)
             
             if result.deleted_count > 0:
                 logger.info(f"Successfully deleted user account: {user.get('email', 'Unknown')} (ID: {user_id})")
+                # Jobs and reviews were removed in bulk above, so recount rather than guess deltas
+                try:
+                    await self.rebuild_platform_counters()
+                except Exception as e:
+                    logger.warning(f"Failed to rebuild platform counters after user deletion: {e}")
                 return True
             else:
                 logger.error(f"Failed to delete user account: {user_id}")
@@ -3767,6 +4479,9 @@ class Database:
             conversation_data["updated_at"] = datetime.now()
             conversation_data["unread_count_homeowner"] = 0
             conversation_data["unread_count_tradesperson"] = 0
+            for user_type in ("homeowner", "tradesperson"):
+                conversation_data[f"last_read_at_{user_type}"] = None
+                conversation_data[f"last_read_message_id_{user_type}"] = None
             
             result = await self.database.conversations.insert_one(conversation_data)
             conversation_data['_id'] = str(result.inserted_id)
@@ -3806,6 +4521,57 @@ class Database:
             print(f"Error getting user conversations: {e}")
             return []
     
+    async def send_conversation_message(self, conversation_id: str, sender_id: str, sender_type: str,
+                                        message_data: dict) -> Optional[dict]:
+        """Authorize and record a chat message in two round trips.
+
+        One find_one_and_update both checks that the sender is the conversation's
+        participant for their role and applies the last-message/unread update; the
+        message is inserted afterwards. Returns None when the sender is not a
+        participant (or the conversation does not exist), otherwise
+        ``{"message": ..., "conversation": ...}``.
+        """
+        # Routes pass User.role (a UserRole); field names need the plain value
+        sender_type = getattr(sender_type, "value", sender_type)
+        if sender_type not in ("homeowner", "tradesperson"):
+            return None
+        recipient_type = "homeowner" if sender_type == "tradesperson" else "tradesperson"
+        now = datetime.now()
+        message = {
+            **message_data,
+            "conversation_id": conversation_id,
+            "sender_id": sender_id,
+            "sender_type": sender_type,
+            "status": "sent",
+            "created_at": now,
+            "updated_at": now
+        }
+        conversation = await self.database.conversations.find_one_and_update(
+            {"id": conversation_id, f"{sender_type}_id": sender_id},
+            {
+                "$set": {
+                    "last_message": message["content"],
+                    "last_message_id": message["id"],
+                    "last_message_sender_type": sender_type,
+                    "last_message_at": now,
+                    "updated_at": now
+                },
+                "$inc": {f"unread_count_{recipient_type}": 1}
+            },
+            projection={
+                "_id": 0, "id": 1, "job_title": 1, "homeowner_id": 1, "tradesperson_id": 1,
+                f"unread_count_{recipient_type}": 1
+            },
+            return_document=ReturnDocument.AFTER
+        )
+        if conversation is None:
+            return None
+
+        result = await self.database.messages.insert_one(message)
+        message['_id'] = str(result.inserted_id)
+        self._publish_new_message(conversation, message)
+        return {"message": message, "conversation": conversation}
+
     async def create_message(self, message_data: dict) -> dict:
         """Create a new message"""
         try:
@@ -3817,11 +4583,14 @@ class Database:
             message_data['_id'] = str(result.inserted_id)
             
             # Update conversation last message and unread counts
-            await self._update_conversation_last_message(
+            conversation = await self._update_conversation_last_message(
                 message_data["conversation_id"], 
+                message_data["id"],
                 message_data["content"],
                 message_data["sender_type"]
             )
+            if conversation:
+                self._publish_new_message(conversation, message_data)
             
             return message_data
             
@@ -3846,27 +4615,95 @@ class Database:
             print(f"Error getting conversation messages: {e}")
             return []
     
+    @staticmethod
+    def apply_read_watermarks(conversation: dict, messages: List[dict]) -> List[dict]:
+        """Derive each message's read status from the recipient's read watermark"""
+        for msg in messages:
+            recipient_type = "homeowner" if msg.get("sender_type") == "tradesperson" else "tradesperson"
+            watermark = conversation.get(f"last_read_at_{recipient_type}")
+            if watermark is not None and msg.get("created_at") is not None and msg["created_at"] <= watermark:
+                msg["status"] = "read"
+        return messages
+
+    async def get_conversation_messages_page(self, conversation_id: str, limit: int = 50,
+                                             before: Optional[str] = None, after: Optional[str] = None) -> dict:
+        """Newest-first keyset page of a conversation's messages.
+
+        ``before`` continues towards older messages and ``after`` returns messages
+        newer than a cursor; with neither the newest page is returned. Each page is
+        one index range scan, so its cost does not depend on history length.
+        """
+        if before and after:
+            raise ValueError("Use either before or after, not both")
+        query: Dict[str, Any] = {"conversation_id": conversation_id}
+        token = before or after
+        if token:
+            try:
+                last = self._decode_search_cursor(token)
+            except ValueError:
+                raise ValueError("Invalid message cursor")
+            if "created_at" not in last or "id" not in last:
+                raise ValueError("Invalid message cursor")
+            op = "$gt" if after else "$lt"
+            query["$or"] = [
+                {"created_at": {op: last["created_at"]}},
+                {"created_at": last["created_at"], "id": {op: last["id"]}}
+            ]
+
+        direction = 1 if after else -1
+        cursor = self.database.messages.find(query).sort(
+            [("created_at", direction), ("id", direction)]
+        ).limit(limit + 1)
+        messages = await cursor.to_list(length=limit + 1)
+
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        if after:
+            messages.reverse()
+        for msg in messages:
+            msg['_id'] = str(msg['_id'])
+
+        def cursor_for(msg: dict) -> str:
+            return self._encode_search_cursor({"created_at": msg["created_at"], "id": msg["id"]})
+
+        return {
+            "messages": messages,
+            # has_more refers to the paging direction: older for before/newest, newer for after
+            "has_more": has_more,
+            "next_cursor": cursor_for(messages[-1]) if messages and (has_more or after) else None,
+            "prev_cursor": cursor_for(messages[0]) if messages else None
+        }
+
     async def mark_messages_as_read(self, conversation_id: str, user_type: str) -> bool:
-        """Mark all messages in a conversation as read for a user"""
+        """Advance the user's read watermark to the conversation's last message.
+
+        A single conversation update; nothing is written when the user has
+        already read everything, so repeated fetches stay read-only.
+        """
         try:
-            # Update message status to read for messages not sent by this user
-            other_type = "homeowner" if user_type == "tradesperson" else "tradesperson"
-            
-            await self.database.messages.update_many(
+            # Routes pass User.role (a UserRole); field names need the plain value
+            user_type = getattr(user_type, "value", user_type)
+            unread_field = f"unread_count_{user_type}"
+            read_at_field = f"last_read_at_{user_type}"
+            previous = await self.database.conversations.find_one_and_update(
                 {
-                    "conversation_id": conversation_id,
-                    "sender_type": other_type,
-                    "status": {"$ne": "read"}
+                    "id": conversation_id,
+                    "$expr": {"$or": [
+                        {"$gt": [{"$ifNull": [f"${unread_field}", 0]}, 0]},
+                        {"$lt": [{"$ifNull": [f"${read_at_field}", datetime(1970, 1, 1)]}, "$last_message_at"]}
+                    ]}
                 },
-                {"$set": {"status": "read", "updated_at": datetime.now()}}
-            )
-            
-            # Reset unread count for this user type
-            unread_field = f"unread_count_{user_type}"
-            await self.database.conversations.update_one(
-                {"id": conversation_id},
-                {"$set": {unread_field: 0}}
+                [{"$set": {
+                    read_at_field: {"$ifNull": ["$last_message_at", datetime.now()]},
+                    f"last_read_message_id_{user_type}": {"$ifNull": ["$last_message_id", None]},
+                    unread_field: 0
+                }}],
+                projection={"_id": 0, "homeowner_id": 1, "tradesperson_id": 1, unread_field: 1},
+                return_document=ReturnDocument.BEFORE
             )
+            # Only an actual transition is pushed, so repeated fetches publish nothing
+            if previous and previous.get(unread_field):
+                self._publish_read_receipt(previous, conversation_id, user_type)
             
             return True
         except Exception as e:
@@ -3889,25 +4726,64 @@ class Database:
             print(f"Error getting conversation by job and users: {e}")
             return None
     
-    async def _update_conversation_last_message(self, conversation_id: str, message_content: str, sender_type: str):
+    async def _update_conversation_last_message(self, conversation_id: str, message_id: str, message_content: str, sender_type: str):
         """Update conversation with last message info and increment unread count"""
         try:
             # Increment unread count for the recipient
             recipient_unread_field = "unread_count_homeowner" if sender_type == "tradesperson" else "unread_count_tradesperson"
             
-            await self.database.conversations.update_one(
+            return await self.database.conversations.find_one_and_update(
                 {"id": conversation_id},
                 {
                     "$set": {
                         "last_message": message_content,
+                        "last_message_id": message_id,
+                        "last_message_sender_type": sender_type,
                         "last_message_at": datetime.now(),
                         "updated_at": datetime.now()
                     },
                     "$inc": {recipient_unread_field: 1}
-                }
+                },
+                projection={"_id": 0, "homeowner_id": 1, "tradesperson_id": 1, recipient_unread_field: 1},
+                return_document=ReturnDocument.AFTER
             )
         except Exception as e:
             print(f"Error updating conversation last message: {e}")
+            return None
+
+    @staticmethod
+    def _publish_new_message(conversation: dict, message: dict):
+        """Push a new message to both participants and the recipient's new unread count"""
+        recipient_type = "homeowner" if message["sender_type"] == "tradesperson" else "tradesperson"
+        conversation_id = message["conversation_id"]
+        payload = {k: v for k, v in message.items() if k != "_id"}
+        realtime_bus.publish(
+            "message.created",
+            [conversation.get("homeowner_id"), conversation.get("tradesperson_id")],
+            {"conversation_id": conversation_id, "message": payload}
+        )
+        realtime_bus.publish(
+            "unread.updated",
+            [conversation.get(f"{recipient_type}_id")],
+            {"conversation_id": conversation_id, "unread_count": conversation.get(f"unread_count_{recipient_type}", 0)}
+        )
+
+    @staticmethod
+    def _publish_read_receipt(conversation: dict, conversation_id: str, reader_type: str):
+        """Tell the other participant their messages were read and sync the reader's other sessions"""
+        reader_type = getattr(reader_type, "value", reader_type)
+        other_type = "homeowner" if reader_type == "tradesperson" else "tradesperson"
+        reader_id = conversation.get(f"{reader_type}_id")
+        realtime_bus.publish(
+            "messages.read",
+            [conversation.get(f"{other_type}_id")],
+            {"conversation_id": conversation_id, "reader_id": reader_id, "read_at": datetime.now()}
+        )
+        realtime_bus.publish(
+            "unread.updated",
+            [reader_id],
+            {"conversation_id": conversation_id, "unread_count": 0}
+        )
 
     # Skills Test Questions Management
     async def get_all_skills_questions(self):
@@ -4748,16 +5624,20 @@ class Database:
             return False
     
     async def resend_notification(self, notification_id: str) -> bool:
-        """Queue notification for resending"""
+        """Queue notification for resending via the outbox dispatcher"""
         try:
-            from bson import ObjectId
             result = await self.notifications_collection.update_one(
-                {"_id": ObjectId(notification_id), "status": {"$in": ["failed", "cancelled"]}},
-                {"$set": {
-                    "status": "pending",
-                    "updated_at": datetime.utcnow(),
-                    "resend_count": {"$inc": 1}
-                }}
+                {"_id": notification_id, "status": {"$in": ["failed", "cancelled"]}},
+                {
+                    "$set": {
+                        "status": "pending",
+                        "attempts": 0,
+                        "delivered_channels": [],
+                        "next_attempt_at": datetime.utcnow(),
+                        "updated_at": datetime.utcnow()
+                    },
+                    "$inc": {"resend_count": 1}
+                }
             )
             
             return result.modified_count > 0
@@ -5605,26 +6485,29 @@ class Database:
         query = filters or {}
         return await self.database.media_files.count_documents(query)
 
-    async def save_uploaded_file(self, file, folder: str = "general") -> str:
-        """Save uploaded file and return URL (placeholder implementation)"""
-        # This is a placeholder implementation
-        # In a real system, you would save to cloud storage (S3, etc.)
-        import os
-        import uuid
+    async def save_uploaded_file(self, file, folder: str = "general", max_bytes: Optional[int] = None) -> str:
+        """Stream an uploaded file to local storage and return its URL"""
+        try:
+            from .utils.uploads import ingest_upload, media_max_upload_bytes
+        except ImportError:
+            from utils.uploads import ingest_upload, media_max_upload_bytes
+        
+        if max_bytes is None:
+            max_bytes = media_max_upload_bytes()
         
-        # Create uploads directory if it doesn't exist
         upload_dir = f"/app/uploads/{folder}"
-        os.makedirs(upload_dir, exist_ok=True)
         
         # Generate unique filename
         file_extension = file.filename.split('.')[-1]
         unique_filename = f"{uuid.uuid4()}.{file_extension}"
-        file_path = os.path.join(upload_dir, unique_filename)
         
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        # Stream to a temp file (size-capped), then atomically move into place
+        ingested = await ingest_upload(file, upload_dir, max_bytes)
+        try:
+            await ingested.move_to(os.path.join(upload_dir, unique_filename))
+        except Exception:
+            await ingested.discard()
+            raise
         
         # Return URL (in production, this would be a CDN URL)
         return f"/uploads/{folder}/{unique_filename}"
@@ -0,0 +1,48 @@
+"""
+Data migrations.
+
+Backfills fields derived from older documents (normalized names and emails,
+category keys, job geo points, conversation read watermarks) and builds
+platform_counters if no full rebuild has produced it yet. The server only
+creates indexes at startup;
+run this once per deploy instead (the docker-compose ``migrate`` service does).
+Every step skips documents that are already migrated, so re-running is cheap:
+
+    python -m backend.migrate
+"""
+
+import asyncio
+import logging
+
+from .database import database
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger("migrate")
+
+
+async def run_migrations() -> dict:
+    """Run every backfill in order against the connected database"""
+    results = {
+        "user_normalized_names": await database.backfill_user_normalized_names(),
+        "category_keys": await database.backfill_category_keys(),
+        "job_geo_locations": await database.backfill_job_geo_locations(),
+        "read_watermarks": await database.backfill_read_watermarks(),
+    }
+    await database.ensure_platform_counters()
+    return results
+
+
+async def main():
+    await database.connect_to_mongo()
+    if not getattr(database, "connected", False):
+        raise RuntimeError("Database connection unavailable; cannot run migrations")
+
+    try:
+        results = await run_migrations()
+        logger.info(f"✅ Migrations complete: {results}")
+    finally:
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -43,6 +43,7 @@ class AdminPermission(str, Enum):
     MANAGE_CONTACTS = "manage_contacts"
     MANAGE_LOCATIONS = "manage_locations"
     MANAGE_TRADES = "manage_trades"
+    MODERATE_REVIEWS = "moderate_reviews"
     
     # System administration
     MANAGE_ADMINS = "manage_admins"
@@ -74,6 +75,7 @@ ROLE_PERMISSIONS = {
         AdminPermission.MANAGE_CONTACTS,
         AdminPermission.MANAGE_LOCATIONS,
         AdminPermission.MANAGE_TRADES,
+        AdminPermission.MODERATE_REVIEWS,
         AdminPermission.VIEW_SYSTEM_STATS,
     ],
     
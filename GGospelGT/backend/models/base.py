@@ -304,6 +304,13 @@ class PortfolioItem(BaseModel):
     category: PortfolioItemCategory
     image_url: str
     image_filename: str
+    # Rendition metadata from the image pipeline (absent on items uploaded before it)
+    full_image_url: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_bytes: Optional[int] = None
+    renditions: Optional[Dict[str, Dict[str, Any]]] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     is_public: bool = True
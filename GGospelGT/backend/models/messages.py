@@ -44,6 +44,11 @@ class Conversation(BaseModel):
     last_message_at: Optional[datetime] = None
     unread_count_homeowner: int = 0
     unread_count_tradesperson: int = 0
+    # Read watermarks: everything from the other party up to this point has been read
+    last_read_at_homeowner: Optional[datetime] = None
+    last_read_message_id_homeowner: Optional[str] = None
+    last_read_at_tradesperson: Optional[datetime] = None
+    last_read_message_id_tradesperson: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
@@ -60,6 +65,9 @@ class MessageList(BaseModel):
     messages: List[Message]
     total: int
     has_more: bool
+    # Keyset cursors (newest-first pages): next_cursor -> ?before=, prev_cursor -> ?after=
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
 class ConversationSummary(BaseModel):
     id: str
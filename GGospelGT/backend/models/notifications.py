@@ -80,6 +80,12 @@ class Notification(BaseModel):
     metadata: Dict[str, Any] = Field(default={}, description="Additional data")
     sent_at: Optional[datetime] = Field(None, description="When notification was sent")
     delivered_at: Optional[datetime] = Field(None, description="When notification was delivered")
+    # Outbox delivery state (managed by the notification dispatcher worker)
+    attempts: int = Field(default=0, description="Delivery attempts made")
+    next_attempt_at: Optional[datetime] = Field(None, description="Earliest time of the next delivery attempt")
+    delivered_channels: List[str] = Field(default=[], description="Channels already delivered (email/sms)")
+    last_error: Optional[str] = Field(None, description="Error from the last failed attempt")
+    resolve_recipient: bool = Field(default=False, description="Recipient contact, channel and name are filled in by the dispatcher")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
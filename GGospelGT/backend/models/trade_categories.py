@@ -1,6 +1,8 @@
 # Nigerian Market Trade Categories
 # Comprehensive list of trades and services for the Nigerian marketplace
 
+import re
+
 NIGERIAN_TRADE_CATEGORIES = [
     # Existing trades with questions (DO NOT REMOVE)
     "Building",
@@ -35,6 +37,19 @@ def get_all_categories() -> list:
     """Get all available trade categories"""
     return NIGERIAN_TRADE_CATEGORIES.copy()
 
+def normalize_category_key(category: str) -> str:
+    """Canonical, case-insensitive key for a category name (e.g. "POP & Ceiling Works" -> "pop_ceiling_works")"""
+    return re.sub(r"[^a-z0-9]+", "_", (category or "").lower()).strip("_")
+
+def normalize_category_keys(categories) -> list:
+    """Canonical keys for a list of category names, de-duplicated and in order"""
+    keys = []
+    for category in categories or []:
+        key = normalize_category_key(category)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
 # Category groupings for better UX
 TRADE_CATEGORY_GROUPS = {
     "Construction & Building": [
@@ -0,0 +1,43 @@
+"""
+Notification outbox worker.
+
+Delivers notifications queued by the API. Run one or more instances alongside
+the API (claims are atomic, so workers can scale out):
+
+    python -m backend.notification_worker
+"""
+
+import asyncio
+import logging
+import signal
+
+from .database import database
+from .services.notification_outbox import NotificationDispatcher
+from .services.notifications import notification_service
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger("notification_worker")
+
+
+async def main():
+    await database.connect_to_mongo()
+    if not getattr(database, "connected", False):
+        raise RuntimeError("Database connection unavailable; notification worker cannot start")
+
+    dispatcher = NotificationDispatcher()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, dispatcher.stop)
+        except NotImplementedError:
+            pass
+
+    try:
+        await dispatcher.run()
+    finally:
+        await notification_service.aclose()
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,40 @@
+"""
+Review summary rebuild.
+
+Recomputes the per-user review_summaries documents (and the rating fields
+copied onto users) from the reviews collection. Writes keep the summaries
+current incrementally; the server never rebuilds them at startup. Run this as
+a deploy migration (the docker-compose ``migrate`` service does) and to repair
+drift, e.g. after editing reviews directly in the database:
+
+    python -m backend.rebuild_review_summaries
+    python -m backend.rebuild_review_summaries --user <user_id>
+"""
+
+import argparse
+import asyncio
+import logging
+
+from .database import database
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger("rebuild_review_summaries")
+
+
+async def main(user_id=None):
+    await database.connect_to_mongo()
+    if not getattr(database, "connected", False):
+        raise RuntimeError("Database connection unavailable; cannot rebuild review summaries")
+
+    try:
+        written = await database.rebuild_review_summaries(user_id=user_id)
+        logger.info(f"✅ Rebuilt {written} review summaries")
+    finally:
+        await database.close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild review summaries from the reviews collection")
+    parser.add_argument("--user", dest="user_id", help="only rebuild this reviewee's summary")
+    args = parser.parse_args()
+    asyncio.run(main(args.user_id))
@@ -7,6 +7,7 @@ from ..database import database
 from ..models.base import JobAccessFeeUpdate, TransactionStatus
 from ..models.admin import AdminPermission
 from ..auth.dependencies import require_permission, get_current_admin_account
+from ..services.storage import serve_stored_file
 
 logger = logging.getLogger(__name__)
 
@@ -667,17 +668,9 @@ async def get_admin_dashboard_stats():
 # ==========================================
 
 @router.get("/wallet/payment-proof/{filename}")
-async def view_payment_proof(filename: str, admin: dict = Depends(require_permission(AdminPermission.VIEW_PAYMENT_PROOFS))):
+async def view_payment_proof(filename: str, request: Request, admin: dict = Depends(require_permission(AdminPermission.VIEW_PAYMENT_PROOFS))):
     """View payment proof image (admin only)"""
-    from fastapi.responses import FileResponse
-    import os
-    
-    file_path = f"/app/uploads/payment_proofs/{filename}"
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Payment proof not found")
-    
-    return FileResponse(file_path, media_type="image/jpeg")
+    return await serve_stored_file(request, "payment_proofs", filename, private=True)
 
 # ==========================================
 # USER MANAGEMENT
@@ -2014,17 +2007,9 @@ async def get_verification_details(verification_id: str):
     return verification
 
 @router.get("/verifications/document/{filename}")
-async def view_verification_document(filename: str, admin: dict = Depends(require_permission(AdminPermission.VERIFY_USERS))):
+async def view_verification_document(filename: str, request: Request, admin: dict = Depends(require_permission(AdminPermission.VERIFY_USERS))):
     """View verification document image (admin only)"""
-    from fastapi.responses import FileResponse
-    import os
-    
-    file_path = f"/app/uploads/verification_documents/{filename}"
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Verification document not found")
-    
-    return FileResponse(file_path, media_type="image/jpeg")
+    return await serve_stored_file(request, "verification_documents", filename, private=True)
 
 # ==========================================
 # TRADE CATEGORY QUESTIONS MANAGEMENT
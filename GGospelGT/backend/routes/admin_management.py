@@ -3,12 +3,12 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import List, Optional
 from datetime import datetime, timedelta
 import logging
-import bcrypt
 import jwt
 import secrets
 import string
 
 from ..database import database
+from ..auth.security import password_hasher
 from ..models.admin import (
     Admin, AdminCreate, AdminUpdate, AdminLogin, AdminLoginResponse,
     AdminPasswordChange, AdminPasswordReset, AdminActivity, AdminActivityType,
@@ -81,13 +81,13 @@ def generate_password(length: int = 12) -> str:
     characters = string.ascii_letters + string.digits + "!@#$%^&*"
     return ''.join(secrets.choice(characters) for _ in range(length))
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+async def hash_password(password: str) -> str:
+    """Hash a password using bcrypt on the shared hashing pool"""
+    return await password_hasher.hash(password)
 
-def verify_password(password: str, hashed: str) -> bool:
-    """Verify a password against its hash"""
-    return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+async def verify_password(password: str, hashed: str) -> bool:
+    """Verify a password against its hash on the shared hashing pool"""
+    return await password_hasher.verify(password, hashed)
 
 def create_access_token(admin_id: str, username: str, role: str) -> str:
     """Create JWT access token"""
@@ -189,7 +189,7 @@ async def admin_login(login_data: AdminLogin, request: Request):
                 "role": AdminRole.SUPER_ADMIN.value,
                 "status": AdminStatus.ACTIVE.value,
                 "permissions": [perm.value for perm in get_admin_permissions(AdminRole.SUPER_ADMIN)],
-                "password_hash": hash_password(temp_password),
+                "password_hash": await hash_password(temp_password),
                 "must_change_password": True,
                 "created_at": datetime.utcnow(),
                 "updated_at": datetime.utcnow(),
@@ -215,11 +215,14 @@ async def admin_login(login_data: AdminLogin, request: Request):
         if admin.get("locked_until") and datetime.fromisoformat(admin["locked_until"]) > datetime.utcnow():
             raise HTTPException(status_code=401, detail="Account is temporarily locked")
         
-        # Verify password
-        if not verify_password(login_data.password, admin["password_hash"]):
+        # Verify password (upgrades hashes made with an old work factor)
+        password_ok, new_hash = await password_hasher.verify_and_rehash(login_data.password, admin["password_hash"])
+        if not password_ok:
             # Increment failed attempts
             await database.increment_admin_failed_attempts(admin["id"])
             raise HTTPException(status_code=401, detail="Invalid username or password")
+        if new_hash:
+            await database.update_admin(admin["id"], {"password_hash": new_hash})
     
     # Update login information
     if getattr(database, "connected", False):
@@ -371,7 +374,7 @@ async def create_admin(
         role=admin_data.role,
         phone=admin_data.phone,
         notes=admin_data.notes,
-        password_hash=hash_password(temp_password),
+        password_hash=await hash_password(temp_password),
         permissions=[perm.value for perm in get_admin_permissions(admin_data.role)],
         created_by=admin["id"],
         must_change_password=True
@@ -534,7 +537,7 @@ async def reset_admin_password(
     
     # Update password
     update_data = {
-        "password_hash": hash_password(reset_data.new_password),
+        "password_hash": await hash_password(reset_data.new_password),
         "must_change_password": True,
         "failed_login_attempts": 0,
         "locked_until": None,
@@ -571,7 +574,7 @@ async def change_password(
         raise HTTPException(status_code=503, detail="Database unavailable; write operations are disabled in degraded mode")
     
     # Verify current password
-    if not verify_password(password_data.current_password, admin["password_hash"]):
+    if not await verify_password(password_data.current_password, admin["password_hash"]):
         raise HTTPException(status_code=400, detail="Current password is incorrect")
     
     # Verify password confirmation
@@ -580,7 +583,7 @@ async def change_password(
     
     # Update password
     update_data = {
-        "password_hash": hash_password(password_data.new_password),
+        "password_hash": await hash_password(password_data.new_password),
         "must_change_password": False,
         "updated_at": datetime.utcnow()
     }
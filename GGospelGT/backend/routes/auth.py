@@ -7,7 +7,7 @@ from ..models.auth import (
     RefreshTokenRequest, RefreshTokenResponse
 )
 from ..auth.security import (
-    verify_password, get_password_hash, create_access_token, create_refresh_token,
+    password_hasher, get_password_hash_async, create_access_token, create_refresh_token,
     validate_password_strength, validate_nigerian_phone, format_nigerian_phone,
     verify_refresh_token
 )
@@ -71,7 +71,7 @@ async def register_homeowner(registration_data: HomeownerRegistration):
             "name": registration_data.name,
             "email": registration_data.email,
             "phone": formatted_phone,
-            "password_hash": get_password_hash(registration_data.password),
+            "password_hash": await get_password_hash_async(registration_data.password),
             "role": UserRole.HOMEOWNER,
             "status": UserStatus.ACTIVE,  # Homeowners are active immediately
             "location": registration_data.location,
@@ -305,7 +305,7 @@ async def register_tradesperson(registration_data: TradespersonRegistration):
             "name": registration_data.name,
             "email": registration_data.email,
             "phone": formatted_phone,
-            "password_hash": get_password_hash(registration_data.password),
+            "password_hash": await get_password_hash_async(registration_data.password),
             "role": UserRole.TRADESPERSON,
             "status": UserStatus.ACTIVE,  # Active immediately
             "location": registration_data.location,
@@ -530,12 +530,15 @@ async def login(login_data: UserLogin):
                 detail="Invalid email or password"
             )
 
-        # Verify password
-        if not verify_password(login_data.password, user_data["password_hash"]):
+        # Verify password (on the hashing pool; upgrades hashes made with an old work factor)
+        password_ok, new_hash = await password_hasher.verify_and_rehash(login_data.password, user_data["password_hash"])
+        if not password_ok:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password"
             )
+        if new_hash:
+            await database.update_user(user_data["id"], {"password_hash": new_hash})
 
         # Check if user is active
         if user_data["status"] == UserStatus.SUSPENDED:
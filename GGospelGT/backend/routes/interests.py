@@ -316,7 +316,7 @@ async def _notify_homeowner_new_interest(job: dict, tradesperson: dict, interest
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=homeowner_id,
             notification_type=NotificationType.NEW_INTEREST,
             template_data=template_data,
@@ -325,9 +325,6 @@ async def _notify_homeowner_new_interest(job: dict, tradesperson: dict, interest
             recipient_phone=homeowner.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ New interest notification sent to homeowner {homeowner_id} for interest {interest_id}")
         
     except Exception as e:
@@ -356,7 +353,7 @@ async def _notify_tradesperson_contact_shared(job: dict, tradesperson_id: str, i
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=tradesperson_id,
             notification_type=NotificationType.CONTACT_SHARED,
             template_data=template_data,
@@ -365,9 +362,6 @@ async def _notify_tradesperson_contact_shared(job: dict, tradesperson_id: str, i
             recipient_phone=tradesperson.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Contact shared notification sent to tradesperson {tradesperson_id} for interest {interest_id}")
         
     except Exception as e:
@@ -390,7 +384,7 @@ async def _notify_payment_confirmation(tradesperson: dict, job: dict, interest_i
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=tradesperson["id"],
             notification_type=NotificationType.PAYMENT_CONFIRMATION,
             template_data=template_data,
@@ -399,9 +393,6 @@ async def _notify_payment_confirmation(tradesperson: dict, job: dict, interest_i
             recipient_phone=tradesperson.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Payment confirmation notification sent to tradesperson {tradesperson['id']} for interest {interest_id}")
         
     except Exception as e:
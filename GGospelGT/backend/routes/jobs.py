@@ -4,6 +4,7 @@ from ..models import JobCreate, JobUpdate, JobCloseRequest, Job, JobsResponse
 from ..models.base import JobStatus
 from ..models.auth import User
 from ..models.notifications import NotificationType
+from ..models.trade_categories import normalize_category_key
 from ..auth.dependencies import get_current_active_user, get_current_homeowner
 from ..database import database
 from ..services.notifications import notification_service
@@ -167,13 +168,16 @@ async def get_nearby_jobs(
 ):
     """Get jobs near a specific location"""
     try:
+        # Fetch one extra row so we can report whether another page exists
         jobs = await database.get_jobs_near_location(
             latitude=latitude,
             longitude=longitude,
             max_distance_km=max_distance_km,
             skip=skip,
-            limit=limit
+            limit=limit + 1
         )
+        has_more = len(jobs) > limit
+        jobs = jobs[:limit]
         
         return {
             "jobs": jobs,
@@ -185,7 +189,8 @@ async def get_nearby_jobs(
             },
             "pagination": {
                 "skip": skip,
-                "limit": limit
+                "limit": limit,
+                "has_more": has_more
             }
         }
         
@@ -208,8 +213,10 @@ async def get_jobs_for_tradesperson(
         jobs = await database.get_jobs_for_tradesperson(
             tradesperson_id=current_user.id,
             skip=skip,
-            limit=limit
+            limit=limit + 1
         )
+        has_more = len(jobs) > limit
+        jobs = jobs[:limit]
         
         # Get tradesperson details for response
         tradesperson_info = {
@@ -230,7 +237,8 @@ async def get_jobs_for_tradesperson(
             "tradesperson_info": tradesperson_info,
             "pagination": {
                 "skip": skip,
-                "limit": limit
+                "limit": limit,
+                "has_more": has_more
             }
         }
         
@@ -247,24 +255,29 @@ async def search_jobs_with_location(
     latitude: Optional[float] = Query(None, ge=-90, le=90, description="User latitude for location filtering"),
     longitude: Optional[float] = Query(None, ge=-180, le=180, description="User longitude for location filtering"),
     max_distance_km: Optional[int] = Query(None, ge=1, le=200, description="Maximum distance in kilometers"),
-    skip: int = Query(0, ge=0, description="Number of items to skip"),
-    limit: int = Query(50, ge=1, le=100, description="Number of items to return")
+    skip: int = Query(0, ge=0, description="Number of items to skip (first page only)"),
+    limit: int = Query(50, ge=1, le=100, description="Number of items to return"),
+    cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page")
 ):
-    """Search jobs with optional location filtering"""
+    """Search jobs with relevance ranking and optional location filtering"""
     try:
-        jobs = await database.search_jobs_with_location(
-            search_query=q,
-            category=category,
-            user_latitude=latitude,
-            user_longitude=longitude,
-            max_distance_km=max_distance_km,
-            skip=skip,
-            limit=limit
-        )
+        try:
+            results = await database.search_jobs_with_location(
+                search_query=q,
+                category=category,
+                user_latitude=latitude,
+                user_longitude=longitude,
+                max_distance_km=max_distance_km,
+                skip=skip,
+                limit=limit,
+                cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         return {
-            "jobs": jobs,
-            "total": len(jobs),
+            "jobs": results["jobs"],
+            "total": results["total"],
             "search_params": {
                 "query": q,
                 "category": category,
@@ -276,10 +289,14 @@ async def search_jobs_with_location(
             },
             "pagination": {
                 "skip": skip,
-                "limit": limit
+                "limit": limit,
+                "has_more": results["has_more"],
+                "next_cursor": results["next_cursor"]
             }
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching jobs with location: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to search jobs: {str(e)}")
@@ -298,7 +315,7 @@ async def get_jobs(
         # Build filters
         filters = {}
         if category:
-            filters['category'] = category
+            filters['category_key'] = normalize_category_key(category)
         if location:
             filters['location'] = {'$regex': location, '$options': 'i'}
         
@@ -341,14 +358,11 @@ async def search_jobs(
         filters = {}
         
         if q:
-            # Text search on title and description
-            filters['$or'] = [
-                {'title': {'$regex': q, '$options': 'i'}},
-                {'description': {'$regex': q, '$options': 'i'}}
-            ]
+            # Indexed full-text search (jobs_text_search) instead of unanchored regex scans
+            filters['$text'] = {'$search': q}
         
         if category:
-            filters['category'] = category
+            filters['category_key'] = normalize_category_key(category)
             
         if location:
             filters['location'] = {'$regex': location, '$options': 'i'}
@@ -765,49 +779,35 @@ async def notify_job_completion(job_id: str, job: dict, homeowner: User):
         
         logger.info(f"Found {len(interested_tradespeople)} interested tradespeople for completed job {job_id}")
         
-        # Iterate through each interested tradesperson and send notifications
+        completion_date = datetime.utcnow().strftime("%B %d, %Y")
+        interests_url = f"{os.environ.get('FRONTEND_URL', 'https://servicehub.ng')}/my-interests"
+        recipients = []
         for interest in interested_tradespeople:
-            try:
-                tradesperson_id = interest.get("tradesperson_id")
-                tradesperson_info = interest.get("tradesperson", {})
-                
-                if not tradesperson_id:
-                    logger.warning(f"Missing tradesperson_id in interest: {interest}")
-                    continue
-                
-                # Get tradesperson notification preferences
-                preferences = await database.get_user_notification_preferences(tradesperson_id)
-                
-                # Prepare notification template data
-                template_data = {
+            tradesperson_id = interest.get("tradesperson_id")
+            tradesperson_info = interest.get("tradesperson", {})
+            
+            if not tradesperson_id:
+                logger.warning(f"Missing tradesperson_id in interest: {interest}")
+                continue
+            
+            recipients.append({
+                "user_id": tradesperson_id,
+                "recipient_email": tradesperson_info.get("email"),
+                "recipient_phone": tradesperson_info.get("phone"),
+                "template_data": {
                     "tradesperson_name": tradesperson_info.get("name", "Tradesperson"),
                     "job_title": job.get("title", "Untitled Job"),
                     "job_location": job.get("location", ""),
                     "homeowner_name": homeowner.name,
-                    "completion_date": datetime.utcnow().strftime("%B %d, %Y"),
-                    "interests_url": f"{os.environ.get('FRONTEND_URL', 'https://servicehub.ng')}/my-interests"
+                    "completion_date": completion_date,
+                    "interests_url": interests_url
                 }
-                
-                # Send notification
-                notification = await notification_service.send_notification(
-                    user_id=tradesperson_id,
-                    notification_type=NotificationType.JOB_COMPLETED,
-                    template_data=template_data,
-                    user_preferences=preferences,
-                    recipient_email=tradesperson_info.get("email"),
-                    recipient_phone=tradesperson_info.get("phone")
-                )
-                
-                # Save notification to database
-                await database.create_notification(notification)
-                
-                logger.info(f"✅ Job completion notification sent to tradesperson {tradesperson_id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to send job completion notification to tradesperson {tradesperson_id}: {str(e)}")
-                continue
+            })
+        
+        # Preferences, rendering and queueing happen in one batched fan-out
+        await notification_service.send_bulk_notifications(NotificationType.JOB_COMPLETED, recipients)
         
-        logger.info(f"✅ Job completion notifications sent to all interested tradespeople for job {job_id}")
+        logger.info(f"✅ Job completion notifications queued for {len(recipients)} interested tradespeople for job {job_id}")
         
     except Exception as e:
         logger.error(f"❌ Error in job completion notification: {str(e)}")
@@ -826,51 +826,37 @@ async def notify_job_cancellation(job_id: str, job: dict, homeowner: User, reaso
         
         logger.info(f"Found {len(interested_tradespeople)} interested tradespeople for cancelled job {job_id}")
         
-        # Iterate through each interested tradesperson and send notifications
+        cancellation_date = datetime.utcnow().strftime("%B %d, %Y")
+        frontend_url = os.environ.get('FRONTEND_URL', 'https://servicehub.ng')
+        recipients = []
         for interest in interested_tradespeople:
-            try:
-                tradesperson_id = interest.get("tradesperson_id")
-                tradesperson_info = interest.get("tradesperson", {})
-                
-                if not tradesperson_id:
-                    logger.warning(f"Missing tradesperson_id in interest: {interest}")
-                    continue
-                
-                # Get tradesperson notification preferences
-                preferences = await database.get_user_notification_preferences(tradesperson_id)
-                
-                # Prepare notification template data
-                template_data = {
+            tradesperson_id = interest.get("tradesperson_id")
+            tradesperson_info = interest.get("tradesperson", {})
+            
+            if not tradesperson_id:
+                logger.warning(f"Missing tradesperson_id in interest: {interest}")
+                continue
+            
+            recipients.append({
+                "user_id": tradesperson_id,
+                "recipient_email": tradesperson_info.get("email"),
+                "recipient_phone": tradesperson_info.get("phone"),
+                "template_data": {
                     "tradesperson_name": tradesperson_info.get("name", "Tradesperson"),
                     "job_title": job.get("title", "Untitled Job"),
                     "job_location": job.get("location", ""),
                     "homeowner_name": homeowner.name,
                     "cancellation_reason": reason,
-                    "cancellation_date": datetime.utcnow().strftime("%B %d, %Y"),
-                    "browse_jobs_url": f"{os.environ.get('FRONTEND_URL', 'https://servicehub.ng')}/browse-jobs",
-                    "interests_url": f"{os.environ.get('FRONTEND_URL', 'https://servicehub.ng')}/my-interests"
+                    "cancellation_date": cancellation_date,
+                    "browse_jobs_url": f"{frontend_url}/browse-jobs",
+                    "interests_url": f"{frontend_url}/my-interests"
                 }
-                
-                # Send notification
-                notification = await notification_service.send_notification(
-                    user_id=tradesperson_id,
-                    notification_type=NotificationType.JOB_CANCELLED,
-                    template_data=template_data,
-                    user_preferences=preferences,
-                    recipient_email=tradesperson_info.get("email"),
-                    recipient_phone=tradesperson_info.get("phone")
-                )
-                
-                # Save notification to database
-                await database.create_notification(notification)
-                
-                logger.info(f"✅ Job cancellation notification sent to tradesperson {tradesperson_id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to send job cancellation notification to tradesperson {tradesperson_id}: {str(e)}")
-                continue
+            })
+        
+        # Preferences, rendering and queueing happen in one batched fan-out
+        await notification_service.send_bulk_notifications(NotificationType.JOB_CANCELLED, recipients)
         
-        logger.info(f"✅ Job cancellation notifications sent to all interested tradespeople for job {job_id}")
+        logger.info(f"✅ Job cancellation notifications queued for {len(recipients)} interested tradespeople for job {job_id}")
         
     except Exception as e:
         logger.error(f"❌ Error in job cancellation notification: {str(e)}")
@@ -907,7 +893,7 @@ async def _notify_job_posted_successfully(homeowner: dict, job: dict):
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=homeowner_id,
             notification_type=NotificationType.JOB_POSTED,
             template_data=template_data,
@@ -916,9 +902,6 @@ async def _notify_job_posted_successfully(homeowner: dict, job: dict):
             recipient_phone=homeowner.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Job posted notification sent to homeowner {homeowner_id} for job {job.get('id')}")
         
     except Exception as e:
@@ -938,51 +921,36 @@ async def notify_job_cancellation(job_id: str, job: dict, homeowner: User, reaso
         
         logger.info(f"Found {len(interested_tradespeople)} interested tradespeople for cancelled job {job_id}")
         
-        # Iterate through each interested tradesperson and send notifications
+        cancellation_date = datetime.utcnow().strftime("%B %d, %Y")
+        recipients = []
         for interest in interested_tradespeople:
-            try:
-                tradesperson_id = interest.get("tradesperson_id")
-                tradesperson_info = interest.get("tradesperson", {})
-                
-                if not tradesperson_id:
-                    logger.warning(f"Missing tradesperson_id in interest: {interest}")
-                    continue
-                
-                # Get tradesperson notification preferences
-                preferences = await database.get_user_notification_preferences(tradesperson_id)
-                
-                # Prepare notification template data
-                template_data = {
+            tradesperson_id = interest.get("tradesperson_id")
+            tradesperson_info = interest.get("tradesperson", {})
+            
+            if not tradesperson_id:
+                logger.warning(f"Missing tradesperson_id in interest: {interest}")
+                continue
+            
+            recipients.append({
+                "user_id": tradesperson_id,
+                "recipient_email": tradesperson_info.get("email"),
+                "recipient_phone": tradesperson_info.get("phone"),
+                "template_data": {
                     "tradesperson_name": tradesperson_info.get("name", "Tradesperson"),
                     "job_title": job.get("title", "Untitled Job"),
                     "job_location": job.get("location", ""),
                     "homeowner_name": homeowner.name,
                     "cancellation_reason": reason,
                     "additional_feedback": feedback if feedback else "No additional feedback provided",
-                    "cancellation_date": datetime.utcnow().strftime("%B %d, %Y"),
+                    "cancellation_date": cancellation_date,
                     "browse_jobs_url": "https://servicehub.ng/jobs"
                 }
-                
-                # Send notification
-                notification = await notification_service.send_notification(
-                    user_id=tradesperson_id,
-                    notification_type=NotificationType.JOB_CANCELLED,
-                    template_data=template_data,
-                    user_preferences=preferences,
-                    recipient_email=tradesperson_info.get("email"),
-                    recipient_phone=tradesperson_info.get("phone")
-                )
-                
-                # Save notification to database
-                await database.create_notification(notification)
-                
-                logger.info(f"✅ Job cancellation notification sent to tradesperson {tradesperson_id}")
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to send job cancellation notification to tradesperson {tradesperson_id}: {str(e)}")
-                continue
+            })
         
-        logger.info(f"✅ Job cancellation notifications sent to all interested tradespeople for job {job_id}")
+        # Preferences, rendering and queueing happen in one batched fan-out
+        await notification_service.send_bulk_notifications(NotificationType.JOB_CANCELLED, recipients)
+        
+        logger.info(f"✅ Job cancellation notifications queued for {len(recipients)} interested tradespeople for job {job_id}")
         
     except Exception as e:
         logger.error(f"❌ Error in job cancellation notification: {str(e)}")
@@ -1124,12 +1092,10 @@ async def create_sample_data(current_user: User = Depends(get_current_homeowner)
             }
         ]
         
-        # Insert sample jobs into database
+        # Insert sample jobs through create_job so the platform counters see them
         created_jobs = []
         for job_data in sample_jobs:
-            result = await database.database.jobs.insert_one(job_data)
-            job_data["_id"] = str(result.inserted_id)
-            created_jobs.append(job_data)
+            created_jobs.append(await database.create_job(job_data))
         
         return {
             "message": f"Successfully created {len(created_jobs)} sample jobs",
@@ -1167,7 +1133,7 @@ async def _notify_job_posted_successfully_old(homeowner: dict, job: dict):
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=homeowner_id,
             notification_type=NotificationType.JOB_POSTED,
             template_data=template_data,
@@ -1176,9 +1142,6 @@ async def _notify_job_posted_successfully_old(homeowner: dict, job: dict):
             recipient_phone=homeowner.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Job posted notification sent to homeowner {homeowner_id} for job {job.get('id')}")
         
     except Exception as e:
@@ -1,14 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from ..models.messages import (
     Conversation, ConversationCreate, Message, MessageCreate,
     ConversationList, MessageList
 )
-from ..models.auth import User
+from ..models.auth import User, UserStatus
 from ..models.notifications import NotificationType
-from ..auth.dependencies import get_current_active_user, get_current_homeowner
+from ..auth.dependencies import get_current_active_user, get_current_homeowner, get_user_from_token
 from ..database import database
 from ..services.notifications import notification_service
+from ..utils.realtime import realtime_bus
 from datetime import datetime
+from typing import Optional
+import asyncio
+import json
 import uuid
 import logging
 import os
@@ -17,6 +23,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/messages", tags=["messages"])
 
+# Idle connections get a keep-alive at this interval so proxies don't drop them
+REALTIME_HEARTBEAT_SEC = float(os.getenv("REALTIME_HEARTBEAT_SEC", "25"))
+
 @router.post("/conversations", response_model=Conversation)
 async def create_conversation(
     conversation_data: ConversationCreate,
@@ -111,10 +120,17 @@ async def get_conversations(
 async def get_conversation_messages(
     conversation_id: str,
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=200),
+    latest: bool = Query(False, description="Return the newest page first (keyset pagination)"),
+    before: Optional[str] = Query(None, description="next_cursor from a previous page; returns older messages"),
+    after: Optional[str] = Query(None, description="prev_cursor from a previous page; returns newer messages"),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get messages for a conversation"""
+    """Get messages for a conversation.
+
+    With ``latest``, ``before`` or ``after`` pages are newest-first and keyset-based;
+    otherwise the legacy oldest-first ``skip`` pagination is used.
+    """
     try:
         # Verify user has access to this conversation
         conversation = await database.get_conversation_by_id(conversation_id)
@@ -125,21 +141,42 @@ async def get_conversation_messages(
             current_user.id != conversation["tradesperson_id"]):
             raise HTTPException(status_code=403, detail="Access denied")
         
-        messages = await database.get_conversation_messages(
-            conversation_id=conversation_id,
-            skip=skip,
-            limit=limit
-        )
+        page = None
+        if latest or before or after:
+            try:
+                page = await database.get_conversation_messages_page(
+                    conversation_id=conversation_id,
+                    limit=limit,
+                    before=before,
+                    after=after
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            messages = page["messages"]
+            has_more = page["has_more"]
+        else:
+            messages = await database.get_conversation_messages(
+                conversation_id=conversation_id,
+                skip=skip,
+                limit=limit
+            )
+            has_more = len(messages) == limit
+        
+        database.apply_read_watermarks(conversation, messages)
         
-        # Mark messages as read
-        await database.mark_messages_as_read(conversation_id, current_user.role)
+        # Advance the read watermark (no write if already caught up); pages that do not
+        # reach the newest message (scrolling back, partial catch-up) leave read state alone
+        if not before and not (after and has_more):
+            await database.mark_messages_as_read(conversation_id, current_user.role)
         
         message_objects = [Message(**msg) for msg in messages]
         
         return MessageList(
             messages=message_objects,
             total=len(message_objects),
-            has_more=len(message_objects) == limit
+            has_more=has_more,
+            next_cursor=page["next_cursor"] if page else None,
+            prev_cursor=page["prev_cursor"] if page else None
         )
         
     except HTTPException:
@@ -157,32 +194,25 @@ async def send_message(
 ):
     """Send a message in a conversation"""
     try:
-        # Verify user has access to this conversation
-        conversation = await database.get_conversation_by_id(conversation_id)
-        if not conversation:
-            raise HTTPException(status_code=404, detail="Conversation not found")
-        
-        if (current_user.id != conversation["homeowner_id"] and 
-            current_user.id != conversation["tradesperson_id"]):
-            raise HTTPException(status_code=403, detail="Access denied")
-        
-        # Create message
         message = {
             "id": str(uuid.uuid4()),
-            "conversation_id": conversation_id,
-            "sender_id": current_user.id,
             "sender_name": current_user.name or current_user.business_name or "User",
-            "sender_type": current_user.role,
             "message_type": message_data.message_type,
             "content": message_data.content,
             "attachment_url": message_data.attachment_url
         }
         
-        result = await database.create_message(message)
-        if not result:
-            raise HTTPException(status_code=500, detail="Failed to send message")
+        # Authorization and the conversation update are one round trip
+        result = await database.send_conversation_message(
+            conversation_id, current_user.id, current_user.role, message
+        )
+        if result is None:
+            conversation = await database.get_conversation_by_id(conversation_id)
+            if not conversation:
+                raise HTTPException(status_code=404, detail="Conversation not found")
+            raise HTTPException(status_code=403, detail="Access denied")
         
-        # Send notification to recipient
+        conversation = result["conversation"]
         recipient_id = (conversation["homeowner_id"] 
                        if current_user.id == conversation["tradesperson_id"] 
                        else conversation["tradesperson_id"])
@@ -195,7 +225,7 @@ async def send_message(
             message_content=message_data.content
         )
         
-        return Message(**result)
+        return Message(**result["message"])
         
     except HTTPException:
         raise
@@ -309,44 +339,125 @@ async def get_or_create_conversation_for_job(
         logger.error(f"Error getting/creating conversation: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get or create conversation")
 
+# Real-time push (WebSocket, with Server-Sent Events as fallback)
+
+async def _realtime_user(token: Optional[str]) -> Optional[User]:
+    """Active user for a realtime connection token, or None"""
+    if not token:
+        return None
+    try:
+        user = await get_user_from_token(token)
+    except HTTPException:
+        return None
+    return user if user.status == UserStatus.ACTIVE else None
+
+async def _mark_read_for_participant(user: User, conversation_id: str) -> bool:
+    conversation = await database.get_conversation_by_id(conversation_id)
+    if not conversation or user.id not in (conversation["homeowner_id"], conversation["tradesperson_id"]):
+        return False
+    return await database.mark_messages_as_read(conversation_id, user.role)
+
+async def _receive_client_events(websocket: WebSocket, user: User):
+    """Handle client frames: {"type": "ping"} and {"type": "read", "conversation_id": ...}"""
+    while True:
+        try:
+            frame = await websocket.receive_json()
+        except (ValueError, KeyError):
+            continue
+        if not isinstance(frame, dict):
+            continue
+        if frame.get("type") == "ping":
+            await websocket.send_json({"type": "pong"})
+        elif frame.get("type") == "read" and frame.get("conversation_id"):
+            await _mark_read_for_participant(user, str(frame["conversation_id"]))
+
+@router.websocket("/ws")
+async def realtime_socket(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """Push new messages, read receipts and unread-count changes to a connected participant"""
+    user = await _realtime_user(token)
+    if user is None:
+        await websocket.close(code=4401)
+        return
+
+    await websocket.accept()
+    subscription = realtime_bus.subscribe(user.id)
+    receiver = asyncio.create_task(_receive_client_events(websocket, user))
+    try:
+        await websocket.send_json({"type": "ready", "data": {"user_id": user.id}})
+        while True:
+            next_event = asyncio.create_task(subscription.get(REALTIME_HEARTBEAT_SEC))
+            await asyncio.wait({next_event, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if receiver.done():
+                next_event.cancel()
+                break
+            event = next_event.result()
+            await websocket.send_json(jsonable_encoder(event or {"type": "heartbeat"}))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Realtime socket error for {user.id}: {str(e)}")
+    finally:
+        receiver.cancel()
+        realtime_bus.unsubscribe(subscription)
+
+def _sse_frame(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(jsonable_encoder(event))}\n\n"
+
+@router.get("/stream")
+async def realtime_stream(request: Request, token: Optional[str] = Query(None)):
+    """Server-Sent Events fallback for clients that cannot open a WebSocket.
+
+    EventSource cannot set headers, so the access token may be passed as ?token=.
+    Mark conversations read with PUT /conversations/{id}/read.
+    """
+    auth_header = request.headers.get("authorization", "")
+    if not token and auth_header.startswith("Bearer "):
+        token = auth_header[len("Bearer "):]
+    user = await _realtime_user(token)
+    if user is None:
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+    async def events():
+        subscription = realtime_bus.subscribe(user.id)
+        try:
+            yield _sse_frame({"type": "ready", "data": {"user_id": user.id}})
+            while not await request.is_disconnected():
+                event = await subscription.get(REALTIME_HEARTBEAT_SEC)
+                yield _sse_frame(event) if event else ": heartbeat\n\n"
+        finally:
+            realtime_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 async def _notify_new_message(sender: User, recipient_id: str, conversation: dict, message_content: str):
-    """Background task to notify recipient of new message"""
+    """Background task to queue a new-message notification.
+
+    The recipient's contact details, preferences and name are resolved by the
+    notification dispatcher, so this is a single outbox insert.
+    """
     try:
-        # Get recipient details
-        recipient = await database.get_user_by_id(recipient_id)
-        if not recipient:
-            logger.warning(f"Recipient {recipient_id} not found")
-            return
-        
-        # Get recipient preferences
-        preferences = await database.get_user_notification_preferences(recipient_id)
-        
-        # Prepare template data
         template_data = {
-            "recipient_name": recipient.get("name") or recipient.get("business_name", "User"),
             "sender_name": sender.name or sender.business_name or "User",
             "job_title": conversation.get("job_title", "Job"),
             "message_preview": message_content[:100] + "..." if len(message_content) > 100 else message_content,
             "conversation_url": f"{os.environ.get('FRONTEND_URL', 'https://servicehub.ng')}/messages/{conversation['id']}"
         }
         
-        # Send notification
-        notification = await notification_service.send_notification(
+        notification = await notification_service.queue_notification(
             user_id=recipient_id,
             notification_type=NotificationType.NEW_MESSAGE,
-            template_data=template_data,
-            user_preferences=preferences,
-            recipient_email=recipient.get("email"),
-            recipient_phone=recipient.get("phone")
+            template_data=template_data
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
-        logger.info(f"✅ New message notification sent to {recipient_id}")
+        if notification:
+            logger.info(f"✅ New message notification queued for {recipient_id}")
         
     except Exception as e:
-        logger.error(f"❌ Failed to send new message notification: {str(e)}")
+        logger.error(f"❌ Failed to queue new message notification: {str(e)}")
 
 # Hiring Status and Feedback Endpoints
 
@@ -582,7 +693,7 @@ async def _send_review_invitation(homeowner: User, tradesperson: dict, job: dict
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=homeowner.id,
             notification_type=NotificationType.REVIEW_INVITATION,
             template_data=template_data,
@@ -591,9 +702,6 @@ async def _send_review_invitation(homeowner: User, tradesperson: dict, job: dict
             recipient_phone=homeowner.phone
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Review invitation sent to homeowner {homeowner.id}")
         
     except Exception as e:
@@ -150,9 +150,6 @@ async def test_notification(
             recipient_phone=current_user.phone
         )
         
-        # Save to database
-        await database.create_notification(notification)
-        
         return {
             "message": f"Test {notification_type} notification sent",
             "notification_id": notification.id,
@@ -244,9 +241,6 @@ async def _send_notification_background(
             recipient_phone=recipient_phone
         )
         
-        # Save to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Background notification sent: {notification.id}")
         
     except Exception as e:
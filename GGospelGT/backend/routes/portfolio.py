@@ -1,23 +1,22 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, status
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Depends, Request, status
 from typing import List, Optional
 import os
 import uuid
 import shutil
 from pathlib import Path
-from PIL import Image
-import io
 
 from models import PortfolioItemCreate, PortfolioItem, PortfolioResponse, PortfolioItemCategory
 from ..models.auth import User
 from ..auth.dependencies import get_current_tradesperson, get_current_active_user
 from ..database import database
+from ..services.image_pipeline import image_pipeline
+from ..services.storage import storage, serve_stored_file
+from ..utils.uploads import ingest_upload
 
 router = APIRouter(prefix="/api/portfolio", tags=["portfolio"])
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("/app/uploads/portfolio")
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+# Storage namespace for portfolio renditions (content-addressed, see services/storage.py)
+STORAGE_NAMESPACE = "portfolio"
 
 # Allowed file extensions and max file size
 ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
@@ -30,35 +29,41 @@ def validate_image_file(file: UploadFile) -> bool:
     if file_ext not in ALLOWED_EXTENSIONS:
         return False
     
-    # Check file size
-    if file.size > MAX_FILE_SIZE:
+    # Check declared file size (the limit is enforced again while streaming)
+    if file.size is not None and file.size > MAX_FILE_SIZE:
         return False
     
     return True
 
-def resize_image(image_data: bytes, max_width: int = 1200, max_height: int = 1200, quality: int = 85) -> bytes:
-    """Resize and optimize image"""
-    try:
-        # Open image
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert RGBA to RGB if necessary
-        if image.mode == 'RGBA':
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[-1])
-            image = background
-        
-        # Resize if necessary
-        if image.width > max_width or image.height > max_height:
-            image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
-        
-        # Save optimized image
-        output = io.BytesIO()
-        image.save(output, format='JPEG', quality=quality, optimize=True)
-        return output.getvalue()
-    
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
+def _storage_files(processed: dict) -> List[str]:
+    """Every stored file name written for one upload"""
+    files = []
+    for info in processed["renditions"].values():
+        files.append(info["filename"])
+        if "webp_filename" in info:
+            files.append(info["webp_filename"])
+    return files
+
+async def _delete_unreferenced_files(filenames: List[str]):
+    """Delete stored files unless another portfolio item (identical upload) still references them"""
+    referenced = await database.get_referenced_portfolio_files(filenames)
+    for filename in set(filenames) - referenced:
+        await storage.delete(f"{STORAGE_NAMESPACE}/{filename}")
+
+def _rendition_urls(processed: dict) -> dict:
+    """Public URLs, dimensions and byte sizes for each rendition written by the pipeline"""
+    renditions = {}
+    for name, info in processed["renditions"].items():
+        renditions[name] = {
+            "url": f"/api/portfolio/images/{info['filename']}",
+            "width": info["width"],
+            "height": info["height"],
+            "bytes": info["bytes"]
+        }
+        if "webp_filename" in info:
+            renditions[name]["webp_url"] = f"/api/portfolio/images/{info['webp_filename']}"
+            renditions[name]["webp_bytes"] = info["webp_bytes"]
+    return renditions
 
 @router.post("/upload", response_model=PortfolioItem)
 async def upload_portfolio_image(
@@ -77,20 +82,17 @@ async def upload_portfolio_image(
                 detail=f"Invalid file. Allowed formats: {', '.join(ALLOWED_EXTENSIONS)}. Max size: {MAX_FILE_SIZE // (1024*1024)}MB"
             )
         
-        # Read file content
-        file_content = await file.read()
-        
-        # Resize and optimize image
-        optimized_content = resize_image(file_content)
+        # Stream the upload to a temp file, then resize, encode and store all renditions off the event loop
+        ingested = await ingest_upload(file, storage.staging_dir, MAX_FILE_SIZE)
+        try:
+            processed = await image_pipeline.process_to_storage(ingested.temp_path, STORAGE_NAMESPACE)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        finally:
+            await ingested.discard()
         
-        # Generate unique filename
-        file_ext = Path(file.filename).suffix.lower()
-        unique_filename = f"{uuid.uuid4()}{file_ext}"
-        file_path = UPLOAD_DIR / unique_filename
-        
-        # Save file
-        with open(file_path, "wb") as f:
-            f.write(optimized_content)
+        renditions = _rendition_urls(processed)
+        full = renditions["full"]
         
         # Create portfolio item data
         portfolio_data = {
@@ -99,8 +101,15 @@ async def upload_portfolio_image(
             "title": title,
             "description": description,
             "category": category,
-            "image_url": f"/api/portfolio/images/{unique_filename}",
-            "image_filename": unique_filename,
+            "image_url": full["url"],
+            "image_filename": processed["renditions"]["full"]["filename"],
+            "full_image_url": full["url"],
+            "thumbnail_url": renditions["thumb"]["url"],
+            "image_width": full["width"],
+            "image_height": full["height"],
+            "image_bytes": full["bytes"],
+            "renditions": renditions,
+            "storage_files": _storage_files(processed),
             "created_at": database.get_current_time(),
             "updated_at": database.get_current_time(),
             "is_public": True
@@ -114,26 +123,18 @@ async def upload_portfolio_image(
     except HTTPException:
         raise
     except Exception as e:
-        # Clean up file if database save fails
-        if 'file_path' in locals() and file_path.exists():
-            file_path.unlink()
+        # Clean up renditions if database save fails
+        if 'processed' in locals():
+            await _delete_unreferenced_files(_storage_files(processed))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to upload image: {str(e)}"
         )
 
 @router.get("/images/{filename}")
-async def get_portfolio_image(filename: str):
-    """Serve portfolio images"""
-    file_path = UPLOAD_DIR / filename
-    if not file_path.exists():
-        raise HTTPException(status_code=404, detail="Image not found")
-    
-    return FileResponse(
-        path=file_path,
-        media_type="image/jpeg",
-        headers={"Cache-Control": "public, max-age=3600"}
-    )
+async def get_portfolio_image(filename: str, request: Request):
+    """Serve portfolio images (ETag, conditional GET and byte ranges)"""
+    return await serve_stored_file(request, STORAGE_NAMESPACE, filename)
 
 @router.get("/my-portfolio", response_model=PortfolioResponse)
 async def get_my_portfolio(
@@ -234,13 +235,9 @@ async def delete_portfolio_item(
         if existing_item["tradesperson_id"] != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this item")
         
-        # Delete image file
-        image_path = UPLOAD_DIR / existing_item["image_filename"]
-        if image_path.exists():
-            image_path.unlink()
-        
-        # Delete from database
+        # Delete from database, then any stored files no other item shares
         await database.delete_portfolio_item(item_id)
+        await _delete_unreferenced_files(existing_item.get("storage_files") or [existing_item["image_filename"]])
         
         return {"message": "Portfolio item deleted successfully"}
         
@@ -242,21 +242,17 @@ async def get_available_jobs(
     try:
         skip = (page - 1) * limit
         
-        # Get jobs matching tradesperson's categories
-        available_jobs = await database.get_jobs_for_tradesperson(
+        # Get the page and total of jobs matching tradesperson's categories in one call
+        feed = await database.get_available_jobs_feed_for_tradesperson(
             tradesperson_id=current_user.id,
             trade_categories=current_user.trade_categories or [],
             skip=skip,
             limit=limit
         )
-        
-        total_jobs = await database.get_available_jobs_count_for_tradesperson(
-            tradesperson_id=current_user.id,
-            trade_categories=current_user.trade_categories or []
-        )
+        total_jobs = feed["total"]
         
         return {
-            "jobs": available_jobs,
+            "jobs": feed["jobs"],
             "pagination": {
                 "page": page,
                 "limit": limit,
@@ -1,13 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
 from typing import List, Optional
 from datetime import datetime
-import os
-import uuid
-from PIL import Image
-import io
 
 from ..auth.dependencies import get_current_user
 from ..database import database
+from ..services.image_pipeline import image_pipeline, VERIFICATION_DOCUMENT_RENDITIONS
+from ..services.storage import storage, serve_stored_file
+from ..utils.uploads import ingest_upload
 from ..models.base import (
     ReferralStats, DocumentUpload, VerificationSubmission,
     DocumentType, WithdrawalRequest, WalletResponseWithReferrals
@@ -15,6 +14,8 @@ from ..models.base import (
 
 router = APIRouter(prefix="/api/referrals", tags=["referrals"])
 
+MAX_DOCUMENT_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+
 @router.get("/my-stats", response_model=ReferralStats)
 async def get_my_referral_stats(current_user = Depends(get_current_user)):
     """Get current user's referral statistics and referral code"""
@@ -71,36 +72,18 @@ async def submit_verification_documents(
     if not document_image.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed")
     
-    # Create uploads directory
-    upload_dir = "/app/uploads/verification_documents"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = document_image.filename.split(".")[-1].lower()
-    filename = f"{current_user.id}_{document_type}_{uuid.uuid4().hex}.{file_extension}"
-    file_path = os.path.join(upload_dir, filename)
-    
-    # Save and optimize image
+    # Stream to disk, then save optimized image (max 1920x1920 for document clarity)
+    ingested = await ingest_upload(document_image, storage.staging_dir, MAX_DOCUMENT_IMAGE_SIZE)
     try:
-        # Read image data
-        image_data = await document_image.read()
-        
-        # Open and optimize image
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if necessary
-        if image.mode in ("RGBA", "P"):
-            image = image.convert("RGB")
-        
-        # Resize if too large (max 1920x1920 for document clarity)
-        if image.width > 1920 or image.height > 1920:
-            image.thumbnail((1920, 1920), Image.Resampling.LANCZOS)
-        
-        # Save optimized image
-        image.save(file_path, "JPEG", quality=90, optimize=True)
-        
+        processed = await image_pipeline.process_to_storage(
+            ingested.temp_path, "verification_documents",
+            renditions=VERIFICATION_DOCUMENT_RENDITIONS, webp=False, jpeg_quality=90
+        )
+        filename = processed["renditions"]["full"]["filename"]
     except Exception as e:
         raise HTTPException(status_code=400, detail="Invalid image file")
+    finally:
+        await ingested.discard()
     
     # Submit verification
     verification_id = await database.submit_verification_documents(
@@ -152,16 +135,9 @@ async def check_withdrawal_eligibility(current_user = Depends(get_current_user))
 
 # Serve verification document images
 @router.get("/verification-document/{filename}")
-async def serve_verification_document(filename: str):
+async def serve_verification_document(filename: str, request: Request):
     """Serve verification document images (admin only)"""
-    from fastapi.responses import FileResponse
-    
-    file_path = f"/app/uploads/verification_documents/{filename}"
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Document not found")
-    
-    return FileResponse(file_path, media_type="image/jpeg")
+    return await serve_stored_file(request, "verification_documents", filename, private=True)
 
 @router.post("/process-signup-referral")
 async def process_signup_referral(
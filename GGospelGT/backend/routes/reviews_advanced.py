@@ -4,11 +4,12 @@ from ..models.reviews import (
     Review, ReviewCreate, ReviewUpdate, ReviewResponse, ReviewSummary,
     ReviewsListResponse, ReviewStats, ReviewType, ReviewStatus,
     ReviewRequest, ReviewHelpful, ReviewFilters,
-    AdvancedReviewSearchRequest, AdvancedReviewSearchResponse
+    AdvancedReviewSearchRequest, AdvancedReviewSearchResponse, ReviewModerationAction
 )
+from ..models.admin import AdminPermission
 from ..models.auth import User
 from ..models.notifications import NotificationType
-from ..auth.dependencies import get_current_user, get_current_homeowner, get_current_tradesperson
+from ..auth.dependencies import get_current_user, get_current_homeowner, get_current_tradesperson, require_permission
 from ..database import database
 from ..services.notifications import notification_service
 from datetime import datetime, timedelta
@@ -103,21 +104,22 @@ async def get_user_reviews(
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
+        # Get review summary (one document); its total covers the unfiltered listing
+        summary = await database.get_user_review_summary(user_id)
+        
         # Get reviews with pagination
         reviews_data = await database.get_user_reviews(
-            user_id, review_type, page, limit
+            user_id, review_type, page, limit,
+            total=None if review_type else summary.total_reviews
         )
         
-        # Get review summary
-        summary = await database.get_user_review_summary(user_id)
-        
         return ReviewsListResponse(
             reviews=reviews_data["reviews"],
             total=reviews_data["total"],
             page=reviews_data["page"],
             limit=reviews_data["limit"],
             total_pages=reviews_data["total_pages"],
-            average_rating=reviews_data["average_rating"],
+            average_rating=summary.average_rating,
             summary=summary
         )
         
@@ -259,6 +261,29 @@ async def update_review(
         logger.error(f"Error updating review: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to update review")
 
+@router.put("/moderate", response_model=Review)
+async def moderate_review(
+    action: ReviewModerationAction,
+    admin: dict = Depends(require_permission(AdminPermission.MODERATE_REVIEWS))
+):
+    """Change a review's moderation status (admin only)"""
+    try:
+        review = await database.set_review_status(
+            action.review_id, action.action, action.reason,
+            moderator_notes=action.moderator_notes, moderator_id=admin["id"]
+        )
+        if not review:
+            raise HTTPException(status_code=404, detail="Review not found")
+        
+        logger.info(f"Review moderated: {action.review_id} -> {action.action.value} by {admin['id']}")
+        return review
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error moderating review: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to moderate review")
+
 @router.post("/helpful/{review_id}")
 async def mark_review_helpful(
     review_id: str,
@@ -383,7 +408,7 @@ async def _notify_review_received(
         }
         
         # Send notification
-        notification = await notification_service.send_notification(
+        await notification_service.send_notification(
             user_id=reviewee["id"],
             notification_type=NotificationType.NEW_REVIEW_RECEIVED,  # Need to add this type
             template_data=template_data,
@@ -392,9 +417,6 @@ async def _notify_review_received(
             recipient_phone=reviewee.get("phone")
         )
         
-        # Save notification to database
-        await database.create_notification(notification)
-        
         logger.info(f"✅ Review notification sent to {reviewee['id']} for review {review_id}")
         
     except Exception as e:
@@ -1,15 +1,23 @@
 from fastapi import APIRouter, HTTPException
+import os
 from .. import models
 from ..database import database
+from ..utils.cache import StaleWhileRevalidateCache
 
 router = APIRouter(prefix="/api/stats", tags=["statistics"])
 
+# Homepage stats are served from a per-worker cache backed by the platform_counters document
+stats_cache = StaleWhileRevalidateCache(
+    ttl_seconds=float(os.getenv("STATS_CACHE_TTL_SEC", "30")),
+    stale_seconds=float(os.getenv("STATS_CACHE_STALE_SEC", "300"))
+)
+
 @router.get("", response_model=models.StatsResponse)
 @router.get("/", response_model=models.StatsResponse)
 async def get_platform_stats():
     """Get platform statistics"""
     try:
-        stats = await database.get_platform_stats()
+        stats = await stats_cache.get("platform_stats", database.get_platform_stats)
         return models.StatsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -18,7 +26,7 @@ async def get_platform_stats():
 async def get_categories_with_counts():
     """Get all categories with tradesperson counts"""
     try:
-        categories = await database.get_categories_with_counts()
+        categories = await stats_cache.get("categories_with_counts", database.get_categories_with_counts)
         return {"categories": categories}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,14 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
 from typing import List, Optional
 from datetime import datetime
 import base64
-import uuid
-import os
-from PIL import Image
-import io
 
 from ..auth.dependencies import get_current_user, get_current_tradesperson
 from ..database import database
+from ..services.image_pipeline import image_pipeline, PAYMENT_PROOF_RENDITIONS
+from ..services.storage import storage, serve_stored_file
+from ..utils.uploads import ingest_upload
 from ..models.base import (
     Wallet, WalletTransaction, WalletFundingRequest, WalletResponse,
     TransactionType, TransactionStatus, BankDetails
@@ -20,6 +19,8 @@ router = APIRouter(prefix="/api/wallet", tags=["wallet"])
 # Bank details constant
 BANK_DETAILS = BankDetails()
 
+MAX_PROOF_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
+
 @router.get("/balance", response_model=WalletResponse)
 async def get_wallet_balance(current_user: User = Depends(get_current_user)):
     """Get user's wallet balance and recent transactions"""
@@ -57,36 +58,18 @@ async def fund_wallet(
     if not proof_image.content_type.startswith("image/"):
         raise HTTPException(status_code=400, detail="Only image files are allowed")
     
-    # Create uploads directory if it doesn't exist
-    upload_dir = "/app/uploads/payment_proofs"
-    os.makedirs(upload_dir, exist_ok=True)
-    
-    # Generate unique filename
-    file_extension = proof_image.filename.split(".")[-1].lower()
-    filename = f"{current_user.id}_{uuid.uuid4().hex}.{file_extension}"
-    file_path = os.path.join(upload_dir, filename)
-    
-    # Save and optimize image
+    # Stream to disk, then save optimized image (decoded and re-encoded on the image process pool)
+    ingested = await ingest_upload(proof_image, storage.staging_dir, MAX_PROOF_IMAGE_SIZE)
     try:
-        # Read image data
-        image_data = await proof_image.read()
-        
-        # Open and optimize image
-        image = Image.open(io.BytesIO(image_data))
-        
-        # Convert to RGB if necessary
-        if image.mode in ("RGBA", "P"):
-            image = image.convert("RGB")
-        
-        # Resize if too large (max 1024x1024)
-        if image.width > 1024 or image.height > 1024:
-            image.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-        
-        # Save optimized image
-        image.save(file_path, "JPEG", quality=85, optimize=True)
-        
+        processed = await image_pipeline.process_to_storage(
+            ingested.temp_path, "payment_proofs",
+            renditions=PAYMENT_PROOF_RENDITIONS, webp=False
+        )
+        filename = processed["renditions"]["full"]["filename"]
     except Exception as e:
         raise HTTPException(status_code=400, detail="Invalid image file")
+    finally:
+        await ingested.discard()
     
     # Calculate coins
     amount_coins = amount_naira // 100
@@ -161,13 +144,6 @@ async def check_sufficient_balance(
 
 # Serve payment proof images
 @router.get("/payment-proof/{filename}")
-async def serve_payment_proof(filename: str):
+async def serve_payment_proof(filename: str, request: Request):
     """Serve payment proof images"""
-    from fastapi.responses import FileResponse
-    
-    file_path = f"/app/uploads/payment_proofs/{filename}"
-    
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Image not found")
-    
-    return FileResponse(file_path, media_type="image/jpeg")
\ No newline at end of file
+    return await serve_stored_file(request, "payment_proofs", filename, private=True)
@@ -17,6 +17,9 @@ try:
     from .routes.content import router as content_router
     from .routes.public_content import router as public_content_router
     from .routes.jobs_management import router as jobs_management_router
+    from .routes.portfolio import MAX_FILE_SIZE as PORTFOLIO_MAX_FILE_SIZE
+    from .routes.referrals import MAX_DOCUMENT_IMAGE_SIZE
+    from .routes.wallet import MAX_PROOF_IMAGE_SIZE
 except ImportError:
     from database import database
     from routes import jobs, tradespeople, quotes, reviews, stats, auth
@@ -24,16 +27,25 @@ except ImportError:
     from routes.content import router as content_router
     from routes.public_content import router as public_content_router
     from routes.jobs_management import router as jobs_management_router
+    from routes.portfolio import MAX_FILE_SIZE as PORTFOLIO_MAX_FILE_SIZE
+    from routes.referrals import MAX_DOCUMENT_IMAGE_SIZE
+    from routes.wallet import MAX_PROOF_IMAGE_SIZE
 
 # Add database inspection endpoint
 from fastapi import HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 # Import production logging system
 try:
     from .utils.logger import get_logger, log_request
+    from .utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, route_label
+    from .utils.request_context import start_request_stats, end_request_stats
+    from .utils.uploads import UploadLimitMiddleware, media_max_upload_bytes
 except ImportError:
     from utils.logger import get_logger, log_request
+    from utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, route_label
+    from utils.request_context import start_request_stats, end_request_stats
+    from utils.uploads import UploadLimitMiddleware, media_max_upload_bytes
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -60,8 +72,56 @@ async def lifespan(app: FastAPI):
             logger.warning("Database connection unavailable; running in degraded mode")
     except Exception as e:
         logger.error(f"Database connect failed during startup: {e}")
+    try:
+        from .utils.health_monitor import health_monitor
+        from .utils.metrics import register_system_collector
+        health_monitor.sampler.start()
+        register_system_collector(health_monitor.sampler, health_monitor.start_time)
+    except Exception as e:
+        logger.error(f"Failed to start system metrics sampler: {e}")
+    try:
+        if getattr(database, 'connected', False):
+            from .utils.realtime import realtime_bus
+            await realtime_bus.start(database.database)
+    except Exception as e:
+        logger.error(f"Failed to start realtime bus bridge: {e}")
+    embedded_dispatcher = None
+    try:
+        from .services.notification_outbox import start_embedded_dispatcher
+        embedded_dispatcher = start_embedded_dispatcher()
+    except Exception as e:
+        logger.error(f"Failed to start embedded notification dispatcher: {e}")
     yield
     # Shutdown
+    if embedded_dispatcher:
+        dispatcher, task = embedded_dispatcher
+        dispatcher.stop()
+        await task
+    try:
+        from .utils.realtime import realtime_bus
+        await realtime_bus.stop()
+    except Exception as e:
+        logger.error(f"Error stopping realtime bus: {e}")
+    try:
+        from .utils.health_monitor import health_monitor
+        await health_monitor.sampler.stop()
+    except Exception as e:
+        logger.error(f"Error stopping system metrics sampler: {e}")
+    try:
+        from .auth.security import password_hasher
+        password_hasher.shutdown()
+    except Exception as e:
+        logger.error(f"Error shutting down password hashing pool: {e}")
+    try:
+        from .services.image_pipeline import image_pipeline
+        image_pipeline.shutdown()
+    except Exception as e:
+        logger.error(f"Error shutting down image processing pool: {e}")
+    try:
+        from .services.notifications import notification_service
+        await notification_service.aclose()
+    except Exception as e:
+        logger.error(f"Error closing notification transports: {e}")
     try:
         await database.close_mongo_connection()
         logger.info("MongoDB connection closed")
@@ -86,7 +146,19 @@ async def log_requests(request: Request, call_next):
         # For now, we'll just log that authentication was present
         pass
     
-    response = await call_next(request)
+    status_code = 500
+    HTTP_REQUESTS_IN_FLIGHT.inc()
+    # Mongo commands issued while handling this request are counted into db_stats
+    db_stats, db_stats_token = start_request_stats()
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        end_request_stats(db_stats_token)
+        HTTP_REQUESTS_IN_FLIGHT.dec()
+        HTTP_REQUEST_DURATION.labels(
+            request.method, route_label(request.scope), str(status_code)
+        ).observe(time.time() - start_time)
     
     # Calculate request duration
     duration = (time.time() - start_time) * 1000  # Convert to milliseconds
@@ -98,14 +170,30 @@ async def log_requests(request: Request, call_next):
         status_code=response.status_code,
         duration=duration,
         user_id=user_id,
-        request_id=request_id
+        request_id=request_id,
+        db_commands=db_stats.db_commands,
+        db_time_ms=round(db_stats.db_time_ms, 2)
     )
+    response.headers["Server-Timing"] = db_stats.server_timing()
     
     return response
 
 # Create a router without prefix for health endpoints
 api_router = APIRouter()
 
+# Reject oversized uploads before Starlette spools the multipart body to disk
+# (added before CORS so 413 responses still carry CORS headers)
+app.add_middleware(
+    UploadLimitMiddleware,
+    limits={
+        "/api/wallet/fund": MAX_PROOF_IMAGE_SIZE,
+        "/api/referrals/verify-documents": MAX_DOCUMENT_IMAGE_SIZE,
+        "/api/portfolio/upload": PORTFOLIO_MAX_FILE_SIZE,
+        "/api/admin/content/media/upload": media_max_upload_bytes(),
+    },
+    default_max_bytes=media_max_upload_bytes(),
+)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -153,47 +241,17 @@ async def health_history():
     from .utils.health_monitor import health_monitor
     try:
         history = health_monitor.get_health_history()
-        return {"history": history, "count": len(history)}
+        return {"history": history, "count": len(history), "summary": health_monitor.get_health_summary()}
     except Exception as e:
         logger.error("Health history retrieval failed", extra={"error": str(e)})
         raise HTTPException(status_code=500, detail="Health history retrieval failed")
 
 @api_router.get("/api/metrics")
 async def get_metrics():
-    """Get system metrics in Prometheus-compatible format."""
-    from utils.health_monitor import health_monitor
-    try:
-        health_data = await health_monitor.get_system_health()
-        
-        # Convert to Prometheus-style metrics
-        metrics = []
-        
-        # System metrics
-        if "system" in health_data:
-            system = health_data["system"]
-            if "cpu" in system:
-                metrics.append(f"servicehub_cpu_usage_percent {system['cpu'].get('usage_percent', 0)}")
-            if "memory" in system:
-                metrics.append(f"servicehub_memory_usage_percent {system['memory'].get('usage_percent', 0)}")
-                metrics.append(f"servicehub_memory_total_bytes {system['memory'].get('total_gb', 0) * 1024**3}")
-            if "disk" in system:
-                metrics.append(f"servicehub_disk_usage_percent {system['disk'].get('usage_percent', 0)}")
-        
-        # Database metrics
-        if "database" in health_data and health_data["database"].get("status") == "healthy":
-            db = health_data["database"]
-            metrics.append(f"servicehub_database_connection_time_ms {db.get('connection_time_ms', 0)}")
-            metrics.append(f"servicehub_database_size_bytes {db.get('database_size_mb', 0) * 1024**2}")
-        
-        # Uptime
-        if "uptime" in health_data:
-            metrics.append(f"servicehub_uptime_seconds {health_data['uptime'].get('seconds', 0)}")
-        
-        return {"metrics": metrics, "format": "prometheus"}
-        
-    except Exception as e:
-        logger.error("Metrics retrieval failed", extra={"error": str(e)})
-        raise HTTPException(status_code=500, detail="Metrics retrieval failed")
+    """Prometheus text exposition; served from in-process counters, no database access."""
+    from .utils.metrics import render_metrics
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 @api_router.get("/api/database-info")
 async def get_database_info():
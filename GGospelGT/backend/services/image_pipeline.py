@@ -0,0 +1,168 @@
+"""
+Image processing pipeline for uploaded photos.
+
+Decoding, LANCZOS resampling and JPEG/WebP encoding are CPU-bound and hold the
+GIL, so they run in a process pool. Each upload produces a set of renditions
+written straight to disk by the worker; only small metadata dicts cross the
+process boundary. process_to_storage then files each rendition under its
+content hash in the configured storage backend.
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# name -> (max_width, max_height)
+PORTFOLIO_RENDITIONS: Dict[str, Tuple[int, int]] = {
+    "thumb": (400, 400),
+    "medium": (800, 800),
+    "full": (1200, 1200),
+}
+PAYMENT_PROOF_RENDITIONS: Dict[str, Tuple[int, int]] = {
+    "full": (1024, 1024),
+}
+VERIFICATION_DOCUMENT_RENDITIONS: Dict[str, Tuple[int, int]] = {
+    "full": (1920, 1920),
+}
+
+JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "85"))
+WEBP_QUALITY = int(os.getenv("IMAGE_WEBP_QUALITY", "80"))
+
+
+def rendition_filename(base_name: str, rendition: str, fmt: str) -> str:
+    """File name for one rendition; the full JPEG keeps the bare base name."""
+    suffix = "" if rendition == "full" else f"_{rendition}"
+    return f"{base_name}{suffix}.{'webp' if fmt == 'webp' else 'jpg'}"
+
+
+def _render_to_disk(source: Union[bytes, str], output_dir: str, base_name: str,
+                    renditions: Dict[str, Tuple[int, int]], webp: bool, jpeg_quality: int) -> Dict[str, Any]:
+    """Decode once, then resize and encode every rendition (runs in a worker process)."""
+    from PIL import Image, ImageOps
+
+    try:
+        image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+        image = ImageOps.exif_transpose(image)
+    except Exception as e:
+        raise ValueError(f"Invalid image file: {e}")
+
+    # Flatten transparency onto white; JPEG has no alpha channel
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[-1])
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    result: Dict[str, Any] = {"width": image.width, "height": image.height, "renditions": {}}
+    output = Path(output_dir)
+    written = []
+    try:
+        # Largest first, so each smaller rendition resamples from the previous one
+        for name, (max_width, max_height) in sorted(renditions.items(), key=lambda r: -r[1][0] * r[1][1]):
+            if image.width > max_width or image.height > max_height:
+                image = image.copy()
+                image.thumbnail((max_width, max_height), Image.Resampling.LANCZOS)
+
+            info = {"width": image.width, "height": image.height}
+            jpeg_name = rendition_filename(base_name, name, "jpeg")
+            image.save(output / jpeg_name, format="JPEG", quality=jpeg_quality, optimize=True, progressive=True)
+            written.append(jpeg_name)
+            info["filename"] = jpeg_name
+            info["bytes"] = (output / jpeg_name).stat().st_size
+            info["sha256"] = hashlib.sha256((output / jpeg_name).read_bytes()).hexdigest()
+
+            if webp:
+                webp_name = rendition_filename(base_name, name, "webp")
+                image.save(output / webp_name, format="WEBP", quality=WEBP_QUALITY, method=4)
+                written.append(webp_name)
+                info["webp_filename"] = webp_name
+                info["webp_bytes"] = (output / webp_name).stat().st_size
+                info["webp_sha256"] = hashlib.sha256((output / webp_name).read_bytes()).hexdigest()
+
+            result["renditions"][name] = info
+    except Exception:
+        for filename in written:
+            (output / filename).unlink(missing_ok=True)
+        raise
+    return result
+
+
+class ImagePipeline:
+    """Runs image renditions on a process pool (IMAGE_PROCESS_WORKERS; 0 uses threads)."""
+
+    def __init__(self):
+        self.max_workers = int(os.getenv("IMAGE_PROCESS_WORKERS", str(min(2, os.cpu_count() or 1))))
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            # Spawned, not forked: the API process has live threads, locks and Mongo sockets
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def process(self, source: Union[bytes, str, Path], output_dir: Path, base_name: str,
+                      renditions: Dict[str, Tuple[int, int]] = PORTFOLIO_RENDITIONS,
+                      webp: bool = True, jpeg_quality: int = JPEG_QUALITY) -> Dict[str, Any]:
+        """Write all renditions of ``source`` (raw bytes or a file path) to ``output_dir``.
+
+        Passing a path lets the worker process read the file itself, so the
+        image never has to be held in the API process.
+
+        Returns the original dimensions plus, per rendition, the file names,
+        dimensions and byte sizes. Raises ValueError for undecodable images.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), _render_to_disk,
+            source if isinstance(source, bytes) else str(source),
+            str(output_dir), base_name, renditions, webp, jpeg_quality
+        )
+
+    async def process_to_storage(self, source: Union[bytes, str, Path], namespace: str,
+                                 renditions: Dict[str, Tuple[int, int]] = PORTFOLIO_RENDITIONS,
+                                 webp: bool = True, jpeg_quality: int = JPEG_QUALITY) -> Dict[str, Any]:
+        """Render into a scratch directory, then store each file under its content hash.
+
+        Same result shape as ``process``; ``filename``/``webp_filename`` are the
+        content-addressed names (``<sha256>.jpg``/``.webp``) within ``namespace``.
+        """
+        from .storage import storage, store_file
+
+        storage.staging_dir.mkdir(parents=True, exist_ok=True)
+        work_dir = Path(tempfile.mkdtemp(prefix="renditions-", dir=storage.staging_dir))
+        try:
+            processed = await self.process(source, work_dir, "rendition", renditions, webp, jpeg_quality)
+            for info in processed["renditions"].values():
+                info["filename"] = await store_file(work_dir / info["filename"], namespace, "jpg", info.pop("sha256"))
+                if "webp_filename" in info:
+                    info["webp_filename"] = await store_file(
+                        work_dir / info["webp_filename"], namespace, "webp", info.pop("webp_sha256")
+                    )
+            return processed
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, shutil.rmtree, work_dir, True)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+# Global pipeline instance shared by the upload routes
+image_pipeline = ImagePipeline()
@@ -0,0 +1,161 @@
+"""
+Notification outbox dispatcher.
+
+The API only inserts PENDING notifications; this worker claims due batches
+atomically, delivers them through NotificationService, and finalizes each
+record (SENT, or retried with exponential backoff until FAILED).
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..database import database
+from ..models.notifications import Notification, NotificationStatus
+from ..utils.metrics import NOTIFICATION_OUTBOX_RESULTS
+from .notifications import notification_service
+
+logger = logging.getLogger("notifications")
+
+
+class NotificationDispatcher:
+    """Polls the notifications outbox and delivers claimed batches"""
+
+    def __init__(self):
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.batch_size = int(os.getenv("NOTIFICATION_OUTBOX_BATCH_SIZE", "50"))
+        self.poll_interval = float(os.getenv("NOTIFICATION_OUTBOX_POLL_SEC", "2"))
+        self.lease_seconds = int(os.getenv("NOTIFICATION_OUTBOX_LEASE_SEC", "120"))
+        self.max_attempts = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+        self.backoff_base = float(os.getenv("NOTIFICATION_BACKOFF_BASE_SEC", "30"))
+        self.backoff_max = float(os.getenv("NOTIFICATION_BACKOFF_MAX_SEC", "3600"))
+        self.concurrency = int(os.getenv("NOTIFICATION_OUTBOX_CONCURRENCY", "10"))
+        self._stopping = asyncio.Event()
+
+    def _backoff(self, attempts: int) -> timedelta:
+        return timedelta(seconds=min(self.backoff_base * (2 ** (attempts - 1)), self.backoff_max))
+
+    @staticmethod
+    def _resolved_fields(notification: Notification) -> dict:
+        """Recipient details filled in by resolve_recipients, persisted once final"""
+        return {
+            "channel": notification.channel,
+            "recipient_email": notification.recipient_email,
+            "recipient_phone": notification.recipient_phone,
+            "metadata": notification.metadata,
+            "resolve_recipient": notification.resolve_recipient
+        }
+
+    async def _process(self, notification: Notification, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            if notification.status == NotificationStatus.FAILED:
+                # Rejected while resolving the recipient; retrying cannot help
+                logger.error(f"❌ Notification {notification.id} rejected: {notification.last_error}")
+                await database.update_notification_status(
+                    notification.id, NotificationStatus.FAILED,
+                    extra_fields={"last_error": notification.last_error, **self._resolved_fields(notification)}
+                )
+                NOTIFICATION_OUTBOX_RESULTS.labels("failed").inc()
+                return
+
+            delivered = await notification_service.deliver_notification(notification)
+            attempts = notification.attempts + 1
+
+            if delivered:
+                await database.update_notification_status(
+                    notification.id, NotificationStatus.SENT,
+                    sent_at=notification.sent_at,
+                    extra_fields={
+                        "attempts": attempts,
+                        "subject": notification.subject,
+                        "content": notification.content,
+                        "delivered_channels": notification.delivered_channels,
+                        "last_error": None,
+                        **self._resolved_fields(notification)
+                    }
+                )
+                NOTIFICATION_OUTBOX_RESULTS.labels("sent").inc()
+            elif attempts >= self.max_attempts or notification.status == NotificationStatus.FAILED:
+                # Out of attempts, or a permanent failure (e.g. no recipient email) that retrying cannot fix
+                logger.error(f"❌ Notification {notification.id} failed after {attempts} attempts")
+                await database.update_notification_status(
+                    notification.id, NotificationStatus.FAILED,
+                    extra_fields={
+                        "attempts": attempts,
+                        "delivered_channels": notification.delivered_channels,
+                        "last_error": notification.last_error,
+                        **self._resolved_fields(notification)
+                    }
+                )
+                NOTIFICATION_OUTBOX_RESULTS.labels("failed").inc()
+            else:
+                await database.schedule_notification_retry(
+                    notification.id,
+                    attempts=attempts,
+                    next_attempt_at=datetime.utcnow() + self._backoff(attempts),
+                    error=notification.last_error or "unknown error",
+                    delivered_channels=notification.delivered_channels
+                )
+                NOTIFICATION_OUTBOX_RESULTS.labels("retried").inc()
+
+    async def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of notifications processed"""
+        batch = await database.claim_pending_notifications(
+            self.worker_id, batch_size=self.batch_size, lease_seconds=self.lease_seconds
+        )
+        if not batch:
+            return 0
+
+        notifications = []
+        for doc in batch:
+            doc.setdefault("id", doc.get("_id"))
+            notifications.append(Notification(**doc))
+        # Queued notifications carry only a user id; resolve the whole batch at once
+        await notification_service.resolve_recipients(notifications)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *(self._process(notification, semaphore) for notification in notifications), return_exceptions=True
+        )
+        for doc, result in zip(batch, results):
+            if isinstance(result, Exception):
+                # Left claimed; the lease expires and another pass retries it
+                logger.error(f"❌ Outbox processing error for {doc.get('_id')}: {result}")
+        return len(batch)
+
+    async def run(self):
+        """Poll until stop() is called; full batches are followed immediately by the next claim"""
+        logger.info(f"📤 Notification dispatcher {self.worker_id} started")
+        while not self._stopping.is_set():
+            try:
+                processed = await self.run_once()
+            except Exception as e:
+                logger.error(f"❌ Notification dispatcher error: {e}")
+                processed = 0
+
+            if processed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info(f"📤 Notification dispatcher {self.worker_id} stopped")
+
+    def stop(self):
+        self._stopping.set()
+
+
+def start_embedded_dispatcher() -> Optional[tuple]:
+    """Run the dispatcher inside the API process when NOTIFICATION_OUTBOX_EMBEDDED is true.
+
+    Development opt-in only: deployments deliver through ``python -m
+    backend.notification_worker`` (the docker-compose notification-worker service)
+    so delivery does not compete with request handling in every API worker.
+    """
+    if os.getenv("NOTIFICATION_OUTBOX_EMBEDDED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    dispatcher = NotificationDispatcher()
+    return dispatcher, asyncio.create_task(dispatcher.run())
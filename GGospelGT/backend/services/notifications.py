@@ -1,5 +1,6 @@
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 import uuid
 import json
@@ -10,14 +11,16 @@ from ..models.notifications import (
 )
 
 # Third-party imports for real services
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail
-import requests
+from sendgrid.helpers.mail import Mail, CustomArg
+from .transports import ProviderTransport, get_delivery_metrics
 
 # Configure logging for notifications
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("notifications")
 
+class PermanentDeliveryError(ValueError):
+    """Delivery can never succeed for this notification (no contact detail, template or variable)"""
+
 class MockEmailService:
     """Mock email service for development/testing"""
     
@@ -50,12 +53,19 @@ class SendGridEmailService:
         self.service_name = "SendGridEmailService"
         self.api_key = os.environ.get('SENDGRID_API_KEY')
         self.sender_email = os.environ.get('SENDER_EMAIL')
+        self.base_url = os.environ.get('SENDGRID_BASE_URL', 'https://api.sendgrid.com')
         
         if not self.api_key or not self.sender_email:
             logger.error("❌ SendGrid configuration missing: SENDGRID_API_KEY or SENDER_EMAIL")
             raise ValueError("Missing SendGrid configuration")
         
-        self.client = SendGridAPIClient(api_key=self.api_key)
+        # Async pooled transport instead of the blocking SendGridAPIClient
+        self.transport = ProviderTransport(
+            name="sendgrid",
+            channel="email",
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
         logger.info(f"🔧 {self.service_name} initialized - Production Mode")
     
     async def send_email(self, to: str, subject: str, content: str, metadata: Dict[str, Any] = None) -> bool:
@@ -71,22 +81,27 @@ class SendGridEmailService:
             # Add metadata as custom args if provided
             if metadata:
                 for key, value in metadata.items():
-                    message.custom_arg = {key: str(value)}
+                    message.custom_arg = CustomArg(key, str(value))
             
-            response = self.client.send(message)
+            response = await self.transport.post_json("/v3/mail/send", message.get())
+            if response is None:
+                return False
             
             # SendGrid returns 202 for successful queuing
             if response.status_code in [200, 202]:
                 logger.info(f"📧 EMAIL SENT: to={to}, subject={subject[:50]}...")
                 return True
             else:
-                logger.error(f"❌ SendGrid failed: {response.status_code} - {response.body}")
+                logger.error(f"❌ SendGrid failed: {response.status_code} - {response.text}")
                 return False
                 
         except Exception as e:
             logger.error(f"❌ Email sending failed: {str(e)}")
             return False
 
+    async def aclose(self):
+        await self.transport.aclose()
+
 class TermiiSMSService:
     """Real Termii SMS service for Nigerian market"""
     
@@ -99,9 +114,20 @@ class TermiiSMSService:
         if not self.api_key or not self.sender_id:
             logger.error("❌ Termii configuration missing: TERMII_API_KEY or TERMII_SENDER_ID")
             raise ValueError("Missing Termii configuration")
-            
+        
+        self.transport = ProviderTransport(name="termii", channel="sms", base_url=self.base_url)
         logger.info(f"🔧 {self.service_name} initialized - Production Mode")
     
+    @staticmethod
+    def _is_accepted(response) -> bool:
+        """Termii reports failures inside a 200 body"""
+        if response.status_code != 200:
+            return False
+        try:
+            return response.json().get('code') == 'ok'
+        except ValueError:
+            return False
+    
     async def send_sms(self, to: str, message: str, metadata: Dict[str, Any] = None) -> bool:
         """Send real SMS using Termii API"""
         try:
@@ -118,12 +144,10 @@ class TermiiSMSService:
                 "channel": "generic"
             }
             
-            # Send request to Termii API
-            response = requests.post(
-                f"{self.base_url}/api/sms/send",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+            # Send request to Termii API (pooled client with timeouts and a concurrency bound)
+            response = await self.transport.post_json("/api/sms/send", payload, is_success=self._is_accepted)
+            if response is None:
+                return False
             
             if response.status_code == 200:
                 response_data = response.json()
@@ -141,6 +165,9 @@ class TermiiSMSService:
             logger.error(f"❌ SMS sending failed: {str(e)}")
             return False
     
+    async def aclose(self):
+        await self.transport.aclose()
+    
     def _format_nigerian_phone(self, phone: str) -> str:
         """Format phone number for Nigerian market"""
         # Remove any spaces or special characters
@@ -739,7 +766,7 @@ serviceHub Team
             return subject, content
         except KeyError as e:
             logger.error(f"❌ Template rendering failed - missing variable: {e}")
-            raise ValueError(f"Missing template variable: {e}")
+            raise PermanentDeliveryError(f"Missing template variable: {e}")
 
 class NotificationService:
     """Main notification service orchestrating email and SMS delivery"""
@@ -770,7 +797,17 @@ class NotificationService:
                 # Fall back to mock for development
                 self.sms_service = MockSMSService()
     
-    async def send_notification(
+    def get_delivery_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-channel delivery latency and error counters"""
+        return get_delivery_metrics()
+    
+    async def aclose(self):
+        """Close pooled provider connections (called on application shutdown)"""
+        for service in (self.email_service, self.sms_service):
+            if service is not None and hasattr(service, "aclose"):
+                await service.aclose()
+    
+    def _build_notification(
         self,
         user_id: str,
         notification_type: NotificationType,
@@ -779,12 +816,10 @@ class NotificationService:
         recipient_email: Optional[str] = None,
         recipient_phone: Optional[str] = None
     ) -> Notification:
-        """Send notification based on user preferences"""
-        
+        """Create a PENDING notification record, rendered and ready for the outbox"""
         # Get user's preferred channel for this notification type
         channel = getattr(user_preferences, notification_type.value, NotificationChannel.EMAIL)
         
-        # Create notification record
         notification = Notification(
             id=str(uuid.uuid4()),
             user_id=user_id,
@@ -794,39 +829,239 @@ class NotificationService:
             recipient_phone=recipient_phone,
             subject="",  # Will be filled by template
             content="",  # Will be filled by template
-            metadata=template_data
+            metadata=template_data,
+            next_attempt_at=datetime.utcnow()
         )
         
         try:
-            # Send based on channel preference
-            if channel in [NotificationChannel.EMAIL, NotificationChannel.BOTH]:
-                await self._send_email_notification(notification, template_data)
+            # Render up front so bad template data fails fast instead of retrying in the worker
+            self.render_notification(notification)
+        except Exception as e:
+            notification.status = NotificationStatus.FAILED
+            notification.last_error = str(e)
+            logger.error(f"❌ Notification rejected: {notification.id} - {str(e)}")
+        
+        return notification
+    
+    async def _deliver_inline(self, notification: Notification):
+        if notification.status == NotificationStatus.PENDING and not await self.deliver_notification(notification):
+            notification.status = NotificationStatus.FAILED
+    
+    async def send_notification(
+        self,
+        user_id: str,
+        notification_type: NotificationType,
+        template_data: Dict[str, Any],
+        user_preferences: NotificationPreferences,
+        recipient_email: Optional[str] = None,
+        recipient_phone: Optional[str] = None
+    ) -> Notification:
+        """Queue a notification based on user preferences.
+
+        The record is inserted into the notifications outbox as PENDING and
+        delivered by the dispatcher worker (see services/notification_outbox.py).
+        Falls back to inline delivery when the database is unavailable.
+        """
+        from ..database import database
+        
+        notification = self._build_notification(
+            user_id, notification_type, template_data, user_preferences, recipient_email, recipient_phone
+        )
+        
+        if not getattr(database, 'connected', False):
+            await self._deliver_inline(notification)
+            return notification
+        
+        await database.create_notification(notification)
+        if notification.status == NotificationStatus.PENDING:
+            logger.info(f"📥 Notification queued: {notification.id}")
+        return notification
+    
+    async def queue_notification(
+        self,
+        user_id: str,
+        notification_type: NotificationType,
+        template_data: Dict[str, Any]
+    ) -> Optional[Notification]:
+        """Queue a notification whose recipient is resolved by the dispatcher.
+
+        The caller skips the user and preference lookups; the dispatcher
+        resolves whole claimed batches at once (see resolve_recipients).
+        Returns None when the database is unavailable.
+        """
+        from ..database import database
+        
+        if not getattr(database, 'connected', False):
+            logger.warning(f"⚠️ Notification for {user_id} dropped: database unavailable")
+            return None
+        
+        notification = Notification(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            type=notification_type,
+            channel=NotificationChannel.EMAIL,  # Replaced from preferences on resolution
+            subject="",
+            content="",
+            metadata=template_data,
+            next_attempt_at=datetime.utcnow(),
+            resolve_recipient=True
+        )
+        await database.create_notification(notification)
+        logger.info(f"📥 Notification queued: {notification.id}")
+        return notification
+    
+    async def resolve_recipients(self, notifications: List[Notification]):
+        """Fill contact details, channel and recipient name for queued notifications.
+
+        One users query and one preferences query per batch; notifications that
+        cannot be resolved or rendered are marked FAILED.
+        """
+        from ..database import database
+        
+        pending = [n for n in notifications if n.resolve_recipient]
+        if not pending:
+            return
+        user_ids = [n.user_id for n in pending]
+        users = await database.get_users_contact_details(user_ids)
+        preferences_by_user = await database.get_notification_preferences_for_users(user_ids)
+        
+        for notification in pending:
+            user = users.get(notification.user_id)
+            if user is None:
+                notification.status = NotificationStatus.FAILED
+                notification.last_error = "Recipient not found"
+                continue
+            notification.recipient_email = user.get("email")
+            notification.recipient_phone = user.get("phone")
+            notification.channel = getattr(
+                preferences_by_user[notification.user_id], notification.type.value, NotificationChannel.EMAIL
+            )
+            notification.metadata.setdefault(
+                "recipient_name", user.get("name") or user.get("business_name") or "User"
+            )
+            try:
+                self.render_notification(notification)
+                notification.resolve_recipient = False
+            except Exception as e:
+                notification.status = NotificationStatus.FAILED
+                notification.last_error = str(e)
+    
+    async def send_bulk_notifications(
+        self,
+        notification_type: NotificationType,
+        recipients: List[Dict[str, Any]]
+    ) -> List[Notification]:
+        """Fan one notification type out to many users.
+
+        Each recipient dict carries ``user_id``, ``template_data`` and optional
+        ``recipient_email``/``recipient_phone``. Preferences are loaded with one
+        ``$in`` query and the records are queued with one ``insert_many``. When
+        the database is unavailable, default preferences are used and delivery
+        happens inline, concurrently, bounded by NOTIFICATION_FANOUT_CONCURRENCY.
+        """
+        from ..database import database
+        
+        recipients = [r for r in recipients if r.get("user_id")]
+        if not recipients:
+            return []
+        
+        connected = getattr(database, 'connected', False)
+        if connected:
+            preferences_by_user = await database.get_notification_preferences_for_users(
+                [r["user_id"] for r in recipients]
+            )
+        else:
+            preferences_by_user = {
+                r["user_id"]: NotificationPreferences(id=str(uuid.uuid4()), user_id=r["user_id"])
+                for r in recipients
+            }
+        notifications = [
+            self._build_notification(
+                recipient["user_id"],
+                notification_type,
+                recipient.get("template_data", {}),
+                preferences_by_user[recipient["user_id"]],
+                recipient.get("recipient_email"),
+                recipient.get("recipient_phone")
+            )
+            for recipient in recipients
+        ]
+        
+        if not connected:
+            semaphore = asyncio.Semaphore(int(os.getenv("NOTIFICATION_FANOUT_CONCURRENCY", "10")))
+            
+            async def deliver(notification: Notification):
+                async with semaphore:
+                    await self._deliver_inline(notification)
             
-            if channel in [NotificationChannel.SMS, NotificationChannel.BOTH]:
-                await self._send_sms_notification(notification, template_data)
+            await asyncio.gather(*(deliver(notification) for notification in notifications))
+            return notifications
+        
+        await database.create_notifications(notifications)
+        queued = sum(1 for n in notifications if n.status == NotificationStatus.PENDING)
+        logger.info(f"📥 Queued {queued}/{len(notifications)} {notification_type.value} notifications")
+        return notifications
+    
+    def _get_channels(self, notification: Notification) -> List[NotificationChannel]:
+        if notification.channel == NotificationChannel.BOTH:
+            return [NotificationChannel.EMAIL, NotificationChannel.SMS]
+        return [notification.channel]
+    
+    def render_notification(self, notification: Notification):
+        """Fill subject/content from the templates for each of the notification's channels"""
+        for channel in self._get_channels(notification):
+            template = self.template_service.get_template(notification.type, channel)
+            if not template:
+                raise ValueError(f"No {channel.value} template found for {notification.type}")
+            subject, content = self.template_service.render_template(template, notification.metadata)
+            notification.subject = subject
+            notification.content = content
+    
+    async def deliver_notification(self, notification: Notification) -> bool:
+        """Deliver a notification on every channel not yet in ``delivered_channels``.
+
+        Channels that succeed are appended to ``delivered_channels`` so a retry
+        never re-sends them. Returns True once all channels are delivered; a
+        permanent failure also sets ``status`` to FAILED so it is not retried.
+        """
+        try:
+            for channel in self._get_channels(notification):
+                if channel.value in notification.delivered_channels:
+                    continue
+                if channel == NotificationChannel.EMAIL:
+                    await self._send_email_notification(notification, notification.metadata)
+                else:
+                    await self._send_sms_notification(notification, notification.metadata)
+                notification.delivered_channels.append(channel.value)
             
             notification.status = NotificationStatus.SENT
             notification.sent_at = datetime.now(timezone.utc)
+            notification.last_error = None
             
             logger.info(f"✅ Notification sent successfully: {notification.id}")
+            return True
             
-        except Exception as e:
+        except PermanentDeliveryError as e:
             notification.status = NotificationStatus.FAILED
-            logger.error(f"❌ Notification failed: {notification.id} - {str(e)}")
-        
-        return notification
+            notification.last_error = str(e)
+            logger.error(f"❌ Notification cannot be delivered: {notification.id} - {str(e)}")
+            return False
+        except Exception as e:
+            notification.last_error = str(e)
+            logger.error(f"❌ Notification delivery failed: {notification.id} - {str(e)}")
+            return False
     
     async def _send_email_notification(self, notification: Notification, template_data: Dict[str, Any]):
         """Send email notification"""
         if not notification.recipient_email:
-            raise ValueError("No recipient email provided")
+            raise PermanentDeliveryError("No recipient email provided")
         
         # Ensure services are initialized
         self._ensure_services_initialized()
         
         template = self.template_service.get_template(notification.type, NotificationChannel.EMAIL)
         if not template:
-            raise ValueError(f"No email template found for {notification.type}")
+            raise PermanentDeliveryError(f"No email template found for {notification.type}")
         
         subject, content = self.template_service.render_template(template, template_data)
         notification.subject = subject
@@ -845,14 +1080,14 @@ class NotificationService:
     async def _send_sms_notification(self, notification: Notification, template_data: Dict[str, Any]):
         """Send SMS notification"""
         if not notification.recipient_phone:
-            raise ValueError("No recipient phone provided")
+            raise PermanentDeliveryError("No recipient phone provided")
         
         # Ensure services are initialized
         self._ensure_services_initialized()
         
         template = self.template_service.get_template(notification.type, NotificationChannel.SMS)
         if not template:
-            raise ValueError(f"No SMS template found for {notification.type}")
+            raise PermanentDeliveryError(f"No SMS template found for {notification.type}")
         
         subject, content = self.template_service.render_template(template, template_data)
         notification.subject = subject
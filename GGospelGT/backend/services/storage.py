@@ -0,0 +1,269 @@
+"""
+Upload storage backends and HTTP file serving.
+
+Uploaded files are stored under content-addressed keys (``<namespace>/<sha256>.<ext>``),
+so identical uploads are stored once and a key's bytes never change. That lets
+responses carry a strong ETag equal to the hash and be cached as ``immutable``.
+
+Backends:
+- local (default): files under LOCAL_STORAGE_ROOT (default /app/uploads)
+- s3: any S3-compatible service via boto3 (S3_BUCKET, S3_PREFIX, S3_ENDPOINT_URL;
+  point S3_ENDPOINT_URL at MinIO/localstack to run against a local stand-in)
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 256 * 1024
+CONTENT_HASH_NAME = re.compile(r"^[0-9a-f]{64}\.[a-z0-9]+$")
+MEDIA_TYPES = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".pdf": "application/pdf",
+}
+
+
+class StoredObject:
+    """Size and validator for one stored object"""
+
+    def __init__(self, key: str, size: int, etag: str, content_addressed: bool):
+        self.key = key
+        self.size = size
+        self.etag = etag
+        self.content_addressed = content_addressed
+
+
+def content_key(namespace: str, sha256: str, extension: str) -> str:
+    """Content-addressed storage key, e.g. ``portfolio/<sha256>.jpg``"""
+    return f"{namespace}/{sha256}.{extension.lstrip('.').lower()}"
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _object_etag(key: str, size: int, mtime: float) -> Tuple[str, bool]:
+    """Strong ETag for content-addressed names; size/mtime validator for legacy uploads"""
+    name = key.rsplit("/", 1)[-1]
+    if CONTENT_HASH_NAME.match(name):
+        return f'"{name.split(".", 1)[0]}"', True
+    return f'"{size:x}-{int(mtime):x}"', False
+
+
+class LocalStorageBackend:
+    """Stores objects as files below a root directory"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.staging_dir = self.root / ".incoming"
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise HTTPException(status_code=404, detail="File not found")
+        return path
+
+    async def put_file(self, local_path: Path, key: str) -> bool:
+        """Move a local file into storage; returns False if the key already existed (deduplicated)"""
+        def _put() -> bool:
+            target = self._path(key)
+            if target.exists():
+                Path(local_path).unlink(missing_ok=True)
+                return False
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(str(local_path), str(target))
+            return True
+        return await run_in_threadpool(_put)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        def _stat() -> Optional[StoredObject]:
+            path = self._path(key)
+            if not path.is_file():
+                return None
+            st = path.stat()
+            etag, content_addressed = _object_etag(key, st.st_size, st.st_mtime)
+            return StoredObject(key, st.st_size, etag, content_addressed)
+        return await run_in_threadpool(_stat)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """Yield bytes ``start``..``end`` (inclusive) in chunks"""
+        f = await run_in_threadpool(open, self._path(key), "rb")
+        try:
+            await run_in_threadpool(f.seek, start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await run_in_threadpool(f.read, min(STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await run_in_threadpool(f.close)
+
+    async def delete(self, key: str):
+        await run_in_threadpool(self._path(key).unlink, True)
+
+
+class S3StorageBackend:
+    """Stores objects in an S3-compatible bucket through boto3"""
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        import boto3
+
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.staging_dir = Path(tempfile.gettempdir()) / "servicehub-uploads"
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    async def _head(self, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError
+
+        try:
+            return await run_in_threadpool(self.client.head_object, Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def put_file(self, local_path: Path, key: str) -> bool:
+        try:
+            if await self._head(key) is not None:
+                return False
+            content_type = MEDIA_TYPES.get(Path(key).suffix, "application/octet-stream")
+            await run_in_threadpool(
+                self.client.upload_file, str(local_path), self.bucket, self._key(key),
+                ExtraArgs={"ContentType": content_type}
+            )
+            return True
+        finally:
+            Path(local_path).unlink(missing_ok=True)
+
+    async def stat(self, key: str) -> Optional[StoredObject]:
+        head = await self._head(key)
+        if head is None:
+            return None
+        etag, content_addressed = _object_etag(key, head["ContentLength"], head["LastModified"].timestamp())
+        return StoredObject(key, head["ContentLength"], etag, content_addressed)
+
+    async def iter_range(self, key: str, start: int, end: int) -> AsyncIterator[bytes]:
+        response = await run_in_threadpool(
+            self.client.get_object, Bucket=self.bucket, Key=self._key(key), Range=f"bytes={start}-{end}"
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await run_in_threadpool(body.read, STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str):
+        await run_in_threadpool(self.client.delete_object, Bucket=self.bucket, Key=self._key(key))
+
+
+def _create_storage():
+    backend = os.getenv("STORAGE_BACKEND", "local").lower()
+    if backend == "s3":
+        return S3StorageBackend(
+            bucket=os.environ["S3_BUCKET"],
+            prefix=os.getenv("S3_PREFIX", "uploads"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL")
+        )
+    return LocalStorageBackend(os.getenv("LOCAL_STORAGE_ROOT", "/app/uploads"))
+
+
+# Global storage backend shared by the upload routes
+storage = _create_storage()
+
+
+async def store_file(local_path: Path, namespace: str, extension: str, sha256: Optional[str] = None) -> str:
+    """Store a local file under its content hash; returns the file name (``<sha256>.<ext>``)"""
+    if sha256 is None:
+        sha256 = await run_in_threadpool(file_sha256, Path(local_path))
+    key = content_key(namespace, sha256, extension)
+    if not await storage.put_file(Path(local_path), key):
+        logger.info(f"Deduplicated upload {key}")
+    return key.rsplit("/", 1)[-1]
+
+
+def _parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range; None means serve the whole object.
+
+    Raises HTTPException(416) for a syntactically valid but unsatisfiable range.
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", range_header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None  # Malformed or multi-range: ignore and send the full body
+    if match.group(1) == "":
+        length = int(match.group(2))
+        if length == 0:
+            raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+        return max(size - length, 0), size - 1
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else size - 1
+    if start >= size or end < start:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    return start, min(end, size - 1)
+
+
+async def serve_stored_file(request: Request, namespace: str, filename: str, private: bool = False) -> Response:
+    """Serve a stored file with ETag/If-None-Match, immutable caching and byte ranges"""
+    if not filename or Path(filename).name != filename:
+        raise HTTPException(status_code=404, detail="File not found")
+    key = f"{namespace}/{filename}"
+    obj = await storage.stat(key)
+    if obj is None:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    scope = "private" if private else "public"
+    headers = {
+        "ETag": obj.etag,
+        "Accept-Ranges": "bytes",
+        # Content-addressed keys never change; legacy uploads keep the old one-hour policy
+        "Cache-Control": f"{scope}, max-age=31536000, immutable" if obj.content_addressed else f"{scope}, max-age=3600",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or obj.etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    media_type = MEDIA_TYPES.get(Path(filename).suffix.lower(), "application/octet-stream")
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and obj.size > 0:
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range.strip() == obj.etag:
+            byte_range = _parse_range(range_header, obj.size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(obj.size)
+        return StreamingResponse(storage.iter_range(key, 0, max(obj.size - 1, 0)), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{obj.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(storage.iter_range(key, start, end), status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,145 @@
+"""
+Async delivery transports for notification providers.
+
+Each provider gets a pooled httpx.AsyncClient with explicit timeouts, a bounded
+concurrency limiter, and per-channel latency/error counters, so a slow provider
+never blocks the event loop and cannot monopolise connections.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger("notifications")
+
+
+class ChannelMetrics:
+    """Latency and outcome counters for one delivery channel"""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.sent = 0
+        self.failed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+
+    def observe(self, latency_ms: float, outcome: str):
+        """Record one delivery attempt (outcome: sent, failed, error or timeout)"""
+        self.latency_ms_total += latency_ms
+        self.latency_ms_max = max(self.latency_ms_max, latency_ms)
+        if outcome == "sent":
+            self.sent += 1
+        elif outcome == "failed":
+            self.failed += 1
+        elif outcome == "timeout":
+            self.timeouts += 1
+        else:
+            self.errors += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        attempts = self.sent + self.failed + self.errors + self.timeouts
+        return {
+            "channel": self.channel,
+            "attempts": attempts,
+            "sent": self.sent,
+            "failed": self.failed,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "avg_latency_ms": round(self.latency_ms_total / attempts, 2) if attempts else 0.0,
+            "max_latency_ms": round(self.latency_ms_max, 2)
+        }
+
+
+# Process-wide delivery counters, keyed by channel ("email", "sms")
+delivery_metrics: Dict[str, ChannelMetrics] = {
+    "email": ChannelMetrics("email"),
+    "sms": ChannelMetrics("sms")
+}
+
+
+def get_delivery_metrics() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of per-channel delivery counters"""
+    return {channel: metrics.snapshot() for channel, metrics in delivery_metrics.items()}
+
+
+class ProviderTransport:
+    """Pooled, rate-bounded async HTTP transport for a single provider"""
+
+    def __init__(self, name: str, channel: str, base_url: str, headers: Optional[Dict[str, str]] = None):
+        env_prefix = name.upper()
+        self.name = name
+        self.channel = channel
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers or {}
+        self.timeout = httpx.Timeout(
+            float(os.getenv(f"{env_prefix}_TIMEOUT_SEC", os.getenv("NOTIFICATION_HTTP_TIMEOUT_SEC", "10"))),
+            connect=float(os.getenv("NOTIFICATION_HTTP_CONNECT_TIMEOUT_SEC", "5"))
+        )
+        self.max_concurrency = int(os.getenv(f"{env_prefix}_MAX_CONCURRENCY", "10"))
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def metrics(self) -> ChannelMetrics:
+        return delivery_metrics.setdefault(self.channel, ChannelMetrics(self.channel))
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the client binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency
+                )
+            )
+        return self._client
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def post_json(self, path: str, payload: Dict[str, Any],
+                        is_success: Optional[Callable[[httpx.Response], bool]] = None) -> Optional[httpx.Response]:
+        """POST a JSON payload; returns the response, or None on transport error/timeout.
+
+        ``is_success`` lets providers that report errors inside a 2xx body classify the outcome.
+        """
+        metrics = self.metrics
+        async with self._get_semaphore():
+            metrics.in_flight += 1
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                response = await self._get_client().post(path, json=payload)
+                if is_success is not None:
+                    outcome = "sent" if is_success(response) else "failed"
+                else:
+                    outcome = "sent" if response.status_code < 300 else "failed"
+                return response
+            except httpx.TimeoutException as e:
+                outcome = "timeout"
+                logger.error(f"❌ {self.name} timed out after {self.timeout.read}s: {e}")
+                return None
+            except httpx.HTTPError as e:
+                logger.error(f"❌ {self.name} transport error: {e}")
+                return None
+            finally:
+                metrics.in_flight -= 1
+                metrics.observe((time.perf_counter() - started) * 1000, outcome)
+
+    async def aclose(self):
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Local Fake Notification Providers
+
+A tiny HTTP server that mimics the SendGrid and Termii endpoints used by
+services/notifications.py, with configurable latency and failure rate.
+Point SENDGRID_BASE_URL / TERMII_BASE_URL at it to exercise the async
+delivery transports without touching the real providers.
+
+Usage:
+    python tools/fake_providers.py --port 8025 --latency-ms 300 --failure-rate 0.1
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeProviderState:
+    """Shared configuration and request log for the fake server"""
+
+    def __init__(self, latency_ms: float = 0, failure_rate: float = 0.0):
+        self.latency_ms = latency_ms
+        self.failure_rate = failure_rate
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def record(self, path: str, body: dict):
+        with self.lock:
+            self.requests.append({"path": path, "body": body, "received_at": time.time()})
+
+
+def _make_handler(state: FakeProviderState):
+    class FakeProviderHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass  # Keep test output quiet
+
+        def _reply(self, status: int, payload=None):
+            body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                body = {}
+            state.record(self.path, body)
+
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000)
+            fail = random.random() < state.failure_rate
+
+            if self.path == "/v3/mail/send":
+                if fail:
+                    self._reply(500, {"errors": [{"message": "fake failure"}]})
+                else:
+                    self._reply(202)
+            elif self.path == "/api/sms/send":
+                if fail:
+                    self._reply(200, {"code": "error", "message": "fake failure"})
+                else:
+                    self._reply(200, {"code": "ok", "message_id": str(uuid.uuid4()), "message": "Successfully Sent"})
+            else:
+                self._reply(404, {"error": "not found"})
+
+    return FakeProviderHandler
+
+
+def start_fake_providers(port: int = 0, latency_ms: float = 0, failure_rate: float = 0.0):
+    """Start the server in a background thread; returns (server, state, base_url)"""
+    state = FakeProviderState(latency_ms=latency_ms, failure_rate=failure_rate)
+    server = ThreadingHTTPServer(("127.0.0.1", port), _make_handler(state))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    return server, state, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake SendGrid/Termii provider server")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, _, base_url = start_fake_providers(args.port, args.latency_ms, args.failure_rate)
+    print(f"🧪 Fake providers listening on {base_url}")
+    print(f"   SENDGRID_BASE_URL={base_url}")
+    print(f"   TERMII_BASE_URL={base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
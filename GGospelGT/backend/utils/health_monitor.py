@@ -7,22 +7,152 @@ import asyncio
 import time
 import psutil
 import os
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Deque
 from fastapi import HTTPException
 from ..database import database
 from utils.logger import get_logger
 
 logger = get_logger('health_monitor')
 
+SAMPLE_INTERVAL_SEC = float(os.getenv("SYSTEM_METRICS_INTERVAL_SEC", "5"))
+SAMPLE_BUFFER_SIZE = int(os.getenv("SYSTEM_METRICS_BUFFER_SIZE", "720"))  # one hour at 5s
+
+
+def _percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class SystemMetricsSampler:
+    """Samples CPU, memory, disk, network and event-loop lag into a ring buffer.
+
+    Runs as a background task so request handlers never wait on psutil;
+    readers take the newest sample in O(1).
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SEC, buffer_size: int = SAMPLE_BUFFER_SIZE):
+        self.interval = interval
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=buffer_size)
+        self._task: Optional[asyncio.Task] = None
+        self._previous_network = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self.samples[-1] if self.samples else None
+
+    def start(self) -> None:
+        if self.running:
+            return
+        # The first non-blocking cpu_percent call only sets the baseline
+        psutil.cpu_percent(interval=None)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"📈 System metrics sampler started (every {self.interval}s, {self.samples.maxlen} samples)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def sample_now(self, loop_lag_ms: float = 0.0) -> Dict[str, Any]:
+        """Collect one sample off the event loop without storing it."""
+        return await asyncio.get_running_loop().run_in_executor(None, self._collect, loop_lag_ms)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            # How late the sleep wakes up is the time the loop spent blocked
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            loop_lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            try:
+                self.samples.append(await self.sample_now(loop_lag_ms))
+            except Exception as e:
+                logger.error("System metrics sampling failed", extra={"error": str(e)})
+
+    def _collect(self, loop_lag_ms: float) -> Dict[str, Any]:
+        now = time.time()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        sample = {
+            "timestamp": datetime.utcfromtimestamp(now).isoformat(),
+            "time": now,
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "cpu_count": psutil.cpu_count(),
+            "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else None,
+            "memory_total": memory.total,
+            "memory_available": memory.available,
+            "memory_used": memory.used,
+            "memory_percent": memory.percent,
+            "disk_total": disk.total,
+            "disk_free": disk.free,
+            "disk_used": disk.used,
+            "disk_percent": round((disk.used / disk.total) * 100, 2),
+            "network": None,
+            "loop_lag_ms": round(loop_lag_ms, 2),
+        }
+        try:
+            network = psutil.net_io_counters()
+            sample["network"] = {
+                "bytes_sent": network.bytes_sent,
+                "bytes_recv": network.bytes_recv,
+                "packets_sent": network.packets_sent,
+                "packets_recv": network.packets_recv
+            }
+            previous = self._previous_network
+            if previous and now > previous[0]:
+                elapsed = now - previous[0]
+                sample["network"]["send_bytes_per_sec"] = round((network.bytes_sent - previous[1].bytes_sent) / elapsed, 1)
+                sample["network"]["recv_bytes_per_sec"] = round((network.bytes_recv - previous[1].bytes_recv) / elapsed, 1)
+            self._previous_network = (now, network)
+        except Exception:
+            pass
+        return sample
+
+    def summary(self, fields=("cpu_percent", "memory_percent", "disk_percent", "loop_lag_ms")) -> Dict[str, Any]:
+        """p50/p95/p99/max of each field over the whole buffer."""
+        samples = list(self.samples)
+        if not samples:
+            return {"samples": 0}
+        summary: Dict[str, Any] = {
+            "samples": len(samples),
+            "window_seconds": round(samples[-1]["time"] - samples[0]["time"], 1),
+        }
+        for field in fields:
+            ordered = sorted(s[field] for s in samples if s.get(field) is not None)
+            if ordered:
+                summary[field] = {
+                    "p50": _percentile(ordered, 50),
+                    "p95": _percentile(ordered, 95),
+                    "p99": _percentile(ordered, 99),
+                    "max": ordered[-1]
+                }
+        return summary
+
+
 class HealthMonitor:
     """Comprehensive health monitoring for production systems."""
     
     def __init__(self):
         self.start_time = time.time()
         self.last_health_check = None
-        self.health_history = []
-        self.max_history_size = 100
+        self.health_check_count = 0
+        self.sampler = SystemMetricsSampler()
+
+    @property
+    def health_history(self) -> List[Dict[str, Any]]:
+        """History entries derived from the sampler's ring buffer."""
+        return [self._history_entry(sample) for sample in self.sampler.samples]
     
     async def get_system_health(self) -> Dict[str, Any]:
         """Get comprehensive system health status."""
@@ -134,55 +264,44 @@ class HealthMonitor:
         }
     
     async def _get_system_metrics(self) -> Dict[str, Any]:
-        """Get system resource metrics."""
+        """Get system resource metrics from the latest background sample."""
         try:
-            # CPU metrics
-            cpu_percent = psutil.cpu_percent(interval=1)
-            cpu_count = psutil.cpu_count()
-            
-            # Memory metrics
-            memory = psutil.virtual_memory()
-            
-            # Disk metrics
-            disk = psutil.disk_usage('/')
-            
-            # Network metrics (if available)
-            try:
-                network = psutil.net_io_counters()
-                network_info = {
-                    "bytes_sent": network.bytes_sent,
-                    "bytes_recv": network.bytes_recv,
-                    "packets_sent": network.packets_sent,
-                    "packets_recv": network.packets_recv
-                }
-            except:
-                network_info = {"error": "Network metrics unavailable"}
-            
-            return {
-                "cpu": {
-                    "usage_percent": cpu_percent,
-                    "count": cpu_count,
-                    "load_average": os.getloadavg() if hasattr(os, 'getloadavg') else None
-                },
-                "memory": {
-                    "total_gb": round(memory.total / (1024**3), 2),
-                    "available_gb": round(memory.available / (1024**3), 2),
-                    "used_gb": round(memory.used / (1024**3), 2),
-                    "usage_percent": memory.percent
-                },
-                "disk": {
-                    "total_gb": round(disk.total / (1024**3), 2),
-                    "free_gb": round(disk.free / (1024**3), 2),
-                    "used_gb": round(disk.used / (1024**3), 2),
-                    "usage_percent": round((disk.used / disk.total) * 100, 2)
-                },
-                "network": network_info
-            }
-            
+            sample = self.sampler.latest()
+            if sample is None:
+                # Sampler not running or no tick yet: take a one-off non-blocking sample
+                sample = await self.sampler.sample_now()
+            return self._format_sample(sample)
+
         except Exception as e:
             logger.error("System metrics collection failed", extra={"error": str(e)})
             return {"error": str(e)}
-    
+
+    def _format_sample(self, sample: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "sampled_at": sample["timestamp"],
+            "cpu": {
+                "usage_percent": sample["cpu_percent"],
+                "count": sample["cpu_count"],
+                "load_average": sample["load_average"]
+            },
+            "memory": {
+                "total_gb": round(sample["memory_total"] / (1024**3), 2),
+                "available_gb": round(sample["memory_available"] / (1024**3), 2),
+                "used_gb": round(sample["memory_used"] / (1024**3), 2),
+                "usage_percent": sample["memory_percent"]
+            },
+            "disk": {
+                "total_gb": round(sample["disk_total"] / (1024**3), 2),
+                "free_gb": round(sample["disk_free"] / (1024**3), 2),
+                "used_gb": round(sample["disk_used"] / (1024**3), 2),
+                "usage_percent": sample["disk_percent"]
+            },
+            "network": sample["network"] or {"error": "Network metrics unavailable"},
+            "event_loop": {
+                "lag_ms": sample["loop_lag_ms"]
+            }
+        }
+
     async def _get_service_health(self) -> Dict[str, Any]:
         """Check health of various services."""
         services = {}
@@ -235,7 +354,7 @@ class HealthMonitor:
             
             return {
                 "database_query_time_ms": round(db_query_time, 2),
-                "health_check_count": len(self.health_history),
+                "health_check_count": self.health_check_count,
                 "last_health_check": self.last_health_check.isoformat() if self.last_health_check else None
             }
             
@@ -278,24 +397,21 @@ class HealthMonitor:
             return "unknown"
     
     def _store_health_history(self, health_data: Dict[str, Any]) -> None:
-        """Store health check in history."""
+        """Record that a full health check ran (system history comes from the sampler)."""
         self.last_health_check = datetime.utcnow()
-        
-        # Store simplified version in history
-        history_entry = {
-            "timestamp": health_data["timestamp"],
-            "status": health_data["status"],
-            "memory_usage": health_data.get("system", {}).get("memory", {}).get("usage_percent"),
-            "cpu_usage": health_data.get("system", {}).get("cpu", {}).get("usage_percent"),
-            "db_status": health_data.get("database", {}).get("status")
+        self.health_check_count += 1
+
+    def _history_entry(self, sample: Dict[str, Any]) -> Dict[str, Any]:
+        """Simplified history entry for one sample."""
+        return {
+            "timestamp": sample["timestamp"],
+            "status": self._determine_overall_status({"system": self._format_sample(sample)}),
+            "memory_usage": sample["memory_percent"],
+            "cpu_usage": sample["cpu_percent"],
+            "disk_usage": sample["disk_percent"],
+            "loop_lag_ms": sample["loop_lag_ms"]
         }
-        
-        self.health_history.append(history_entry)
-        
-        # Keep only recent history
-        if len(self.health_history) > self.max_history_size:
-            self.health_history = self.health_history[-self.max_history_size:]
-    
+
     def _format_uptime(self, seconds: float) -> str:
         """Format uptime in human-readable format."""
         days = int(seconds // 86400)
@@ -309,9 +425,15 @@ class HealthMonitor:
         else:
             return f"{minutes}m"
     
-    def get_health_history(self) -> List[Dict[str, Any]]:
-        """Get recent health check history."""
-        return self.health_history[-20:]  # Return last 20 checks
+    def get_health_history(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Get the most recent samples as history entries."""
+        samples = self.sampler.samples
+        recent = [samples[i] for i in range(max(0, len(samples) - limit), len(samples))]
+        return [self._history_entry(sample) for sample in recent]
+
+    def get_health_summary(self) -> Dict[str, Any]:
+        """Percentile summary over the whole sample buffer."""
+        return self.sampler.summary()
 
 # Global health monitor instance
 health_monitor = HealthMonitor()
\ No newline at end of file
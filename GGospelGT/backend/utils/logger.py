@@ -43,6 +43,9 @@ class JSONFormatter(logging.Formatter):
             log_entry['status_code'] = record.status_code
         if hasattr(record, 'duration'):
             log_entry['duration_ms'] = record.duration
+        if getattr(record, 'db_commands', None) is not None:
+            log_entry['db_commands'] = record.db_commands
+            log_entry['db_time_ms'] = record.db_time_ms
             
         return json.dumps(log_entry)
 
@@ -136,18 +139,22 @@ class ServiceHubLogger:
     
     def log_request(self, method: str, endpoint: str, status_code: int, 
                    duration: float, user_id: Optional[str] = None,
-                   request_id: Optional[str] = None):
+                   request_id: Optional[str] = None, db_commands: Optional[int] = None,
+                   db_time_ms: Optional[float] = None):
         """Log HTTP request with structured data."""
         logger = self.get_logger('requests')
+        db_summary = f" - db {db_commands} cmds/{db_time_ms:.2f}ms" if db_commands else ""
         logger.info(
-            f"{method} {endpoint} - {status_code} - {duration:.2f}ms",
+            f"{method} {endpoint} - {status_code} - {duration:.2f}ms{db_summary}",
             extra={
                 'method': method,
                 'endpoint': endpoint,
                 'status_code': status_code,
                 'duration': duration,
                 'user_id': user_id,
-                'request_id': request_id
+                'request_id': request_id,
+                'db_commands': db_commands,
+                'db_time_ms': db_time_ms
             }
         )
     
@@ -0,0 +1,205 @@
+"""
+Prometheus Metrics
+Process-local request, MongoDB and notification metrics served in the text
+exposition format. Everything is recorded in memory as it happens, so a scrape
+never touches the database.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR so scrapes aggregate
+across processes (prometheus_client multiprocess mode).
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from pymongo import monitoring
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger('metrics')
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "servicehub_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ["method", "route", "status"],
+    buckets=REQUEST_BUCKETS
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "servicehub_http_requests_in_flight",
+    "HTTP requests currently being handled",
+    multiprocess_mode="livesum"
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "servicehub_mongo_command_duration_seconds",
+    "MongoDB command latency by collection and command",
+    ["collection", "command"],
+    buckets=MONGO_BUCKETS
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "servicehub_mongo_command_failures_total",
+    "MongoDB commands that returned an error",
+    ["collection", "command"]
+)
+NOTIFICATION_OUTBOX_RESULTS = Counter(
+    "servicehub_notification_outbox_results_total",
+    "Outbox notifications finalized by the dispatcher (sent, retried, failed)",
+    ["result"]
+)
+REALTIME_CONNECTIONS = Gauge(
+    "servicehub_realtime_connections",
+    "Open WebSocket/SSE chat connections",
+    multiprocess_mode="livesum"
+)
+REALTIME_EVENTS = Counter(
+    "servicehub_realtime_events_published_total",
+    "Chat events published to the realtime bus by type",
+    ["type"]
+)
+
+# Commands whose first field is not a collection name
+_NO_COLLECTION_COMMANDS = {
+    "ping", "hello", "ismaster", "isMaster", "buildInfo", "buildinfo", "dbStats", "serverStatus",
+    "saslStart", "saslContinue", "endSessions", "listCollections", "listDatabases"
+}
+
+
+def route_label(scope: Dict[str, Any]) -> str:
+    """Route template (e.g. /api/jobs/{job_id}) so label cardinality stays bounded."""
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    return path if path else "unmatched"
+
+
+def command_labels(command_name: str, command: Any) -> Tuple[str, str]:
+    """(collection, command) labels for a started MongoDB command."""
+    if command_name in _NO_COLLECTION_COMMANDS:
+        return "-", command_name
+    if command_name == "getMore":
+        collection = command.get("collection")
+    else:
+        collection = command.get(command_name)
+    return (collection if isinstance(collection, str) else "-"), command_name
+
+
+class MongoCommandListener(monitoring.CommandListener):
+    """Times every MongoDB command into ``MONGO_COMMAND_DURATION``.
+
+    pymongo calls these hooks from Motor's worker threads; only the
+    (connection, request_id) -> labels map is shared between them.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        labels = command_labels(event.command_name, event.command)
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = labels
+
+    def _finish(self, event) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels is None:
+            labels = ("-", event.command_name)
+        MONGO_COMMAND_DURATION.labels(*labels).observe(event.duration_micros / 1_000_000)
+        return labels
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        labels = self._finish(event)
+        MONGO_COMMAND_FAILURES.labels(*labels).inc()
+
+
+mongo_command_listener = MongoCommandListener()
+
+
+class SystemMetricsCollector:
+    """Exposes the latest system sample, password-hash pool load and notification transport counters."""
+
+    def __init__(self, sampler, start_time: float):
+        self.sampler = sampler
+        self.start_time = start_time
+
+    def collect(self):
+        yield GaugeMetricFamily("servicehub_uptime_seconds", "Seconds since the API process started",
+                                value=time.time() - self.start_time)
+
+        sample = self.sampler.latest()
+        if sample is not None:
+            yield GaugeMetricFamily("servicehub_cpu_usage_percent", "Host CPU usage", value=sample["cpu_percent"])
+            yield GaugeMetricFamily("servicehub_memory_usage_percent", "Host memory usage", value=sample["memory_percent"])
+            yield GaugeMetricFamily("servicehub_memory_total_bytes", "Host memory size", value=sample["memory_total"])
+            yield GaugeMetricFamily("servicehub_disk_usage_percent", "Root filesystem usage", value=sample["disk_percent"])
+            yield GaugeMetricFamily("servicehub_event_loop_lag_seconds", "Event-loop lag at the last sample",
+                                    value=sample["loop_lag_ms"] / 1000)
+
+        try:
+            from ..auth.security import password_hasher
+        except ImportError:
+            password_hasher = None
+        if password_hasher is not None:
+            pool = password_hasher.stats()
+            yield GaugeMetricFamily("servicehub_password_hash_queue_depth",
+                                    "bcrypt jobs waiting for a password-hash worker", value=pool["queue_depth"])
+            yield GaugeMetricFamily("servicehub_password_hash_in_flight",
+                                    "bcrypt jobs running on password-hash workers", value=pool["in_flight"])
+            yield GaugeMetricFamily("servicehub_password_hash_workers",
+                                    "Password-hash pool size", value=pool["workers"])
+
+        try:
+            from ..services.transports import delivery_metrics
+        except ImportError:
+            return
+        deliveries = CounterMetricFamily("servicehub_notification_deliveries", "Provider delivery attempts by outcome",
+                                         labels=["channel", "outcome"])
+        in_flight = GaugeMetricFamily("servicehub_notification_deliveries_in_flight", "Provider requests in flight",
+                                      labels=["channel"])
+        latency = CounterMetricFamily("servicehub_notification_delivery_seconds", "Total provider request time",
+                                      labels=["channel"])
+        for channel, channel_metrics in list(delivery_metrics.items()):
+            for outcome, value in (("sent", channel_metrics.sent), ("failed", channel_metrics.failed),
+                                   ("error", channel_metrics.errors), ("timeout", channel_metrics.timeouts)):
+                deliveries.add_metric([channel, outcome], value)
+            in_flight.add_metric([channel], channel_metrics.in_flight)
+            latency.add_metric([channel], channel_metrics.latency_ms_total / 1000)
+        yield deliveries
+        yield in_flight
+        yield latency
+
+
+def register_system_collector(sampler, start_time: float) -> None:
+    """Register the sampler-backed collector once per process."""
+    global _system_collector
+    if _system_collector is None:
+        _system_collector = SystemMetricsCollector(sampler, start_time)
+        REGISTRY.register(_system_collector)
+
+
+_system_collector: Optional[SystemMetricsCollector] = None
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition body and content type for a scrape."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        if _system_collector is not None:
+            registry.register(_system_collector)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,191 @@
+"""
+Real-Time Event Bus
+In-process pub/sub for chat events (new messages, read receipts, unread counts)
+pushed to connected WebSocket/SSE clients.
+
+Publishing is fire-and-forget: events are queued and a writer task batches them
+into the capped ``realtime_events`` collection. Every worker tails that
+collection with an awaitable tailable cursor and delivers each event to its own
+local subscribers, so all uvicorn workers fan out correctly without a replica
+set (change streams would need one). Without a database connection events are
+delivered to local subscribers only.
+
+Each event is written with an empty BSON timestamp in ``ts``, which mongod
+replaces with an increasing server timestamp in insertion order. A restarted
+tail cursor resumes after the last ``ts`` it saw. Client-generated ObjectIds
+from different workers do not follow insertion order.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from bson import Timestamp
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
+
+try:
+    from .logger import get_logger
+    from .metrics import REALTIME_CONNECTIONS, REALTIME_EVENTS
+except ImportError:
+    from utils.logger import get_logger
+    from utils.metrics import REALTIME_CONNECTIONS, REALTIME_EVENTS
+
+logger = get_logger('realtime')
+
+EVENTS_COLLECTION = "realtime_events"
+EVENTS_COLLECTION_BYTES = int(os.getenv("REALTIME_EVENTS_COLLECTION_BYTES", str(16 * 1024 * 1024)))
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("REALTIME_SUBSCRIBER_QUEUE_SIZE", "100"))
+TAIL_AWAIT_MS = int(os.getenv("REALTIME_TAIL_AWAIT_MS", "1000"))
+PUBLISH_BATCH_SIZE = 200
+
+# Sent to a subscriber whose queue overflowed; the client should refetch its state
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """One connected client's event queue."""
+
+    def __init__(self, user_id: str):
+        self.user_id = user_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def deliver(self, event: Dict[str, Any]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow client gets one resync marker instead of an unbounded backlog
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrived within ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class RealtimeBus:
+    """Per-user subscriber registry plus the Mongo bridge shared by all workers."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._database = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.delivered = 0
+
+    @property
+    def bridged(self) -> bool:
+        return bool(self._tasks)
+
+    def subscribe(self, user_id: str) -> Subscription:
+        subscription = Subscription(user_id)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        REALTIME_CONNECTIONS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscriptions = self._subscribers.get(subscription.user_id)
+        if subscriptions is None or subscription not in subscriptions:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscribers[subscription.user_id]
+        REALTIME_CONNECTIONS.dec()
+
+    def connection_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscribers.values())
+
+    def publish(self, event_type: str, user_ids: Iterable[str], data: Dict[str, Any]):
+        """Queue an event for the given users; never blocks the caller."""
+        event = {
+            "type": event_type,
+            "user_ids": [user_id for user_id in dict.fromkeys(user_ids) if user_id],
+            "data": data,
+            "created_at": datetime.utcnow()
+        }
+        if not event["user_ids"]:
+            return
+        REALTIME_EVENTS.labels(event_type).inc()
+        if self._outbox is not None:
+            self._outbox.put_nowait(event)
+        else:
+            self._dispatch(event)
+
+    def _dispatch(self, event: Dict[str, Any]):
+        payload = {"type": event["type"], "data": event["data"], "created_at": event["created_at"]}
+        for user_id in event["user_ids"]:
+            for subscription in self._subscribers.get(user_id, ()):
+                subscription.deliver(payload)
+                self.delivered += 1
+
+    async def start(self, database):
+        """Create the capped events collection and start the writer and tail tasks."""
+        if self._tasks:
+            return
+        self._database = database
+        try:
+            await database.create_collection(EVENTS_COLLECTION, capped=True, size=EVENTS_COLLECTION_BYTES)
+        except CollectionInvalid:
+            pass
+        collection = database[EVENTS_COLLECTION]
+        # A tailable cursor on an empty capped collection dies immediately; the
+        # sentinel also gives the tail a server-stamped position to start after
+        await collection.insert_one(
+            {"type": "bridge.started", "user_ids": [], "ts": Timestamp(0, 0), "created_at": datetime.utcnow()}
+        )
+        last = await collection.find_one({"ts": {"$exists": True}}, sort=[("$natural", -1)], projection={"ts": 1})
+        self._outbox = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._write_loop(collection)),
+            asyncio.create_task(self._tail_loop(collection, last["ts"] if last else None)),
+        ]
+        logger.info(f"📡 Realtime bus bridged through {EVENTS_COLLECTION}")
+
+    async def stop(self):
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._outbox = None
+
+    async def _write_loop(self, collection):
+        while True:
+            batch = [await self._outbox.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE and not self._outbox.empty():
+                batch.append(self._outbox.get_nowait())
+            for event in batch:
+                event["ts"] = Timestamp(0, 0)  # Stamped by the server on insert
+            try:
+                await collection.insert_many(batch, ordered=False)
+            except Exception as e:
+                # Other workers miss these; local subscribers still get them
+                logger.error(f"❌ Failed to write {len(batch)} realtime events: {e}")
+                for event in batch:
+                    event.pop("_id", None)
+                    self._dispatch(event)
+
+    async def _tail_loop(self, collection, last_ts):
+        while True:
+            query = {"ts": {"$gt": last_ts}} if last_ts is not None else {"ts": {"$exists": True}}
+            cursor = collection.find(query, cursor_type=CursorType.TAILABLE_AWAIT).max_await_time_ms(TAIL_AWAIT_MS)
+            try:
+                while cursor.alive:
+                    async for event in cursor:
+                        last_ts = event["ts"]
+                        if event.get("user_ids"):
+                            self._dispatch(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Realtime tail cursor restarting: {e}")
+            finally:
+                await cursor.close()
+            await asyncio.sleep(1)
+
+
+realtime_bus = RealtimeBus()
@@ -0,0 +1,196 @@
+"""
+Per-Request Database Accounting
+Counts MongoDB commands and cumulative DB time for the request being served,
+and logs slow commands with their filter shape and a sampled explain summary.
+
+The request context lives in a contextvar set by the request middleware. Motor
+runs pymongo on executor threads with a copy of the caller's context, so the
+command listener sees the stats object of the request that issued the command.
+"""
+
+import asyncio
+import contextvars
+import os
+import random
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+
+try:
+    from .cache import TTLLRUCache
+    from .logger import get_logger
+except ImportError:
+    from utils.cache import TTLLRUCache
+    from utils.logger import get_logger
+
+logger = get_logger('slow_queries')
+
+SLOW_COMMAND_MS = float(os.getenv("MONGO_SLOW_COMMAND_MS", "100"))
+EXPLAIN_SAMPLE_RATE = float(os.getenv("MONGO_SLOW_EXPLAIN_SAMPLE_RATE", "0.1"))
+EXPLAIN_SHAPE_TTL_SEC = float(os.getenv("MONGO_SLOW_EXPLAIN_SHAPE_TTL_SEC", "600"))
+
+# Read commands that can be explained without side effects
+EXPLAINABLE_COMMANDS = {"find", "aggregate", "count", "distinct"}
+# Session/cluster fields the server rejects inside an explain
+_EXPLAIN_STRIP_FIELDS = {"lsid", "txnNumber", "readConcern", "writeConcern", "$db", "$clusterTime", "$readPreference"}
+
+
+class RequestStats:
+    """Mutable per-request counters; shared by reference with executor threads."""
+
+    __slots__ = ("db_commands", "db_time_ms", "_lock")
+
+    def __init__(self):
+        self.db_commands = 0
+        self.db_time_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms: float):
+        with self._lock:
+            self.db_commands += 1
+            self.db_time_ms += duration_ms
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.db_time_ms:.2f};desc="{self.db_commands} mongo commands"'
+
+
+_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    "servicehub_request_stats", default=None
+)
+
+
+def start_request_stats() -> Tuple[RequestStats, contextvars.Token]:
+    stats = RequestStats()
+    return stats, _request_stats.set(stats)
+
+
+def end_request_stats(token: contextvars.Token):
+    _request_stats.reset(token)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def filter_shape(value: Any) -> Any:
+    """Replace literal values with '?' so queries differing only in values share a shape."""
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $and/$or hold sub-filters; $in/$nin hold values, which collapse to one marker
+        shapes = [filter_shape(item) for item in value if isinstance(item, dict)]
+        return shapes if shapes else ["?"]
+    return "?"
+
+
+def command_filter(command_name: str, command: Dict[str, Any]) -> Any:
+    """The part of a command that decides which documents are read."""
+    if command_name in ("find", "count", "distinct", "findAndModify"):
+        return command.get("filter", command.get("query", {}))
+    if command_name == "aggregate":
+        return [{stage: filter_shape(body) if stage == "$match" else "..."}
+                for pipeline_stage in command.get("pipeline", []) for stage, body in pipeline_stage.items()]
+    if command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or []
+        return statements[0].get("q", {}) if statements else {}
+    return None
+
+
+def explain_summary(explain: Dict[str, Any]) -> Dict[str, Any]:
+    """Stage chain and index names of the winning plan."""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # Aggregations explain per stage; the first $cursor stage holds the planner output
+        for stage in explain.get("stages", []):
+            if "$cursor" in stage:
+                planner = stage["$cursor"].get("queryPlanner")
+                break
+    plan = (planner or {}).get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)  # slot-based engine nests the classic plan
+
+    stages: List[str] = []
+    indexes: List[str] = []
+    pending = [plan]
+    while pending:
+        node = pending.pop(0)
+        if not isinstance(node, dict) or "stage" not in node:
+            continue
+        stages.append(node["stage"])
+        if node.get("indexName"):
+            indexes.append(node["indexName"])
+        if "inputStage" in node:
+            pending.append(node["inputStage"])
+        pending.extend(node.get("inputStages", []))
+    return {"stages": stages, "indexes": indexes, "collection_scan": "COLLSCAN" in stages}
+
+
+class RequestCommandListener(monitoring.CommandListener):
+    """Feeds per-request stats and the slow-command log."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._explained_shapes = TTLLRUCache(max_entries=1000, ttl_seconds=EXPLAIN_SHAPE_TTL_SEC)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._database = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop, database):
+        """Enable explain sampling; explains run on ``loop`` against ``database``."""
+        self._loop = loop
+        self._database = database
+
+    def started(self, event):
+        with self._lock:
+            self._pending[(event.connection_id, event.request_id)] = event.command
+
+    def _pop(self, event) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._pending.pop((event.connection_id, event.request_id), None)
+
+    def succeeded(self, event):
+        self._finish(event, self._pop(event))
+
+    def failed(self, event):
+        self._finish(event, self._pop(event))
+
+    def _finish(self, event, command: Optional[Dict[str, Any]]):
+        duration_ms = event.duration_micros / 1000
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.record(duration_ms)
+        if duration_ms >= SLOW_COMMAND_MS and command is not None and event.command_name != "explain":
+            self._log_slow(event, command, duration_ms)
+
+    def _log_slow(self, event, command: Dict[str, Any], duration_ms: float):
+        command_name = event.command_name
+        collection = command.get(command_name)
+        shape = filter_shape(command_filter(command_name, command))
+        logger.warning(
+            f"🐢 Slow MongoDB {command_name} on {collection}: {duration_ms:.1f}ms filter={shape}",
+            extra={"collection": collection, "command": command_name, "duration": duration_ms}
+        )
+
+        if (self._loop is None or command_name not in EXPLAINABLE_COMMANDS
+                or random.random() >= EXPLAIN_SAMPLE_RATE):
+            return
+        shape_key = f"{collection}:{command_name}:{shape}"
+        if self._explained_shapes.get(shape_key) is not None:
+            return
+        self._explained_shapes.set(shape_key, True)
+        explain_command = {k: v for k, v in command.items() if k not in _EXPLAIN_STRIP_FIELDS}
+        self._loop.call_soon_threadsafe(
+            lambda: self._loop.create_task(self._explain(collection, command_name, shape, explain_command))
+        )
+
+    async def _explain(self, collection: str, command_name: str, shape: Any, command: Dict[str, Any]):
+        try:
+            result = await self._database.command({"explain": command, "verbosity": "queryPlanner"})
+            logger.warning(
+                f"🐢 Slow MongoDB {command_name} on {collection} plan: {explain_summary(result)} filter={shape}"
+            )
+        except Exception as e:
+            logger.debug(f"Explain for slow {command_name} on {collection} failed: {e}")
+
+
+request_command_listener = RequestCommandListener()
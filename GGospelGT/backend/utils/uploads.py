@@ -0,0 +1,144 @@
+"""
+Upload Ingestion Utilities
+Streams multipart uploads to disk in fixed-size chunks so memory per upload
+stays constant, enforcing the size limit and hashing the content on the way.
+
+Starlette spools a whole multipart body to disk before the endpoint runs, so
+UploadLimitMiddleware rejects oversized bodies before they are parsed.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from utils.logger import get_logger
+
+logger = get_logger('uploads')
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(256 * 1024)))
+# Boundaries, part headers and small form fields sent alongside the file
+MULTIPART_OVERHEAD_BYTES = int(os.getenv("UPLOAD_MULTIPART_OVERHEAD_BYTES", str(64 * 1024)))
+
+
+def media_max_upload_bytes() -> int:
+    """Size cap for admin media uploads."""
+    return int(os.getenv("MEDIA_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+
+
+def _too_large_detail(max_bytes: int) -> str:
+    limit = f"{max_bytes // (1024 * 1024)}MB" if max_bytes >= 1024 * 1024 else f"{max_bytes // 1024}KB"
+    return f"File too large. Max size: {limit}"
+
+
+class UploadLimitMiddleware:
+    """Rejects multipart requests over their route's upload limit before the body is parsed.
+
+    ``limits`` maps request paths to the file size their endpoint accepts; other
+    multipart requests get ``default_max_bytes``. A declared Content-Length over
+    the limit is answered with 413 without reading the body; chunked bodies are
+    counted as they arrive and fail with 413 once they pass it.
+    """
+
+    def __init__(self, app, limits: Dict[str, int], default_max_bytes: int):
+        self.app = app
+        self.limits = {path.rstrip("/"): max_bytes for path, max_bytes in limits.items()}
+        self.default_max_bytes = default_max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            return await self.app(scope, receive, send)
+
+        file_limit = self.limits.get(scope["path"].rstrip("/"), self.default_max_bytes)
+        max_bytes = file_limit + MULTIPART_OVERHEAD_BYTES
+        try:
+            content_length = int(headers.get(b"content-length", b""))
+        except ValueError:
+            content_length = None
+        if content_length is not None and content_length > max_bytes:
+            logger.warning(f"Rejected {content_length} byte upload to {scope['path']} (limit {file_limit})")
+            response = JSONResponse({"detail": _too_large_detail(file_limit)}, status_code=413)
+            return await response(scope, receive, send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail=_too_large_detail(file_limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+class IngestedUpload:
+    """An upload streamed to a temporary file next to its final destination."""
+
+    def __init__(self, temp_path: Path, size: int, sha256: str, filename: str, content_type: Optional[str]):
+        self.temp_path = temp_path
+        self.size = size
+        self.sha256 = sha256
+        self.filename = filename
+        self.content_type = content_type
+
+    async def move_to(self, destination: Union[str, Path]) -> Path:
+        """Atomically rename the temp file into place (same filesystem, so no partial files)."""
+        destination = Path(destination)
+        await run_in_threadpool(os.replace, self.temp_path, destination)
+        self.temp_path = destination
+        return destination
+
+    async def discard(self):
+        """Remove the temp file if it was not moved into place."""
+        await run_in_threadpool(self.temp_path.unlink, True)
+
+
+async def ingest_upload(file: UploadFile, upload_dir: Union[str, Path], max_bytes: int,
+                        chunk_size: int = UPLOAD_CHUNK_SIZE) -> IngestedUpload:
+    """Stream ``file`` into a temp file inside ``upload_dir``.
+
+    Raises HTTPException(413) as soon as more than ``max_bytes`` have been read;
+    the partial temp file is removed. The temp file lives in ``upload_dir`` so
+    ``IngestedUpload.move_to`` is an atomic rename.
+    """
+    upload_dir = Path(upload_dir)
+    await run_in_threadpool(upload_dir.mkdir, parents=True, exist_ok=True)
+
+    fd, temp_name = await run_in_threadpool(tempfile.mkstemp, ".part", ".incoming-", str(upload_dir))
+    temp_path = Path(temp_name)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(status_code=413, detail=_too_large_detail(max_bytes))
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        await run_in_threadpool(temp_path.unlink, True)
+        raise
+
+    if size == 0:
+        await run_in_threadpool(temp_path.unlink, True)
+        raise HTTPException(status_code=400, detail="Uploaded file is empty")
+
+    return IngestedUpload(temp_path, size, digest.hexdigest(), file.filename or "", file.content_type)
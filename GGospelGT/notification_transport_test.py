@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+ASYNC NOTIFICATION TRANSPORT TESTING AGAINST LOCAL FAKE PROVIDERS
+
+Verifies that SendGrid/Termii delivery no longer blocks the event loop:
+1. Starts backend/tools/fake_providers.py with artificial provider latency
+2. Sends a burst of emails and SMS concurrently through the real service classes
+3. Checks a heartbeat task kept ticking while deliveries were in flight
+4. Checks the per-provider concurrency limit and per-channel counters
+5. Checks provider failures and timeouts are reported as failures, not exceptions
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from backend.tools.fake_providers import start_fake_providers
+
+PROVIDER_LATENCY_MS = 200
+BURST_SIZE = 20
+MAX_CONCURRENCY = 5
+
+
+class NotificationTransportTester:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+
+    def check(self, condition: bool, description: str):
+        if condition:
+            self.passed += 1
+            print(f"✅ {description}")
+        else:
+            self.failed += 1
+            print(f"❌ {description}")
+
+    async def heartbeat(self, stop: asyncio.Event, gaps: list):
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append((now - last) * 1000)
+            last = now
+
+    async def run(self):
+        server, state, base_url = start_fake_providers(latency_ms=PROVIDER_LATENCY_MS)
+        os.environ.update({
+            "SENDGRID_API_KEY": "fake-key",
+            "SENDER_EMAIL": "noreply@servicehub.test",
+            "SENDGRID_BASE_URL": base_url,
+            "SENDGRID_MAX_CONCURRENCY": str(MAX_CONCURRENCY),
+            "TERMII_API_KEY": "fake-key",
+            "TERMII_SENDER_ID": "ServiceHub",
+            "TERMII_BASE_URL": base_url,
+            "TERMII_MAX_CONCURRENCY": str(MAX_CONCURRENCY),
+        })
+
+        from backend.services.notifications import SendGridEmailService, TermiiSMSService
+        from backend.services.transports import get_delivery_metrics
+
+        email_service = SendGridEmailService()
+        sms_service = TermiiSMSService()
+
+        # Warm up: client creation loads the TLS trust store once per provider
+        await email_service.send_email("warmup@servicehub.test", "Warmup", "Hello")
+        await sms_service.send_sms("08031234567", "Warmup")
+        from backend.services.transports import delivery_metrics, ChannelMetrics
+        for channel in list(delivery_metrics):
+            delivery_metrics[channel] = ChannelMetrics(channel)
+
+        print("🔍 Burst delivery through fake providers")
+        stop, gaps = asyncio.Event(), []
+        heartbeat = asyncio.create_task(self.heartbeat(stop, gaps))
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *[email_service.send_email(f"user{i}@servicehub.test", "Test", "Hello") for i in range(BURST_SIZE)],
+            *[sms_service.send_sms("08031234567", "Hello") for _ in range(BURST_SIZE)],
+        )
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await heartbeat
+
+        self.check(all(results), f"All {len(results)} deliveries succeeded")
+        self.check(max(gaps) < PROVIDER_LATENCY_MS / 2,
+                   f"Event loop stayed responsive (max heartbeat gap {max(gaps):.1f}ms)")
+        min_expected = (BURST_SIZE / MAX_CONCURRENCY) * PROVIDER_LATENCY_MS / 1000
+        self.check(elapsed >= min_expected * 0.9,
+                   f"Concurrency bounded at {MAX_CONCURRENCY} per provider ({elapsed:.2f}s >= {min_expected:.2f}s)")
+
+        metrics = get_delivery_metrics()
+        self.check(metrics["email"]["sent"] == BURST_SIZE, f"Email sent counter = {metrics['email']['sent']}")
+        self.check(metrics["sms"]["sent"] == BURST_SIZE, f"SMS sent counter = {metrics['sms']['sent']}")
+        self.check(metrics["email"]["avg_latency_ms"] >= PROVIDER_LATENCY_MS * 0.9,
+                   f"Email latency recorded ({metrics['email']['avg_latency_ms']}ms avg)")
+
+        print("🔍 Provider failures")
+        state.failure_rate = 1.0
+        self.check(not await email_service.send_email("x@servicehub.test", "Test", "Hello"), "Email 5xx reported as failure")
+        self.check(not await sms_service.send_sms("08031234567", "Hello"), "Termii error body reported as failure")
+        metrics = get_delivery_metrics()
+        self.check(metrics["email"]["failed"] == 1 and metrics["sms"]["failed"] == 1, "Failure counters incremented")
+
+        print("🔍 Provider timeouts")
+        state.failure_rate = 0.0
+        state.latency_ms = 1500
+        sms_service.transport.timeout.read = 0.5
+        await sms_service.transport.aclose()  # Recreate the client with the shorter timeout
+        self.check(not await sms_service.send_sms("08031234567", "Hello"), "Slow provider times out instead of hanging")
+        self.check(get_delivery_metrics()["sms"]["timeouts"] == 1, "Timeout counter incremented")
+
+        await email_service.aclose()
+        await sms_service.aclose()
+        server.shutdown()
+
+        print()
+        print(f"📊 Results: {self.passed} passed, {self.failed} failed")
+        return self.failed == 0
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(NotificationTransportTester().run())
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,226 @@
+"""
+Shared fixtures: an in-memory stand-in for the handful of Motor collection
+methods the chat paths use, so route tests run without a mongod.
+"""
+
+import copy
+import itertools
+from datetime import datetime
+
+import pytest
+from pymongo import ReturnDocument
+
+from backend.auth.dependencies import get_current_active_user
+from backend.database import database
+from backend.models.auth import User
+
+_ids = itertools.count(1)
+
+
+def _resolve(expr, doc):
+    """Evaluate the aggregation-expression subset used by the chat updates."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return doc.get(expr[1:])
+    if isinstance(expr, dict) and len(expr) == 1:
+        op, args = next(iter(expr.items()))
+        if op == "$ifNull":
+            value = _resolve(args[0], doc)
+            return _resolve(args[1], doc) if value is None else value
+        if op == "$or":
+            return any(_resolve(arg, doc) for arg in args)
+        values = [_resolve(arg, doc) for arg in args]
+        if op == "$gt":
+            return values[0] is not None and values[1] is not None and values[0] > values[1]
+        if op == "$lt":
+            return values[0] is not None and values[1] is not None and values[0] < values[1]
+        raise NotImplementedError(op)
+    return expr
+
+
+def _matches(doc, query):
+    for field, condition in query.items():
+        if field == "$expr":
+            if not _resolve(condition, doc):
+                return False
+        elif isinstance(condition, dict):
+            for op, value in condition.items():
+                if op == "$in" and doc.get(field) not in value:
+                    return False
+                if op == "$ne" and doc.get(field) == value:
+                    return False
+                if op == "$exists" and (field in doc) != value:
+                    return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+def _project(doc, projection):
+    if not projection:
+        return copy.deepcopy(doc)
+    included = {field for field, flag in projection.items() if flag}
+    return {k: copy.deepcopy(v) for k, v in doc.items()
+            if k in included or (k == "_id" and projection.get("_id", 1))}
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for field, order in reversed(keys):
+            self.docs.sort(key=lambda doc: doc.get(field), reverse=order == -1)
+        return self
+
+    def skip(self, count):
+        self.docs = self.docs[count:]
+        return self
+
+    def limit(self, count):
+        self.docs = self.docs[:count] if count else self.docs
+        return self
+
+    async def to_list(self, length=None):
+        return self.docs[:length] if length else self.docs
+
+    def __aiter__(self):
+        self._iter = iter(self.docs)
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = []
+
+    @staticmethod
+    def _apply(doc, update):
+        if isinstance(update, list):
+            for stage in update:
+                values = {field: _resolve(expr, doc) for field, expr in stage["$set"].items()}
+                doc.update(values)
+            return
+        for field, value in update.get("$set", {}).items():
+            doc[field] = value
+        for field, value in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + value
+        for field in update.get("$unset", {}):
+            doc.pop(field, None)
+
+    async def insert_one(self, doc):
+        doc.setdefault("_id", f"oid-{next(_ids)}")
+        self.docs.append(copy.deepcopy(doc))
+
+        class Result:
+            inserted_id = doc["_id"]
+        return Result()
+
+    async def find_one(self, query, projection=None, **kwargs):
+        for doc in self.docs:
+            if _matches(doc, query):
+                return _project(doc, projection)
+        return None
+
+    def find(self, query=None, projection=None):
+        return FakeCursor([_project(doc, projection) for doc in self.docs if _matches(doc, query or {})])
+
+    async def count_documents(self, query):
+        return sum(1 for doc in self.docs if _matches(doc, query))
+
+    async def find_one_and_update(self, query, update, projection=None,
+                                  return_document=ReturnDocument.BEFORE, upsert=False):
+        for doc in self.docs:
+            if _matches(doc, query):
+                before = copy.deepcopy(doc)
+                self._apply(doc, update)
+                return _project(before if return_document == ReturnDocument.BEFORE else doc, projection)
+        return None
+
+    async def update_one(self, query, update, upsert=False):
+        class Result:
+            modified_count = 0
+        for doc in self.docs:
+            if _matches(doc, query):
+                self._apply(doc, update)
+                Result.modified_count = 1
+                break
+        return Result()
+
+    async def distinct(self, field, query=None):
+        values = []
+        for doc in self.docs:
+            if _matches(doc, query or {}) and doc.get(field) not in values:
+                values.append(doc.get(field))
+        return values
+
+    async def bulk_write(self, requests, ordered=True):
+        class Result:
+            modified_count = 0
+        for request in requests:
+            Result.modified_count += (await self.update_one(request._filter, request._doc)).modified_count
+        return Result()
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = FakeDatabase()
+    monkeypatch.setattr(database, "database", db)
+    monkeypatch.setattr(database, "connected", True)
+    return db
+
+
+def make_user(role: str, user_id: str, name: str) -> User:
+    """A User validated the way get_current_user builds it (role becomes a UserRole)."""
+    return User(**{
+        "id": user_id, "name": name, "email": f"{user_id}@example.com", "phone": "+2348000000000",
+        "role": role, "location": "Lagos", "postcode": "100001", "created_at": datetime.utcnow()
+    })
+
+
+@pytest.fixture
+def conversation(fake_db):
+    now = datetime(2026, 1, 1, 12, 0)
+    doc = {
+        "_id": "oid-conv-1", "id": "conv-1", "job_id": "job-1", "job_title": "Fix sink",
+        "homeowner_id": "home-1", "homeowner_name": "Ada",
+        "tradesperson_id": "trade-1", "tradesperson_name": "Bayo",
+        "last_message": None, "last_message_at": None,
+        "unread_count_homeowner": 0, "unread_count_tradesperson": 0,
+        "last_read_at_homeowner": None, "last_read_message_id_homeowner": None,
+        "last_read_at_tradesperson": None, "last_read_message_id_tradesperson": None,
+        "created_at": now, "updated_at": now
+    }
+    fake_db.conversations.docs.append(copy.deepcopy(doc))
+    return doc
+
+
+@pytest.fixture
+def client_as():
+    """TestClient factory for the messages router authenticated as a given User."""
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from backend.routes import messages
+
+    app = FastAPI()
+    app.include_router(messages.router)
+
+    def build(user: User) -> TestClient:
+        app.dependency_overrides[get_current_active_user] = lambda: user
+        return TestClient(app)
+    return build
@@ -0,0 +1,50 @@
+"""
+Job search pages: the keyset filter runs before the sort and the limit right after it,
+so a page never sorts the whole match set.
+"""
+
+import asyncio
+
+from backend.database import database
+
+from .conftest import FakeCursor
+
+
+class RecordingJobs:
+    def __init__(self):
+        self.pipelines = []
+        self.counted = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor([])
+
+    async def count_documents(self, query):
+        self.counted.append(query)
+        return 0
+
+
+def _search(fake_db, **kwargs):
+    fake_db["jobs"] = RecordingJobs()
+    result = asyncio.run(database.search_jobs_with_location(limit=20, **kwargs))
+    return result, fake_db["jobs"]
+
+
+def test_cursor_page_filters_before_sort_and_limits_after(fake_db):
+    first_cursor = database._encode_search_cursor({"created_at": "2026-01-01T00:00:00", "id": "job-9"})
+
+    result, jobs = _search(fake_db, cursor=first_cursor)
+
+    stages = [next(iter(stage)) for stage in jobs.pipelines[0]]
+    assert stages == ["$match", "$match", "$sort", "$limit"]
+    assert jobs.pipelines[0][-1] == {"$limit": 21}
+    assert "$facet" not in stages
+    assert "$or" not in jobs.counted[0]
+    assert result["total"] == 0 and result["next_cursor"] is None
+
+
+def test_ranked_first_page_skips_after_sort(fake_db):
+    _, jobs = _search(fake_db, search_query="plumber", skip=40)
+
+    stages = [next(iter(stage)) for stage in jobs.pipelines[0]]
+    assert stages == ["$match", "$addFields", "$sort", "$skip", "$limit"]
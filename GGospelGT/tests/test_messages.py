@@ -0,0 +1,125 @@
+"""
+Chat route tests with validated users (User.role is a UserRole enum, as it is
+when get_current_user builds the user from the database).
+"""
+
+from backend.models.auth import UserRole
+from backend.routes import messages
+from backend.utils.realtime import realtime_bus
+
+from .conftest import make_user
+
+
+def test_send_message_as_validated_user(fake_db, conversation, client_as):
+    tradesperson = make_user("tradesperson", "trade-1", "Bayo")
+    assert tradesperson.role is UserRole.TRADESPERSON
+
+    response = client_as(tradesperson).post(
+        "/api/messages/conversations/conv-1/messages",
+        json={"conversation_id": "conv-1", "content": "On my way"}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["sender_type"] == "tradesperson"
+    stored = fake_db.conversations.docs[0]
+    assert stored["unread_count_homeowner"] == 1
+    assert stored["last_message_sender_type"] == "tradesperson"
+    assert fake_db.messages.docs[0]["sender_type"] == "tradesperson"
+
+
+def test_send_message_rejects_non_participant(fake_db, conversation, client_as):
+    outsider = make_user("tradesperson", "trade-2", "Chidi")
+
+    response = client_as(outsider).post(
+        "/api/messages/conversations/conv-1/messages",
+        json={"conversation_id": "conv-1", "content": "Hello"}
+    )
+
+    assert response.status_code == 403
+    assert fake_db.messages.docs == []
+
+
+def test_mark_read_advances_watermark_for_validated_user(fake_db, conversation, client_as):
+    tradesperson = make_user("tradesperson", "trade-1", "Bayo")
+    homeowner = make_user("homeowner", "home-1", "Ada")
+    client_as(tradesperson).post(
+        "/api/messages/conversations/conv-1/messages",
+        json={"conversation_id": "conv-1", "content": "Quote attached"}
+    )
+
+    response = client_as(homeowner).put("/api/messages/conversations/conv-1/read")
+
+    assert response.status_code == 200, response.text
+    stored = fake_db.conversations.docs[0]
+    assert stored["unread_count_homeowner"] == 0
+    assert stored["last_read_at_homeowner"] == stored["last_message_at"]
+    assert stored["last_read_message_id_homeowner"] == stored["last_message_id"]
+    assert not any(field.startswith(("last_read_at_UserRole", "unread_count_UserRole")) for field in stored)
+
+    # The sender sees the message as read, derived from the homeowner's watermark
+    response = client_as(tradesperson).get("/api/messages/conversations/conv-1/messages")
+    assert [message["status"] for message in response.json()["messages"]] == ["read"]
+
+
+def _drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_read_receipt_published_from_http_read(fake_db, conversation, client_as):
+    tradesperson = make_user("tradesperson", "trade-1", "Bayo")
+    homeowner = make_user("homeowner", "home-1", "Ada")
+    client_as(tradesperson).post(
+        "/api/messages/conversations/conv-1/messages",
+        json={"conversation_id": "conv-1", "content": "Quote attached"}
+    )
+    sender_events = realtime_bus.subscribe("trade-1")
+    reader_events = realtime_bus.subscribe("home-1")
+    try:
+        client_as(homeowner).put("/api/messages/conversations/conv-1/read")
+
+        receipts = [event for event in _drain(sender_events) if event["type"] == "messages.read"]
+        assert [event["data"]["reader_id"] for event in receipts] == ["home-1"]
+        assert [event["data"] for event in _drain(reader_events) if event["type"] == "unread.updated"] == [
+            {"conversation_id": "conv-1", "unread_count": 0}
+        ]
+
+        # Already caught up: nothing further is published
+        client_as(homeowner).put("/api/messages/conversations/conv-1/read")
+        assert _drain(sender_events) == []
+    finally:
+        realtime_bus.unsubscribe(sender_events)
+        realtime_bus.unsubscribe(reader_events)
+
+
+def test_read_receipt_published_from_websocket_read(fake_db, conversation, client_as, monkeypatch):
+    tradesperson = make_user("tradesperson", "trade-1", "Bayo")
+    homeowner = make_user("homeowner", "home-1", "Ada")
+    client = client_as(tradesperson)
+    client.post(
+        "/api/messages/conversations/conv-1/messages",
+        json={"conversation_id": "conv-1", "content": "Quote attached"}
+    )
+
+    async def user_from_token(token):
+        return homeowner
+    monkeypatch.setattr(messages, "get_user_from_token", user_from_token)
+
+    sender_events = realtime_bus.subscribe("trade-1")
+    try:
+        with client.websocket_connect("/api/messages/ws?token=homeowner-token") as socket:
+            assert socket.receive_json()["type"] == "ready"
+            socket.send_json({"type": "read", "conversation_id": "conv-1"})
+            socket.send_json({"type": "ping"})
+            pushed = {}
+            while not {"pong", "unread.updated"} <= pushed.keys():
+                event = socket.receive_json()
+                pushed[event["type"]] = event.get("data")
+
+        assert pushed["unread.updated"] == {"conversation_id": "conv-1", "unread_count": 0}
+        receipts = [event for event in _drain(sender_events) if event["type"] == "messages.read"]
+        assert [event["data"]["reader_id"] for event in receipts] == ["home-1"]
+    finally:
+        realtime_bus.unsubscribe(sender_events)
@@ -0,0 +1,30 @@
+"""
+/api/metrics collector output.
+"""
+
+import time
+
+from backend.auth.security import password_hasher
+from backend.utils.metrics import SystemMetricsCollector
+
+
+class IdleSampler:
+    def latest(self):
+        return None
+
+
+def _gauges():
+    return {family.name: family.samples[0].value
+            for family in SystemMetricsCollector(IdleSampler(), time.time()).collect()
+            if family.type == "gauge" and family.samples}
+
+
+def test_password_hash_pool_load_is_exported(monkeypatch):
+    monkeypatch.setattr(password_hasher, "queue_depth", 7)
+    monkeypatch.setattr(password_hasher, "in_flight", 2)
+
+    gauges = _gauges()
+
+    assert gauges["servicehub_password_hash_queue_depth"] == 7
+    assert gauges["servicehub_password_hash_in_flight"] == 2
+    assert gauges["servicehub_password_hash_workers"] == password_hasher.max_workers
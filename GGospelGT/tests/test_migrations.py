@@ -0,0 +1,39 @@
+"""
+Deploy migrations (backend.migrate); the server only creates indexes at startup.
+"""
+
+import asyncio
+
+from backend.database import database
+
+
+def test_category_key_backfill_batches_user_updates(fake_db):
+    fake_db.users.docs.extend([
+        {"_id": f"oid-user-{n}", "id": f"trade-{n}", "trade_categories": ["Plumbing", "Electrical Repairs"]}
+        for n in range(5)
+    ])
+    fake_db.users.docs.append({"_id": "oid-user-done", "id": "trade-done", "trade_categories": ["Plumbing"],
+                               "trade_category_keys": ["plumbing"]})
+    bulk_calls = []
+    bulk_write = fake_db.users.bulk_write
+
+    async def recording_bulk_write(requests, ordered=True):
+        bulk_calls.append(len(requests))
+        return await bulk_write(requests, ordered=ordered)
+    fake_db.users.bulk_write = recording_bulk_write
+
+    result = asyncio.run(database.backfill_category_keys(batch_size=2))
+
+    assert result == {"jobs_updated": 0, "users_updated": 5}
+    assert bulk_calls == [2, 2, 1]
+    assert fake_db.users.docs[0]["trade_category_keys"] == ["plumbing", "electrical_repairs"]
+
+
+def test_user_writes_maintain_normalized_email(fake_db):
+    asyncio.run(database.create_user({"id": "home-1", "name": " Ada Obi", "email": "Ada.Obi@Example.com",
+                                      "role": "homeowner"}))
+    assert fake_db.users.docs[0]["email_normalized"] == "ada.obi@example.com"
+    assert fake_db.users.docs[0]["name_normalized"] == "ada obi"
+
+    asyncio.run(database.update_user("home-1", {"email": "ADA@example.com"}))
+    assert fake_db.users.docs[0]["email_normalized"] == "ada@example.com"
@@ -0,0 +1,38 @@
+"""
+Outbox dispatcher finalization tests.
+"""
+
+import asyncio
+
+from backend.models.notifications import Notification, NotificationChannel, NotificationStatus, NotificationType
+from backend.services.notification_outbox import NotificationDispatcher, start_embedded_dispatcher
+
+
+def _claimed_notification(fake_db, **fields) -> Notification:
+    notification = Notification(
+        id="notif-1", user_id="home-1", type=NotificationType.NEW_MESSAGE, channel=NotificationChannel.EMAIL,
+        subject="", content="", metadata={
+            "recipient_name": "Ada", "sender_name": "Bayo", "job_title": "Fix sink",
+            "message_preview": "On my way", "conversation_url": "https://servicehub.ng/messages/conv-1"
+        }, **fields
+    )
+    fake_db.notifications.docs.append({"_id": notification.id, **notification.dict(), "claim_token": "worker"})
+    return notification
+
+
+def test_missing_recipient_email_fails_without_retry(fake_db):
+    notification = _claimed_notification(fake_db, recipient_email=None)
+
+    asyncio.run(NotificationDispatcher()._process(notification, asyncio.Semaphore(1)))
+
+    stored = fake_db.notifications.docs[0]
+    assert stored["status"] == NotificationStatus.FAILED
+    assert stored["attempts"] == 1
+    assert stored["last_error"] == "No recipient email provided"
+    assert "claim_token" not in stored
+
+
+def test_embedded_dispatcher_is_opt_in(monkeypatch):
+    monkeypatch.delenv("NOTIFICATION_OUTBOX_EMBEDDED", raising=False)
+
+    assert start_embedded_dispatcher() is None
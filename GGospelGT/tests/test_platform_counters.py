@@ -0,0 +1,41 @@
+"""
+Review writes keep platform_counters (homepage totals and average rating) in step.
+"""
+
+import asyncio
+from datetime import datetime
+
+from backend.database import database
+from backend.models.reviews import ReviewStatus
+
+
+def _seed(fake_db, rating=4, status=ReviewStatus.PUBLISHED):
+    fake_db.platform_counters.docs.append({"_id": database.PLATFORM_COUNTERS_ID, "total_reviews": 1, "rating_sum": rating})
+    fake_db.review_summaries.docs.append({"_id": "trade-1", "total_reviews": 1, "rating_sum": rating})
+    fake_db.users.docs.append({"id": "trade-1"})
+    now = datetime(2026, 1, 1, 12, 0)
+    fake_db.reviews.docs.append({
+        "_id": "review-1", "id": "review-1", "job_id": "job-1", "reviewer_id": "home-1", "reviewee_id": "trade-1",
+        "reviewer_name": "Ada", "reviewee_name": "Bayo",
+        "review_type": "homeowner_to_tradesperson", "rating": rating, "title": "Great job",
+        "content": "Fixed the sink quickly and tidied up.", "status": status, "created_at": now, "updated_at": now
+    })
+
+
+def test_rating_edit_moves_counter_rating_sum(fake_db):
+    _seed(fake_db, rating=4)
+
+    asyncio.run(database.update_review("review-1", {"rating": 2}))
+
+    counters = fake_db.platform_counters.docs[0]
+    assert counters["total_reviews"] == 1
+    assert counters["rating_sum"] == 2
+
+
+def test_moderation_keeps_counters_like_create_review(fake_db):
+    _seed(fake_db, rating=5)
+
+    asyncio.run(database.set_review_status("review-1", ReviewStatus.HIDDEN))
+
+    counters = fake_db.platform_counters.docs[0]
+    assert (counters["total_reviews"], counters["rating_sum"]) == (1, 5)
@@ -0,0 +1,80 @@
+"""
+Upload size limit tests: oversized multipart bodies are refused before the
+endpoint (and Starlette's multipart spooling) sees them.
+"""
+
+import asyncio
+
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from backend.utils.uploads import MULTIPART_OVERHEAD_BYTES, UploadLimitMiddleware
+
+
+def _app(calls):
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        calls.append(file.filename)
+        return {"size": len(await file.read())}
+
+    app.add_middleware(UploadLimitMiddleware, limits={"/upload": 1024}, default_max_bytes=10 * 1024 * 1024)
+    return app
+
+
+def test_declared_oversized_upload_rejected_before_endpoint():
+    calls = []
+    client = TestClient(_app(calls))
+
+    response = client.post("/upload", files={"file": ("big.jpg", b"x" * (1024 + MULTIPART_OVERHEAD_BYTES + 1))})
+
+    assert response.status_code == 413
+    assert response.json() == {"detail": "File too large. Max size: 1KB"}
+    assert calls == []
+
+
+def test_small_upload_passes_through():
+    calls = []
+    client = TestClient(_app(calls))
+
+    response = client.post("/upload", files={"file": ("small.jpg", b"x" * 512)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 512}
+    assert calls == ["small.jpg"]
+
+
+def test_chunked_upload_stops_reading_past_limit():
+    calls = []
+    app = _app(calls)
+    chunk = b"x" * (16 * 1024)
+    chunks_read = bytes_read = 0
+
+    part_header = (b'--xyz\r\nContent-Disposition: form-data; name="file"; filename="big.jpg"\r\n'
+                   b"Content-Type: image/jpeg\r\n\r\n")
+
+    async def receive():
+        nonlocal chunks_read, bytes_read
+        chunks_read += 1
+        body = part_header if chunks_read == 1 else chunk
+        bytes_read += len(body)
+        return {"type": "http.request", "body": body, "more_body": True}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/upload", "raw_path": b"/upload", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"multipart/form-data; boundary=xyz")],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    # Reading stops at the first chunk that crosses the limit
+    assert bytes_read - len(chunk) <= 1024 + MULTIPART_OVERHEAD_BYTES < bytes_read
+    assert calls == []
@@ -0,0 +1,51 @@
+"""
+Writes to fields carried on the cached User must drop the cached entry, so
+get_current_user does not serve a stale user until the TTL expires.
+"""
+
+import asyncio
+
+from backend.database import database
+
+from .conftest import make_user
+
+
+def _cache_user(fake_db, user):
+    fake_db.users.docs.append({"_id": f"oid-{user.id}", **user.dict()})
+    database.user_cache.set(user.id, user)
+
+
+def test_verify_user_email_invalidates_cached_user(fake_db):
+    _cache_user(fake_db, make_user("homeowner", "home-1", "Ada"))
+
+    asyncio.run(database.verify_user_email("home-1"))
+
+    assert database.user_cache.get("home-1") is None
+    assert fake_db.users.docs[0]["email_verified"] is True
+
+
+def test_review_stats_write_invalidates_cached_user(fake_db):
+    _cache_user(fake_db, make_user("tradesperson", "trade-1", "Bayo"))
+
+    asyncio.run(database._update_user_review_stats("trade-1", {"total_reviews": 2, "rating_sum": 9}))
+
+    assert database.user_cache.get("trade-1") is None
+    assert fake_db.users.docs[0]["total_reviews"] == 2
+
+
+def test_verification_submission_invalidates_cached_user(fake_db):
+    _cache_user(fake_db, make_user("tradesperson", "trade-1", "Bayo"))
+
+    asyncio.run(database.submit_verification_documents("trade-1", "national_id", "/uploads/id.jpg", "Bayo Ade"))
+
+    assert database.user_cache.get("trade-1") is None
+    assert fake_db.users.docs[0]["verification_submitted"] is True
+
+
+def test_referral_code_generation_invalidates_cached_user(fake_db):
+    _cache_user(fake_db, make_user("homeowner", "home-1", "Ada"))
+
+    code = asyncio.run(database.generate_referral_code("home-1"))
+
+    assert database.user_cache.get("home-1") is None
+    assert fake_db.users.docs[0]["referral_code"] == code
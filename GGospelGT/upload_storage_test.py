@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+CONTENT-ADDRESSED UPLOAD STORAGE TESTING
+
+Runs against the local storage backend in a temporary directory (no server or
+database needed):
+1. Stores image renditions through the image pipeline and checks identical
+   uploads are deduplicated under their content hash
+2. Checks served files carry a strong ETag and immutable caching
+3. Checks If-None-Match returns 304 and byte ranges return 206/416
+4. Checks legacy (non content-addressed) files keep the one-hour cache policy
+
+Set STORAGE_BACKEND=s3 with S3_BUCKET and S3_ENDPOINT_URL (e.g. a local MinIO)
+to run the same checks against an S3-compatible stand-in.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+STORAGE_ROOT = tempfile.mkdtemp(prefix="servicehub-storage-test-")
+os.environ.setdefault("LOCAL_STORAGE_ROOT", STORAGE_ROOT)
+
+import httpx  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from backend.services.image_pipeline import image_pipeline  # noqa: E402
+from backend.services.storage import storage, serve_stored_file  # noqa: E402
+
+
+class UploadStorageTester:
+    def __init__(self):
+        self.passed = 0
+        self.failed = 0
+
+    def check(self, condition: bool, description: str):
+        if condition:
+            self.passed += 1
+            print(f"✅ {description}")
+        else:
+            self.failed += 1
+            print(f"❌ {description}")
+
+    def build_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.get("/files/{filename}")
+        async def get_file(filename: str, request: Request):
+            return await serve_stored_file(request, "portfolio", filename)
+
+        return app
+
+    async def run(self):
+        print(f"🔍 Storage backend: {type(storage).__name__}")
+        image = Image.new("RGB", (2400, 1600), (200, 120, 40))
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+
+        print("🔍 Deduplicated renditions")
+        first = await image_pipeline.process_to_storage(buffer.getvalue(), "portfolio")
+        second = await image_pipeline.process_to_storage(buffer.getvalue(), "portfolio")
+        full_name = first["renditions"]["full"]["filename"]
+        self.check(len(full_name) == len("0" * 64 + ".jpg"), "Full rendition is named by its SHA-256")
+        self.check(
+            all(first["renditions"][r]["filename"] == second["renditions"][r]["filename"] for r in first["renditions"]),
+            "Identical uploads map to the same stored files"
+        )
+        if os.getenv("STORAGE_BACKEND", "local") == "local":
+            stored = [n for n in os.listdir(os.path.join(STORAGE_ROOT, "portfolio"))]
+            self.check(len(stored) == 6, f"Six files stored once each (found {len(stored)})")
+
+        transport = httpx.ASGITransport(app=self.build_app())
+        async with httpx.AsyncClient(transport=transport, base_url="http://storage.test") as client:
+            print("🔍 Validators and caching")
+            response = await client.get(f"/files/{full_name}")
+            etag = response.headers.get("etag")
+            self.check(response.status_code == 200, "Stored file served")
+            self.check(etag == f'"{full_name.split(".")[0]}"', "Strong ETag equals the content hash")
+            self.check("immutable" in response.headers.get("cache-control", ""), "Content-addressed file cached as immutable")
+            self.check(response.headers.get("content-type") == "image/jpeg", "Media type from extension")
+            self.check(int(response.headers["content-length"]) == len(response.content), "Content-Length matches body")
+            body = response.content
+
+            response = await client.get(f"/files/{full_name}", headers={"If-None-Match": etag})
+            self.check(response.status_code == 304 and not response.content, "If-None-Match returns 304 with no body")
+
+            print("🔍 Byte ranges")
+            response = await client.get(f"/files/{full_name}", headers={"Range": "bytes=0-99"})
+            self.check(response.status_code == 206 and response.content == body[:100], "First 100 bytes returned as 206")
+            self.check(response.headers.get("content-range") == f"bytes 0-99/{len(body)}", "Content-Range header set")
+            response = await client.get(f"/files/{full_name}", headers={"Range": "bytes=-10"})
+            self.check(response.content == body[-10:], "Suffix range returns the last bytes")
+            response = await client.get(f"/files/{full_name}", headers={"Range": f"bytes={len(body)}-"})
+            self.check(response.status_code == 416, "Unsatisfiable range returns 416")
+            response = await client.get(f"/files/{full_name}", headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+            self.check(response.status_code == 200, "Mismatched If-Range falls back to the full body")
+
+            print("🔍 Legacy files and bad names")
+            if os.getenv("STORAGE_BACKEND", "local") == "local":
+                with open(os.path.join(STORAGE_ROOT, "portfolio", "legacy-upload.jpg"), "wb") as f:
+                    f.write(b"legacy")
+                response = await client.get("/files/legacy-upload.jpg")
+                self.check(
+                    response.status_code == 200 and response.headers["cache-control"] == "public, max-age=3600",
+                    "Legacy file served with the one-hour policy"
+                )
+            response = await client.get("/files/..%2F..%2Fetc%2Fpasswd")
+            self.check(response.status_code == 404, "Path traversal rejected")
+            response = await client.get(f"/files/{'0' * 64}.jpg")
+            self.check(response.status_code == 404, "Missing file returns 404")
+
+        image_pipeline.shutdown()
+        print()
+        print(f"📊 Results: {self.passed} passed, {self.failed} failed")
+        return self.failed == 0
+
+
+if __name__ == "__main__":
+    ok = asyncio.run(UploadStorageTester().run())
+    sys.exit(0 if ok else 1)